@@ -1,9 +1,12 @@
+import os
+import sys
 import numpy as np
 import cv2
 import pyrealsense2 as rs
 from scipy.spatial.transform import Rotation as R
-import rtde_control
-import rtde_receive
+
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SRO_ur_rtde_scripts_4_realbot"))
+import robot_backend
 
 # ---------------- Konfiguration ----------------
 
@@ -66,8 +69,10 @@ pipeline.start(config)
 detector = aruco_detector()
 
 # UR RTDE
-rtde_ctrl = rtde_control.RTDEControlInterface(ROBOT_IP)
-rtde_rec  = rtde_receive.RTDEReceiveInterface(ROBOT_IP)
+robot = robot_backend.connect(ip=ROBOT_IP)
+robot.require("moveL", "tcp_pose")
+rtde_ctrl = robot.rtde_c
+rtde_rec  = robot.rtde_r
 
 # ------------------------------------------------
 # Hauptschleife: Marker suchen, Pose berechnen, UR bewegen
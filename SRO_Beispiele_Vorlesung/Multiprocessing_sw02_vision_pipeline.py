@@ -0,0 +1,360 @@
+# Multiprocessing_sw02_vision_pipeline.py
+# Ausbau von Multiprocessing_sw01.py zu einer echten Bildverarbeitungs-Pipeline über mehrere Prozesse:
+#
+#   Kamera-Prozess ──(Bild in Shared-Memory-Slot)──> Detektor-Prozesse (HSV, ORB, YOLO, ...)
+#                  ──(nur Slot-Nummer über Queue)──>        │
+#                                                           └──(kleines Ergebnis-Tupel)──> Roboter-Prozess
+#
+# - Die Bilder (640x480x3 = 900 KB) liegen in multiprocessing.shared_memory; über die Queues
+#   gehen nur (Slot, Bildnummer, Zeitstempel). Die Detektoren lesen das Bild direkt aus dem
+#   gemeinsamen Speicher, ohne Pickle und ohne Kopie.
+# - Jeder Slot hat einen Referenzzähler (busy). Die Kamera beschreibt nur freie Slots; ist keiner
+#   frei, wird das Bild verworfen - so kann kein Detektor ein halb überschriebenes Bild sehen.
+# - Je Detektor-Art eine Queue mit maxsize=1: ist der Detektor noch beschäftigt, ersetzt das neue
+#   Bild das wartende (immer das neueste Bild, keine wachsende Verzögerung).
+# - Mehrere Prozesse je Detektor-Art teilen sich eine Queue (--workers hsv=2,orb=2) -> alle Kerne.
+#
+# Start:  python Multiprocessing_sw02_vision_pipeline.py --workers hsv=2,orb=1 --duration 20
+#         python Multiprocessing_sw02_vision_pipeline.py --synthetic --workers mean=4     (ohne Kamera/cv2)
+#         python Multiprocessing_sw02_vision_pipeline.py --transfer-benchmark           (Queue vs. Shared Memory)
+
+import argparse
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+WIDTH, HEIGHT = 640, 480
+SLOTS_PER_WORKER = 2          # Slots je Detektor-Prozess, dazu 2 für die Kamera
+HSV_LOWER = (40, 40, 40)      # grünähnlich wie in detect_object_per_color.py
+HSV_UPPER = (80, 255, 255)
+MIN_AREA = 500
+YOLO_MODEL = "../Yolo/yolov8_duplo_custom9/weights/best.pt"
+
+
+# -------------- Shared Memory für die Bilder --------------
+class FrameSlots:
+    """Bild-Slots in einem Shared-Memory-Block; im Kindprozess per Name erneut geöffnet."""
+
+    def __init__(self, slots, shape, name=None):
+        self.slots = slots
+        self.shape = tuple(shape)
+        size = slots * int(np.prod(self.shape))
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    def spec(self):
+        """Angaben zum erneuten Öffnen in einem anderen Prozess (picklebar)."""
+        return self.slots, self.shape, self.shm.name
+
+    def close(self, unlink=False):
+        del self.frames  # Ansicht freigeben, sonst lässt sich der Speicher nicht schließen
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def release_slot(busy, slot):
+    with busy.get_lock():
+        busy[slot] -= 1
+
+
+# -------------- Kamera --------------
+def synthetic_frames(shape):
+    """Bewegtes grünes Rechteck auf grauem Grund, ohne Kamera und ohne cv2."""
+    h, w = shape[:2]
+    frame = np.empty(shape, dtype=np.uint8)
+    i = 0
+    while True:
+        frame[:] = 90
+        x = int((w - 80) * (0.5 + 0.5 * np.sin(i * 0.05)))
+        y = int((h - 60) * (0.5 + 0.5 * np.cos(i * 0.03)))
+        frame[y:y + 60, x:x + 80] = (40, 200, 40)  # BGR
+        i += 1
+        time.sleep(1 / 30)
+        yield frame
+
+
+def camera_frames(camera_index, shape):
+    import cv2
+    cap = cv2.VideoCapture(camera_index)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, shape[1])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, shape[0])
+    try:
+        while True:
+            ok, frame = cap.read()
+            if ok:
+                if frame.shape != shape:
+                    frame = cv2.resize(frame, (shape[1], shape[0]))
+                yield frame
+    finally:
+        cap.release()
+
+
+def kamera_task(spec, busy, task_queues, stop, stats, camera_index, synthetic):
+    """Bilder einlesen, in einen freien Slot kopieren und die Slot-Nummer an alle Detektoren verteilen."""
+    slots = FrameSlots(*spec)
+    source = synthetic_frames(slots.shape) if synthetic else camera_frames(camera_index, slots.shape)
+    frame_id = 0
+    next_slot = 0
+    try:
+        for frame in source:
+            if stop.is_set():
+                break
+            frame_id += 1
+            stats["captured"].value = frame_id
+            # freien Slot suchen (Referenzzähler 0), reihum beginnend nach dem zuletzt benutzten
+            slot = None
+            with busy.get_lock():
+                for k in range(slots.slots):
+                    candidate = (next_slot + k) % slots.slots
+                    if busy[candidate] == 0:
+                        slot = candidate
+                        # eine Referenz je Detektor-Queue plus eine für die Kamera selbst
+                        busy[slot] = len(task_queues) + 1
+                        break
+            if slot is None:
+                stats["no_slot"].value += 1
+                continue
+            next_slot = slot + 1
+            np.copyto(slots.frames[slot], frame)  # die einzige Kopie des Bildes
+            task = (slot, frame_id, time.time())
+            for q in task_queues.values():
+                try:
+                    q.put_nowait(task)
+                except queue.Full:
+                    # wartendes älteres Bild durch das neue ersetzen
+                    try:
+                        old_slot = q.get_nowait()[0]
+                        release_slot(busy, old_slot)
+                        stats["replaced"].value += 1
+                    except queue.Empty:
+                        pass
+                    try:
+                        q.put_nowait(task)
+                    except queue.Full:
+                        release_slot(busy, slot)
+                        stats["replaced"].value += 1
+            release_slot(busy, slot)  # Referenz der Kamera
+    finally:
+        slots.close()
+
+
+# -------------- Detektoren --------------
+def make_detector(name, options):
+    """Liefert eine Funktion frame -> Liste von (cx, cy, Größe); wird im Detektor-Prozess erzeugt."""
+    if name == "mean":
+        # nur NumPy: misst den Aufwand der Pipeline selbst
+        return lambda frame: [(frame.shape[1] // 2, frame.shape[0] // 2, float(frame[::8, ::8].mean()))]
+
+    import cv2
+    if name == "hsv":
+        lower = np.array(HSV_LOWER, dtype=np.uint8)
+        upper = np.array(HSV_UPPER, dtype=np.uint8)
+        kernel = np.ones((5, 5), np.uint8)
+
+        def detect_hsv(frame):
+            mask = cv2.inRange(cv2.cvtColor(frame, cv2.COLOR_BGR2HSV), lower, upper)
+            mask = cv2.dilate(cv2.erode(mask, kernel, iterations=1), kernel, iterations=2)
+            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            if not contours:
+                return []
+            c = max(contours, key=cv2.contourArea)
+            M = cv2.moments(c)
+            if M["m00"] < MIN_AREA:
+                return []
+            return [(int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"]), float(M["m00"]))]
+        return detect_hsv
+
+    if name == "orb":
+        orb = cv2.ORB_create(nfeatures=1000)
+        matcher = cv2.BFMatcher(cv2.NORM_HAMMING)
+        template = cv2.imread(options["template"], cv2.IMREAD_GRAYSCALE) if options.get("template") else None
+        kp_t, des_t = orb.detectAndCompute(template, None) if template is not None else (None, None)
+
+        def detect_orb(frame):
+            kp, des = orb.detectAndCompute(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), None)
+            if des is None or des_t is None:
+                return []
+            good = [m for m, n in (p for p in matcher.knnMatch(des_t, des, k=2) if len(p) == 2)
+                    if m.distance < 0.75 * n.distance]
+            if len(good) < 15:
+                return []
+            pts = np.float32([kp[m.trainIdx].pt for m in good])
+            cx, cy = pts.mean(axis=0)
+            return [(int(cx), int(cy), float(len(good)))]
+        return detect_orb
+
+    if name == "yolo":
+        from ultralytics import YOLO  # > pip install ultralytics
+        model = YOLO(options.get("model") or YOLO_MODEL)
+
+        def detect_yolo(frame):
+            objects = []
+            for r in model(frame, verbose=False):
+                for box in r.boxes:
+                    x1, y1, x2, y2 = (float(v) for v in box.xyxy[0])
+                    objects.append((int((x1 + x2) / 2), int((y1 + y2) / 2), float(box.conf[0])))
+            return objects
+        return detect_yolo
+
+    raise ValueError(f"Unbekannter Detektor {name}")
+
+
+def detektor_task(name, spec, busy, task_queue, result_queue, stop, options):
+    """Bilder direkt aus dem Shared Memory auswerten und nur das Ergebnis weitergeben."""
+    slots = FrameSlots(*spec)
+    detect = make_detector(name, options)
+    try:
+        while not stop.is_set():
+            try:
+                slot, frame_id, t_capture = task_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            frame = slots.frames[slot]  # Ansicht, keine Kopie
+            try:
+                objects = detect(frame)
+            finally:
+                del frame
+                release_slot(busy, slot)
+            try:
+                result_queue.put_nowait((name, frame_id, t_capture, time.time(), objects))
+            except queue.Full:
+                pass
+    finally:
+        slots.close()
+
+
+# -------------- Roboter --------------
+def roboter_task(result_queue, stop, stats, report_interval=1.0):
+    """Ergebnisse empfangen, neueste Position je Detektor merken und Latenzen ausgeben.
+
+    Hier würde der Roboter angesteuert, z.B. mit robot_backend.connect() aus
+    SRO_ur_rtde_scripts_4_realbot und moveL zur erkannten Position.
+    """
+    latest = {}
+    latencies = {}
+    counts = {}
+    t_report = time.monotonic() + report_interval
+    while not stop.is_set():
+        try:
+            name, frame_id, t_capture, t_done, objects = result_queue.get(timeout=0.2)
+            latencies.setdefault(name, []).append(t_done - t_capture)
+            counts[name] = counts.get(name, 0) + 1
+            if objects:
+                latest[name] = (frame_id, objects[0])
+        except queue.Empty:
+            pass
+        if time.monotonic() >= t_report:
+            line = [f"Kamera {stats['captured'].value} Bilder ({stats['no_slot'].value} ohne Slot, "
+                    f"{stats['replaced'].value} ersetzt)"]
+            for name in sorted(latencies):
+                lat = np.array(latencies[name]) * 1000
+                line.append(f"{name}: {counts[name] / report_interval:.1f}/s, Latenz p50 "
+                            f"{np.percentile(lat, 50):.1f} max {lat.max():.1f} ms, Objekt {latest.get(name)}")
+            print(" | ".join(line))
+            latencies.clear()
+            counts.clear()
+            t_report += report_interval
+
+
+# -------------- Vergleich Übertragung --------------
+def _transfer_echo(q_in, q_out):
+    while True:
+        item = q_in.get()
+        if item is None:
+            break
+        q_out.put(item if isinstance(item, tuple) else item.shape)
+
+
+def transfer_benchmark(count=300):
+    """Zeit je Bild: ganzes Array über die Queue (Pickle) gegen Slot-Nummer + Shared Memory."""
+    frame = np.random.randint(0, 255, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    q_in, q_out = multiprocessing.Queue(), multiprocessing.Queue()
+    p = multiprocessing.Process(target=_transfer_echo, args=(q_in, q_out))
+    p.start()
+    slots = FrameSlots(2, frame.shape)
+    try:
+        for label, send in (("Queue mit Bild (Pickle)", lambda i: q_in.put(frame)),
+                            ("Shared Memory + Slot", lambda i: (np.copyto(slots.frames[i % 2], frame),
+                                                                q_in.put((i % 2, i))))):
+            send(0)
+            q_out.get()
+            t0 = time.perf_counter()
+            for i in range(count):
+                send(i)
+                q_out.get()
+            print(f"{label:<25} {1e3 * (time.perf_counter() - t0) / count:7.3f} ms je Bild")
+    finally:
+        q_in.put(None)
+        p.join()
+        slots.close(unlink=True)
+
+
+def parse_workers(text):
+    """"hsv=2,orb=1" -> {"hsv": 2, "orb": 1}"""
+    workers = {}
+    for part in text.split(","):
+        name, _, count = part.partition("=")
+        workers[name.strip()] = int(count or 1)
+    return workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bildverarbeitung über mehrere Prozesse mit Shared Memory")
+    parser.add_argument("--workers", default="hsv=2", help="Detektoren und Prozesse, z.B. hsv=2,orb=1,yolo=1")
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--synthetic", action="store_true", help="künstliche Bilder statt Kamera")
+    parser.add_argument("--template", default=None, help="Referenzbild für ORB")
+    parser.add_argument("--model", default=None, help="YOLO-Gewichte")
+    parser.add_argument("--duration", type=float, default=0.0, help="Laufzeit in s (0 = bis Strg+C)")
+    parser.add_argument("--transfer-benchmark", action="store_true")
+    args = parser.parse_args()
+    if args.transfer_benchmark:
+        transfer_benchmark()
+        return
+
+    workers = parse_workers(args.workers)
+    slots = FrameSlots(2 + SLOTS_PER_WORKER * sum(workers.values()), (HEIGHT, WIDTH, 3))
+    busy = multiprocessing.Array("i", slots.slots)
+    stop = multiprocessing.Event()
+    stats = {key: multiprocessing.Value("q", 0) for key in ("captured", "no_slot", "replaced")}
+    task_queues = {name: multiprocessing.Queue(maxsize=1) for name in workers}
+    result_queue = multiprocessing.Queue(maxsize=100)
+    options = {"template": args.template, "model": args.model}
+
+    processes = [multiprocessing.Process(target=roboter_task, args=(result_queue, stop, stats))]
+    for name, count in workers.items():
+        for _ in range(count):
+            processes.append(multiprocessing.Process(
+                target=detektor_task,
+                args=(name, slots.spec(), busy, task_queues[name], result_queue, stop, options)))
+    processes.append(multiprocessing.Process(
+        target=kamera_task,
+        args=(slots.spec(), busy, task_queues, stop, stats, args.camera, args.synthetic)))
+    print(f"📷 {slots.slots} Slots à {WIDTH}x{HEIGHT}x3 im Shared Memory, Detektoren: {workers}")
+    for p in processes:
+        p.start()
+    try:
+        t_end = time.monotonic() + args.duration if args.duration else None
+        while t_end is None or time.monotonic() < t_end:
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        for p in processes:
+            p.join(timeout=3.0)
+            if p.is_alive():
+                p.terminate()
+        slots.close(unlink=True)
+    print("Pipeline beendet")
+
+
+if __name__ == '__main__':
+    main()
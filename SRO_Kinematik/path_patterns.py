@@ -0,0 +1,149 @@
+# path_patterns.py
+# Bahnen und Suchmuster (Linie, Spirale, Lissajous-Figur, Raster) als NumPy-Arrays.
+# Alle Punkte werden in einem Schritt vektorisiert erzeugt (keine Python-Schleife über die Punkte),
+# so dass auch dichte Bahnen mit 10k+ Punkten ohne spürbare Wartezeit entstehen.
+#
+# Posen wie bei ur_rtde: [x, y, z, rx, ry, rz] (m, Drehvektor in rad).
+# Die Muster werden in der xy-Ebene um die Mittelpunktpose gelegt, wahlweise im
+# Basis-KS (frame="base", wie bisher in den Skripten) oder im Werkzeug-KS (frame="tool").
+#
+# Verwendung, z.B.:
+#   import sys; sys.path.insert(1, r"...\SRO_Kinematik")
+#   import path_patterns
+#   bahn = path_patterns.spiral(center_pose, radius=0.01, revolutions=3, points_per_revolution=36)
+#   bahn = path_patterns.resample_by_arc_length(bahn, spacing=0.0001)
+
+import numpy as np
+
+from ur_kinematics import matrix_to_rotvec, rotvec_to_matrix
+
+
+def _place(local_xyz, center_pose, frame="base"):
+    """Lokale Punkte (N, 3) um die Mittelpunktpose legen -> Posen (N, 6) mit deren Orientierung."""
+    center_pose = np.asarray(center_pose, dtype=float)
+    if frame == "tool":
+        local_xyz = local_xyz @ rotvec_to_matrix(center_pose[3:]).T
+    elif frame != "base":
+        raise ValueError(f"Unbekanntes Bezugssystem {frame}, erlaubt: 'base', 'tool'")
+    poses = np.empty((len(local_xyz), 6))
+    poses[:, :3] = center_pose[:3] + local_xyz
+    poses[:, 3:] = center_pose[3:]
+    return poses
+
+
+def line(start, end, num_points):
+    """Gleichmäßig verteilte Punkte von start bis end (jeweils 3D-Punkt oder 6D-Pose).
+
+    Bei Posen wird die Orientierung per Drehung um eine feste Achse interpoliert.
+    """
+    start = np.asarray(start, dtype=float)
+    end = np.asarray(end, dtype=float)
+    if start.shape != end.shape or start.shape not in ((3,), (6,)):
+        raise ValueError("Start und Ende müssen beide 3D-Punkte oder beide 6D-Posen sein")
+    if num_points < 2:
+        raise ValueError("Mindestens zwei Punkte erforderlich")
+    s = np.linspace(0.0, 1.0, num_points)
+    positions = start[:3] + s[:, None] * (end[:3] - start[:3])
+    if start.shape == (3,):
+        return positions
+    return np.column_stack([positions, interpolate_orientation(start[3:], end[3:], s)])
+
+
+def spiral(center_pose, radius, revolutions, points_per_revolution, height=0.0, start_radius=0.0,
+           endpoint=False, frame="base"):
+    """Archimedische Spirale um center_pose (z.B. Suchbewegung beim Fügen).
+
+    :param radius: Radius am Ende der Spirale in m
+    :param revolutions: Anzahl Umdrehungen (darf gebrochen sein)
+    :param points_per_revolution: Punkte je Umdrehung
+    :param height: gesamte Höhenänderung in z über die Spirale in m
+    :param start_radius: Radius am Anfang in m
+    :param endpoint: True -> letzter Punkt liegt genau auf radius/height
+    :return: Posen (N, 6)
+    """
+    n = int(round(points_per_revolution * revolutions))
+    i = np.arange(n + 1 if endpoint else n)
+    fraction = i / n
+    theta = 2.0 * np.pi * i / points_per_revolution
+    r = start_radius + (radius - start_radius) * fraction
+    local = np.column_stack([r * np.cos(theta), r * np.sin(theta), height * fraction])
+    return _place(local, center_pose, frame)
+
+
+def lissajous(center_pose, amplitude_x, amplitude_y, frequency_x, frequency_y, num_points,
+              phase=np.pi / 2, frame="base"):
+    """Lissajous-Figur x = Ax sin(fx t + phase), y = Ay sin(fy t) über eine volle Periode."""
+    t = np.linspace(0.0, 2.0 * np.pi, num_points)
+    local = np.column_stack([amplitude_x * np.sin(frequency_x * t + phase),
+                             amplitude_y * np.sin(frequency_y * t),
+                             np.zeros_like(t)])
+    return _place(local, center_pose, frame)
+
+
+def raster(center_pose, width, height, line_spacing, points_per_line=2, frame="base"):
+    """Mäander-Raster (Zeilen abwechselnd hin und zurück) über eine Fläche width x height.
+
+    :param line_spacing: Abstand der Zeilen in y in m
+    :param points_per_line: Punkte je Zeile (2 = nur Zeilenanfang und -ende)
+    """
+    num_lines = int(np.floor(height / line_spacing + 1e-9)) + 1
+    x = np.linspace(-width / 2.0, width / 2.0, points_per_line)
+    xs = np.tile(x, (num_lines, 1))
+    xs[1::2] = xs[1::2, ::-1]  # jede zweite Zeile rückwärts
+    ys = np.repeat(-height / 2.0 + line_spacing * np.arange(num_lines), points_per_line)
+    local = np.column_stack([xs.ravel(), ys, np.zeros(xs.size)])
+    return _place(local, center_pose, frame)
+
+
+def interpolate_orientation(rotvec_start, rotvec_end, fractions):
+    """Orientierungen zwischen zwei Drehvektoren (Drehung um feste Achse, entspricht Slerp).
+
+    :param fractions: (N,) Werte in [0, 1]
+    :return: Drehvektoren (N, 3)
+    """
+    R0 = rotvec_to_matrix(rotvec_start)
+    delta = matrix_to_rotvec(R0.T @ rotvec_to_matrix(rotvec_end))
+    fractions = np.asarray(fractions, dtype=float)
+    return matrix_to_rotvec(R0 @ rotvec_to_matrix(fractions[:, None] * delta))
+
+
+def arc_length(path):
+    """Kumulierte Bahnlänge der Positionen (N,), beginnend bei 0."""
+    path = np.asarray(path, dtype=float)
+    return np.r_[0.0, np.cumsum(np.linalg.norm(np.diff(path[:, :3], axis=0), axis=1))]
+
+
+def resample_by_arc_length(path, spacing=None, num_points=None):
+    """Bahn mit gleichmäßigen Abständen entlang der Bahnlänge neu abtasten.
+
+    Entweder spacing (Abstand in m) oder num_points angeben. Positionen werden linear,
+    Orientierungen (bei Posen) segmentweise per Drehung um feste Achse interpoliert.
+    """
+    path = np.asarray(path, dtype=float)
+    s = arc_length(path)
+    if num_points is None:
+        if spacing is None or spacing <= 0:
+            raise ValueError("spacing > 0 oder num_points angeben")
+        num_points = int(np.ceil(s[-1] / spacing)) + 1
+    num_points = max(2, int(num_points))
+    s_new = np.linspace(0.0, s[-1], num_points)
+
+    # Segment und Anteil innerhalb des Segments für jeden neuen Punkt
+    index = np.clip(np.searchsorted(s, s_new, side="right") - 1, 0, len(s) - 2)
+    seg_len = s[index + 1] - s[index]
+    u = np.divide(s_new - s[index], seg_len, out=np.zeros_like(s_new), where=seg_len > 0)
+
+    positions = path[index, :3] + u[:, None] * (path[index + 1, :3] - path[index, :3])
+    if path.shape[1] == 3:
+        return positions
+    R_a = rotvec_to_matrix(path[index, 3:])
+    R_b = rotvec_to_matrix(path[index + 1, 3:])
+    delta = matrix_to_rotvec(np.swapaxes(R_a, -1, -2) @ R_b)
+    rotvecs = matrix_to_rotvec(R_a @ rotvec_to_matrix(u[:, None] * delta))
+    return np.column_stack([positions, rotvecs])
+
+
+def resample_by_time(path, speed, dt):
+    """Bahn so abtasten, dass bei konstanter Bahngeschwindigkeit speed pro Takt dt ein Punkt folgt
+    (z.B. für servoL mit festem Regeltakt)."""
+    return resample_by_arc_length(path, spacing=speed * dt)
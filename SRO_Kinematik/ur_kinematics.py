@@ -0,0 +1,309 @@
+# ur_kinematics.py
+# Geschlossene (analytische) Kinematik für UR-Roboter (UR3e, UR5e) mit den Standard-DH-Parametern
+# von Universal Robots. Alle Funktionen arbeiten auf ganzen Stapeln (Batches) von Posen bzw.
+# Gelenkvektoren der Form (N, 6) und rechnen mit NumPy ohne Python-Schleife über N.
+#
+# Posen wie bei ur_rtde: [x, y, z, rx, ry, rz] in m bzw. als Drehvektor in rad,
+# bezogen auf das Basis-KS des Roboters.
+#
+# Verwendung, z.B.:
+#   import sys; sys.path.insert(1, r"...\SRO_Kinematik")
+#   from ur_kinematics import inverse_kinematics, forward_kinematics, jacobian
+#   q_all, valid = inverse_kinematics(posen, robot="UR3e")   # (N, 8, 6), (N, 8)
+#   posen = forward_kinematics(q, robot="UR3e")              # (N, 6)
+#   J = jacobian(q, robot="UR3e")                            # (N, 6, 6)
+
+import numpy as np
+
+# Standard-DH-Parameter (d, a, alpha) je Gelenk, Quelle: Universal Robots
+DH_PARAMETERS = {
+    "UR3e": {
+        "d": np.array([0.15185, 0.0, 0.0, 0.13105, 0.08535, 0.0921]),
+        "a": np.array([0.0, -0.24355, -0.2132, 0.0, 0.0, 0.0]),
+        "alpha": np.array([np.pi / 2, 0.0, 0.0, np.pi / 2, -np.pi / 2, 0.0]),
+    },
+    "UR5e": {
+        "d": np.array([0.1625, 0.0, 0.0, 0.1333, 0.0997, 0.0996]),
+        "a": np.array([0.0, -0.425, -0.3922, 0.0, 0.0, 0.0]),
+        "alpha": np.array([np.pi / 2, 0.0, 0.0, np.pi / 2, -np.pi / 2, 0.0]),
+    },
+}
+
+SINGULAR_EPS = 1e-9
+
+
+def _dh(robot):
+    try:
+        return DH_PARAMETERS[robot]
+    except KeyError:
+        raise ValueError(f"Unbekannter Robotertyp {robot}, bekannt: {list(DH_PARAMETERS)}")
+
+
+def _as_batch(values):
+    """Einzelnen Vektor (6,) oder Stapel (N, 6) immer als (N, 6) zurückgeben."""
+    values = np.asarray(values, dtype=float)
+    return values.reshape(-1, 6), values.ndim == 1
+
+
+def wrap_angle(angles):
+    """Winkel auf den Bereich (-pi, pi] abbilden."""
+    return np.pi - np.mod(np.pi - angles, 2.0 * np.pi)
+
+
+def rotvec_to_matrix(rotvecs):
+    """Drehvektoren (..., 3) in Rotationsmatrizen (..., 3, 3) umrechnen (Rodrigues)."""
+    rotvecs = np.asarray(rotvecs, dtype=float)
+    angle = np.linalg.norm(rotvecs, axis=-1)[..., None, None]
+    axis = np.divide(rotvecs, angle[..., 0], out=np.zeros_like(rotvecs), where=angle[..., 0] > SINGULAR_EPS)
+    kx, ky, kz = axis[..., 0], axis[..., 1], axis[..., 2]
+    zero = np.zeros_like(kx)
+    K = np.stack([np.stack([zero, -kz, ky], -1),
+                  np.stack([kz, zero, -kx], -1),
+                  np.stack([-ky, kx, zero], -1)], -2)
+    return np.eye(3) + np.sin(angle) * K + (1.0 - np.cos(angle)) * (K @ K)
+
+
+def matrix_to_rotvec(R):
+    """Rotationsmatrizen (..., 3, 3) in Drehvektoren (..., 3) umrechnen (inkl. Sonderfall 180°)."""
+    R = np.asarray(R, dtype=float)
+    cos_angle = np.clip((np.trace(R, axis1=-2, axis2=-1) - 1.0) / 2.0, -1.0, 1.0)
+    angle = np.arccos(cos_angle)
+    skew = np.stack([R[..., 2, 1] - R[..., 1, 2], R[..., 0, 2] - R[..., 2, 0], R[..., 1, 0] - R[..., 0, 1]], -1)
+    sin_angle = np.sin(angle)[..., None]
+    rotvec = np.divide(skew, 2.0 * sin_angle, out=np.zeros_like(skew), where=sin_angle > 1e-6) * angle[..., None]
+
+    # Nahe 180° ist skew ~ 0: Achse aus R = 2 k k^T - I bestimmen
+    near_pi = np.pi - angle < 1e-6
+    if np.any(near_pi):
+        Rp = R[near_pi]
+        diag = np.sqrt(np.clip((np.diagonal(Rp, axis1=-2, axis2=-1) + 1.0) / 2.0, 0.0, None))
+        i = np.argmax(diag, axis=-1)
+        rows = Rp[np.arange(len(Rp)), i]  # Zeile i = 2 k_i k
+        axis = rows / (2.0 * diag[np.arange(len(Rp)), i])[..., None]
+        axis[np.arange(len(Rp)), i] = diag[np.arange(len(Rp)), i]
+        axis /= np.linalg.norm(axis, axis=-1, keepdims=True)
+        rotvec[near_pi] = axis * angle[near_pi][..., None]
+    return rotvec
+
+
+def pose_to_matrix(poses):
+    """UR-Posen (..., 6) in homogene Transformationsmatrizen (..., 4, 4) umrechnen."""
+    poses = np.asarray(poses, dtype=float)
+    T = np.zeros(poses.shape[:-1] + (4, 4))
+    T[..., :3, :3] = rotvec_to_matrix(poses[..., 3:])
+    T[..., :3, 3] = poses[..., :3]
+    T[..., 3, 3] = 1.0
+    return T
+
+
+def matrix_to_pose(T):
+    """Homogene Transformationsmatrizen (..., 4, 4) in UR-Posen (..., 6) umrechnen."""
+    T = np.asarray(T, dtype=float)
+    return np.concatenate([T[..., :3, 3], matrix_to_rotvec(T[..., :3, :3])], axis=-1)
+
+
+def dh_transform(theta, d, a, alpha):
+    """DH-Transformation T_{i-1,i}; theta darf ein Array beliebiger Form sein -> (..., 4, 4)."""
+    theta = np.asarray(theta, dtype=float)
+    ct, st = np.cos(theta), np.sin(theta)
+    ca, sa = np.cos(alpha), np.sin(alpha)
+    T = np.zeros(theta.shape + (4, 4))
+    T[..., 0, 0] = ct
+    T[..., 0, 1] = -st * ca
+    T[..., 0, 2] = st * sa
+    T[..., 0, 3] = a * ct
+    T[..., 1, 0] = st
+    T[..., 1, 1] = ct * ca
+    T[..., 1, 2] = -ct * sa
+    T[..., 1, 3] = a * st
+    T[..., 2, 1] = sa
+    T[..., 2, 2] = ca
+    T[..., 2, 3] = d
+    T[..., 3, 3] = 1.0
+    return T
+
+
+def _invert_transform(T):
+    R = T[..., :3, :3]
+    Ti = np.zeros_like(T)
+    Ti[..., :3, :3] = np.swapaxes(R, -1, -2)
+    Ti[..., :3, 3] = -np.einsum("...ji,...j->...i", R, T[..., :3, 3])
+    Ti[..., 3, 3] = 1.0
+    return Ti
+
+
+def joint_frames(q, robot="UR3e", tcp_offset=None):
+    """Lage aller Gelenk-KS im Basis-KS für einen Stapel von Gelenkwinkeln.
+
+    :param q: (6,) oder (N, 6) in rad
+    :return: (N, 8, 4, 4): Index 0 = Basis, 1..6 = KS nach Gelenk 1..6 (6 = Flansch), 7 = TCP
+    """
+    q, _ = _as_batch(q)
+    dh = _dh(robot)
+    frames = np.empty((len(q), 8, 4, 4))
+    frames[:, 0] = np.eye(4)
+    for i in range(6):
+        frames[:, i + 1] = frames[:, i] @ dh_transform(q[:, i], dh["d"][i], dh["a"][i], dh["alpha"][i])
+    frames[:, 7] = frames[:, 6] if tcp_offset is None else frames[:, 6] @ pose_to_matrix(tcp_offset)
+    return frames
+
+
+def forward_kinematics_matrix(q, robot="UR3e", tcp_offset=None):
+    """TCP als homogene Matrix (4, 4) bzw. (N, 4, 4) zu Gelenkwinkeln q (6,) bzw. (N, 6)."""
+    _, single = _as_batch(q)
+    T = joint_frames(q, robot, tcp_offset)[:, 7]
+    return T[0] if single else T
+
+
+def forward_kinematics(q, robot="UR3e", tcp_offset=None):
+    """TCP-Pose(n) zu Gelenkwinkeln q (6,) oder (N, 6); Ergebnis (6,) bzw. (N, 6)."""
+    return matrix_to_pose(forward_kinematics_matrix(q, robot, tcp_offset))
+
+
+def jacobian(q, robot="UR3e", tcp_offset=None):
+    """Geometrische Jacobi-Matrix im Basis-KS, (6, 6) bzw. (N, 6, 6).
+
+    Zeilen 0..2: lineare TCP-Geschwindigkeit, Zeilen 3..5: Winkelgeschwindigkeit,
+    d.h. [v, w] = J @ qd (wie die TCP-Geschwindigkeit bei ur_rtde getActualTCPSpeed).
+    """
+    _, single = _as_batch(q)
+    frames = joint_frames(q, robot, tcp_offset)
+    z = frames[:, :6, :3, 2]            # Drehachsen der Gelenke 1..6 (N, 6, 3)
+    origins = frames[:, :6, :3, 3]      # Ursprünge der Achsen (N, 6, 3)
+    p_tcp = frames[:, 7, None, :3, 3]   # (N, 1, 3)
+    J = np.concatenate([np.cross(z, p_tcp - origins), z], axis=-1)  # (N, 6, 6) je Gelenk eine Zeile
+    J = np.swapaxes(J, -1, -2)          # Spalten = Gelenke
+    return J[0] if single else J
+
+
+def tcp_velocity(q, qd, robot="UR3e", tcp_offset=None):
+    """TCP-Geschwindigkeit [vx, vy, vz, wx, wy, wz] zu Gelenkwinkeln q und -geschwindigkeiten qd."""
+    J = jacobian(q, robot, tcp_offset)
+    # broadcast statt reshape: ein einzelnes qd (6,) gilt für alle N Gelenkstellungen
+    qd = np.broadcast_to(np.asarray(qd, dtype=float), J.shape[:-2] + (6,))
+    return np.einsum("...ij,...j->...i", J, qd)
+
+
+def manipulability(q, robot="UR3e", tcp_offset=None):
+    """Manipulierbarkeit nach Yoshikawa, sqrt(det(J J^T)); nahe 0 = Singularität."""
+    J = jacobian(q, robot, tcp_offset)
+    return np.sqrt(np.abs(np.linalg.det(J @ np.swapaxes(J, -1, -2))))
+
+
+def inverse_kinematics(poses, robot="UR3e", tcp_offset=None):
+    """Alle (bis zu 8) analytischen IK-Lösungen für einen Stapel von TCP-Posen.
+
+    :param poses: Posen (6,) oder (N, 6) als [x, y, z, rx, ry, rz]
+    :param robot: "UR3e" oder "UR5e"
+    :param tcp_offset: optionale TCP-Pose relativ zum Flansch (wie in PolyScope eingestellt)
+    :return: (solutions, valid) mit solutions (N, 8, 6) in rad im Bereich (-pi, pi] und valid (N, 8) bool;
+             ungültige Lösungen (außerhalb des Arbeitsraums) sind NaN.
+             Reihenfolge der Lösungen: Schulter (2) x Handgelenk (2) x Ellbogen (2).
+    """
+    poses, _ = _as_batch(poses)
+    dh = _dh(robot)
+    d1, d4, d5, d6 = dh["d"][0], dh["d"][3], dh["d"][4], dh["d"][5]
+    a2, a3 = dh["a"][1], dh["a"][2]
+    n = len(poses)
+
+    T06 = pose_to_matrix(poses)
+    if tcp_offset is not None:
+        T06 = T06 @ _invert_transform(pose_to_matrix(tcp_offset))
+    R = T06[:, :3, :3]
+    p = T06[:, :3, 3]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # theta1: Position des Handgelenks (Ursprung KS 5)
+        p05 = p - d6 * R[:, :, 2]
+        r05 = np.hypot(p05[:, 0], p05[:, 1])
+        psi = np.arctan2(p05[:, 1], p05[:, 0])
+        phi = np.arccos(d4 / r05)  # NaN, wenn das Handgelenk zu nahe an der Basisachse liegt
+        theta1 = np.stack([psi + phi + np.pi / 2, psi - phi + np.pi / 2], axis=1)  # (N, 2)
+
+        # theta5 je theta1 (Handgelenk oben/unten)
+        s1, c1 = np.sin(theta1), np.cos(theta1)
+        cos5 = (p[:, None, 0] * s1 - p[:, None, 1] * c1 - d4) / d6
+        acos5 = np.arccos(np.clip(cos5, -1.0, 1.0))
+        acos5 = np.where(np.abs(cos5) > 1.0 + 1e-9, np.nan, acos5)
+        theta5 = np.stack([acos5, -acos5], axis=2)  # (N, 2, 2)
+
+        # theta6 aus der Orientierung; bei sin(theta5) = 0 (Singularität) beliebig -> 0
+        s1, c1 = s1[:, :, None], c1[:, :, None]
+        s5 = np.sin(theta5)
+        y = (-R[:, None, None, 0, 1] * s1 + R[:, None, None, 1, 1] * c1)
+        x = (R[:, None, None, 0, 0] * s1 - R[:, None, None, 1, 0] * c1)
+        singular = np.abs(s5) < SINGULAR_EPS
+        theta6 = np.where(singular, 0.0, np.arctan2(y * np.sign(s5), x * np.sign(s5)))  # (N, 2, 2)
+
+        # Ebenes 3-Gelenk-Problem (theta2, theta3, theta4) in KS 1
+        th1 = np.broadcast_to(theta1[:, :, None], theta5.shape)
+        T01 = dh_transform(th1, d1, 0.0, dh["alpha"][0])
+        T45 = dh_transform(theta5, d5, 0.0, dh["alpha"][4])
+        T56 = dh_transform(theta6, d6, 0.0, dh["alpha"][5])
+        T14 = _invert_transform(T01) @ T06[:, None, None] @ _invert_transform(T45 @ T56)
+        px, py = T14[..., 0, 3], T14[..., 1, 3]
+        theta234 = np.arctan2(T14[..., 1, 0], T14[..., 0, 0])
+
+        cos3 = (px ** 2 + py ** 2 - a2 ** 2 - a3 ** 2) / (2.0 * a2 * a3)
+        acos3 = np.where(np.abs(cos3) > 1.0 + 1e-9, np.nan, np.arccos(np.clip(cos3, -1.0, 1.0)))
+        theta3 = np.stack([acos3, -acos3], axis=3)  # (N, 2, 2, 2)
+        theta2 = (np.arctan2(py, px)[..., None]
+                  - np.arctan2(a3 * np.sin(theta3), a2 + a3 * np.cos(theta3)))
+        theta4 = theta234[..., None] - theta2 - theta3
+
+    shape = theta3.shape
+    solutions = np.stack([
+        np.broadcast_to(theta1[:, :, None, None], shape),
+        theta2,
+        theta3,
+        theta4,
+        np.broadcast_to(theta5[..., None], shape),
+        np.broadcast_to(theta6[..., None], shape),
+    ], axis=-1).reshape(n, 8, 6)
+    solutions = wrap_angle(solutions)
+    valid = ~np.any(np.isnan(solutions), axis=-1)
+    return solutions, valid
+
+
+def nearest_solution(solutions, valid, q_seed):
+    """Wählt je Pose die gültige Lösung, die am nächsten an q_seed liegt (Winkeldifferenzen modulo 2 pi).
+
+    :param solutions: (N, 8, 6) aus inverse_kinematics
+    :param valid: (N, 8)
+    :param q_seed: (6,) oder (N, 6), z.B. die aktuellen Gelenkwinkel
+    :return: (q, found) mit q (N, 6) und found (N,) bool; die Lösung wird so um 2 pi verschoben,
+             dass sie möglichst nahe am Seed liegt (wichtig für Gelenke mit +-360° Bereich)
+    """
+    q_seed = np.broadcast_to(np.asarray(q_seed, dtype=float), (solutions.shape[0], 6))
+    delta = wrap_angle(solutions - q_seed[:, None, :])
+    cost = np.where(valid, np.sum(delta ** 2, axis=-1), np.inf)
+    best = np.argmin(cost, axis=1)
+    rows = np.arange(len(best))
+    q = q_seed + delta[rows, best]
+    return q, np.isfinite(cost[rows, best])
+
+
+def is_reachable(poses, robot="UR3e", tcp_offset=None):
+    """Erreichbarkeit je Pose (mindestens eine gültige IK-Lösung) als (N,) bool."""
+    _, valid = inverse_kinematics(poses, robot, tcp_offset)
+    return np.any(valid, axis=1)
+
+
+if __name__ == "__main__":
+    # Kurzer Selbsttest: Zufällige Gelenkwinkel -> FK -> IK -> wieder dieselben Gelenkwinkel
+    import time
+
+    rng = np.random.default_rng()
+    q = rng.uniform(-np.pi, np.pi, (100000, 6))
+    t0 = time.perf_counter()
+    posen = forward_kinematics(q)
+    t1 = time.perf_counter()
+    J = jacobian(q)
+    t2 = time.perf_counter()
+    loesungen, gueltig = inverse_kinematics(posen)
+    t3 = time.perf_counter()
+    q_ik, gefunden = nearest_solution(loesungen, gueltig, q)
+    print(f"FK:       {len(q) / (t1 - t0):12.0f} Posen/s")
+    print(f"Jacobi:   {len(q) / (t2 - t1):12.0f} Matrizen/s")
+    print(f"IK:       {len(q) / (t3 - t2):12.0f} Posen/s (je {gueltig.sum(axis=1).mean():.1f} Lösungen)")
+    print(f"max. Abweichung FK->IK: {np.abs(q_ik - q).max():.2e} rad, alle gefunden: {gefunden.all()}")
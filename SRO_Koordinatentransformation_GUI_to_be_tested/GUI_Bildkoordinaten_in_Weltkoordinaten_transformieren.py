@@ -35,6 +35,7 @@ IP setzen
 """
 
 import sys
+import os
 import math
 import numpy as np
 
@@ -43,15 +44,11 @@ from PyQt6.QtWidgets import (
     QFormLayout, QGroupBox, QPushButton, QLineEdit, QLabel,
     QDoubleSpinBox, QTextEdit
 )
-from PyQt6.QtCore import Qt
 
-# ur_rtde optional importieren, damit das GUI auch ohne Roboter startet
-try:
-    from rtde_control import RTDEControlInterface
-    from rtde_receive import RTDEReceiveInterface
-except ImportError:
-    RTDEControlInterface = None
-    RTDEReceiveInterface = None
+# Roboterzugang über robot_backend; ur_rtde wird erst beim Verbinden importiert,
+# damit das GUI auch ohne Roboter startet (Backend über SRO_ROBOT_BACKEND=ur|webots|mock)
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SRO_ur_rtde_scripts_4_realbot"))
+import robot_backend
 
 
 def rpy_to_rot_matrix(roll, pitch, yaw):
@@ -86,6 +83,7 @@ class CameraToRobotGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Kamera → Roboter Transformation (UR + RTDE)")
+        self.robot = None
         self.rtde_c = None
         self.rtde_r = None
 
@@ -223,35 +221,42 @@ class CameraToRobotGUI(QMainWindow):
     # Robot Connection
     # ------------------------------------------------------------------
     def connect_robot(self):
-        if RTDEControlInterface is None:
-            self.log("ur_rtde ist nicht installiert. Nur Offline-Betrieb möglich.")
-            return
-
         ip = self.ip_edit.text().strip()
         if not ip:
             self.log("Bitte eine IP-Adresse eingeben.")
             return
 
         try:
-            self.rtde_c = RTDEControlInterface(ip)
-            self.rtde_r = RTDEReceiveInterface(ip)
+            self.robot = robot_backend.connect(ip=ip)
+            self.robot.require("moveL", "tcp_pose")
+            self.rtde_c, self.rtde_r = self.robot.rtde_c, self.robot.rtde_r
+            ip = self.robot.ip
             self.robot_status.setText(f"Status: verbunden mit {ip}")
             self.connect_btn.setEnabled(False)
             self.disconnect_btn.setEnabled(True)
             self.move_btn.setEnabled(True)
-            self.log(f"Erfolgreich mit UR-Roboter {ip} verbunden.")
+            self.log(f"Erfolgreich mit Roboter {ip} ({self.robot.name}) verbunden.")
+        except ImportError:
+            self.robot = None
+            self.log("ur_rtde ist nicht installiert. Nur Offline-Betrieb möglich.")
         except Exception as e:
+            if self.robot is not None:
+                self.robot.disconnect()
+            self.robot = None
             self.rtde_c = None
             self.rtde_r = None
             self.robot_status.setText("Status: Verbindung fehlgeschlagen")
             self.log(f"Fehler bei Verbindung: {e}")
 
     def disconnect_robot(self):
-        if self.rtde_c is not None:
+        if self.robot is not None:
             try:
-                self.rtde_c.stopScript()
+                if hasattr(self.rtde_c, "stopScript"):
+                    self.rtde_c.stopScript()
+                self.robot.disconnect()
             except Exception:
                 pass
+        self.robot = None
         self.rtde_c = None
         self.rtde_r = None
         self.robot_status.setText("Status: nicht verbunden")
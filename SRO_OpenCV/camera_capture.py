@@ -0,0 +1,136 @@
+# camera_capture.py
+# Kamera-Einlesen in einem eigenen Thread, für alle Bildverarbeitungs-GUIs
+# Hinweis: identische Kopie in Yolo/camera_capture.py
+#
+# Ruft man cap.read() im GUI-Thread (QTimer) auf, addieren sich Erkennungszeit und Einlesezeit,
+# und die Kamera-Treiber puffern Bilder, die dann veraltet ankommen. Hier liest ein eigener
+# Thread die Kamera mit ihrer vollen Rate in einen kleinen Ringpuffer (deque mit maxlen);
+# ältere Bilder fallen heraus. read() liefert immer das NEUESTE Bild, das der Aufrufer noch
+# nicht bekommen hat - Anzeige, Erkennung und Kamera laufen so mit eigener Rate.
+#
+# Verwendung, z.B.:
+#   self.camera = CameraCapture(0, cv2.CAP_DSHOW).start()
+#   ok, frame = self.camera.read(timeout=0)   # im QTimer: sofort zurück, ok=False wenn nichts Neues
+#   print(self.camera.fps, self.camera.dropped)
+#   self.camera.release()
+#
+# Die gelieferten Bilder werden nicht kopiert; wer darin zeichnet und das Bild länger behält
+# als bis zum nächsten read(), sollte frame.copy() verwenden.
+
+import threading
+import time
+from collections import deque
+
+import cv2
+
+BUFFER_SIZE = 3        # Bilder im Ringpuffer
+FPS_WINDOW = 1.0       # s, Zeitfenster für die Messung der Bildrate
+
+
+class CameraCapture:
+    """Liest eine cv2.VideoCapture in einem Hintergrund-Thread und hält die neuesten Bilder bereit."""
+
+    def __init__(self, source=0, api=None, width=None, height=None, buffer_size=BUFFER_SIZE):
+        self.cap = cv2.VideoCapture(source) if api is None else cv2.VideoCapture(source, api)
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        # Treiberpuffer möglichst klein halten (nicht jedes Backend unterstützt das)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self._frames = deque(maxlen=buffer_size)   # (Bildnummer, Zeitstempel, Bild)
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._last_id = 0        # zuletzt per read() ausgegebene Bildnummer
+        self._frame_times = deque()
+        self.frame_count = 0     # insgesamt eingelesene Bilder
+        self.dropped = 0         # eingelesen, aber nie ausgegeben (veraltet)
+        self.failed_reads = 0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def start(self):
+        """Startet den Lese-Thread und liefert self (für CameraCapture(...).start())."""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            while self._running:
+                ok, frame = self.cap.read()  # blockiert bis zum nächsten Kamerabild
+                now = time.monotonic()
+                if not ok:
+                    self.failed_reads += 1
+                    time.sleep(0.01)
+                    continue
+                with self._cond:
+                    self.frame_count += 1
+                    self._frames.append((self.frame_count, now, frame))
+                    self._frame_times.append(now)
+                    while self._frame_times and now - self._frame_times[0] > FPS_WINDOW:
+                        self._frame_times.popleft()
+                    self._cond.notify_all()
+        finally:
+            # der Lese-Thread gibt die Kamera selbst frei: release() aus einem anderen Thread
+            # während eines blockierenden cap.read() ist bei manchen Backends ein Absturz
+            self.cap.release()
+
+    def read(self, timeout=1.0):
+        """Neuestes noch nicht ausgegebenes Bild als (True, Bild), sonst (False, None) nach timeout s.
+
+        Gleiche Rückgabe wie cv2.VideoCapture.read(); timeout=0 wartet nicht.
+        """
+        with self._cond:
+            if not self._frames or self._frames[-1][0] <= self._last_id:
+                if timeout <= 0 or not self._cond.wait_for(
+                        lambda: self._frames and self._frames[-1][0] > self._last_id, timeout):
+                    return False, None
+            frame_id, _, frame = self._frames[-1]
+            self.dropped += frame_id - self._last_id - 1
+            self._last_id = frame_id
+            return True, frame
+
+    def latest(self):
+        """(Bildnummer, Zeitstempel, Bild) des neuesten Bildes ohne es als gelesen zu markieren, sonst None."""
+        with self._cond:
+            return self._frames[-1] if self._frames else None
+
+    @property
+    def fps(self):
+        """Gemessene Bildrate der Kamera (Bilder in den letzten FPS_WINDOW s)."""
+        with self._cond:
+            times = self._frame_times
+            if len(times) < 2:
+                return 0.0
+            span = times[-1] - times[0]
+            return (len(times) - 1) / span if span > 0 else 0.0
+
+    @property
+    def age(self):
+        """Alter des neuesten Bildes in s (Latenz zwischen Einlesen und Verarbeitung)."""
+        latest = self.latest()
+        return time.monotonic() - latest[1] if latest else float("inf")
+
+    def release(self):
+        """Stoppt den Lese-Thread; die Kamera gibt der Thread beim Beenden selbst frei."""
+        self._running = False
+        if self._thread is None:
+            # nie gestartet: kein Thread, der die Kamera noch benutzt
+            self.cap.release()
+            return
+        self._thread.join(timeout=1.0)
+        if self._thread.is_alive():
+            print("⚠️ Kamera-Thread hängt noch in cap.read(), Kamera wird freigegeben, sobald er endet")
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,172 @@
+# color_detector.py
+# HSV-Farberkennung mit ROIs und Grob-Fein-Suche, misst die Zeit jeder Verarbeitungsstufe
+#
+# Bisher (detect_object_per_color.py): HSV-Umrechnung, inRange, Erodieren/Dilatieren und
+# findContours auf dem ganzen Bild in jedem Takt. Hier:
+#   - ROIs: nur bekannte Bereiche (z.B. das Förderband) werden ausgewertet; mehrere ROIs möglich,
+#     das größte Objekt über alle ROIs gewinnt. Ohne ROI wird das ganze Bild genommen.
+#   - Grob-Fein-Suche (coarse_scale < 1): zuerst auf dem verkleinerten Ausschnitt suchen, dann
+#     nur das Rechteck um den Fund in voller Auflösung auswerten (genaue Kontur und Schwerpunkt).
+#   - timings: Millisekunden je Stufe (resize, hsv, inrange, morph, contours, refine) für das
+#     letzte Bild, aufsummiert über alle ROIs.
+#
+# Verwendung:
+#   detector = ColorDetector((40, 40, 40), (80, 255, 255), rois=[(100, 200, 440, 160)], coarse_scale=0.25)
+#   found = detector.detect(frame)     # None oder (cx, cy, Fläche, Kontur in Bildkoordinaten)
+#   print(detector.timings)
+#
+# Messung an einem Bild:  python color_detector.py bild_von_webcam.png --roi 100,200,440,160 --scale 0.25
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+MIN_AREA = 500           # px² in voller Auflösung, kleinere Flecken ignorieren
+COARSE_SCALE = 0.25      # Verkleinerung für die Grobsuche
+REFINE_MARGIN = 8        # px Rand um den groben Fund für die Feinsuche
+STAGES = ("resize", "hsv", "inrange", "morph", "contours", "refine")
+
+
+class ColorDetector:
+    """Größtes Objekt im HSV-Bereich lower..upper, optional nur in ROIs und grob-fein."""
+
+    def __init__(self, lower, upper, rois=None, coarse_scale=None, min_area=MIN_AREA):
+        self.lower = np.array(lower, dtype=np.uint8)
+        self.upper = np.array(upper, dtype=np.uint8)
+        self.rois = list(rois or [])       # (x, y, w, h) in Bildkoordinaten
+        self.coarse_scale = coarse_scale   # None oder 1.0 = ohne Grobsuche
+        self.min_area = min_area
+        self.kernel = np.ones((5, 5), np.uint8)
+        self.coarse_kernel = np.ones((3, 3), np.uint8)
+        self.timings = dict.fromkeys(STAGES, 0.0)
+
+    def set_range(self, lower, upper):
+        self.lower = np.array(lower, dtype=np.uint8)
+        self.upper = np.array(upper, dtype=np.uint8)
+
+    def _stage(self, name, t0):
+        """Zeit seit t0 der Stufe name gutschreiben und neue Startzeit liefern."""
+        now = time.perf_counter()
+        self.timings[name] += 1000.0 * (now - t0)
+        return now
+
+    def _largest(self, image, kernel, dilate_iterations, min_area, refine=False):
+        """HSV, Maske, Rauschen entfernen, größte Kontur (oder None) im übergebenen Ausschnitt.
+
+        Mit refine=True zählt die ganze Zeit zur Stufe "refine" (Feinsuche der Grob-Fein-Suche).
+        """
+        t = time.perf_counter()
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        t = self._stage("refine" if refine else "hsv", t)
+        mask = cv2.inRange(hsv, self.lower, self.upper)
+        t = self._stage("refine" if refine else "inrange", t)
+        mask = cv2.erode(mask, kernel, iterations=1)
+        mask = cv2.dilate(mask, kernel, iterations=dilate_iterations)
+        t = self._stage("refine" if refine else "morph", t)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        best = max(contours, key=cv2.contourArea) if contours else None
+        self._stage("refine" if refine else "contours", t)
+        if best is None or cv2.contourArea(best) < min_area:
+            return None
+        return best
+
+    def _detect_region(self, frame, x, y, w, h):
+        """Größte Kontur in einem Bildausschnitt, in Bildkoordinaten."""
+        region = frame[y:y + h, x:x + w]   # Ansicht, keine Kopie
+        scale = self.coarse_scale
+        if not scale or scale >= 1.0:
+            c = self._largest(region, self.kernel, 2, self.min_area)
+            return None if c is None else c + (x, y)
+
+        # Grobsuche auf dem verkleinerten Ausschnitt
+        t = time.perf_counter()
+        small = cv2.resize(region, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        self._stage("resize", t)
+        c = self._largest(small, self.coarse_kernel, 1, self.min_area * scale * scale)
+        if c is None:
+            return None
+
+        # Feinsuche: nur das Rechteck um den groben Fund in voller Auflösung
+        bx, by, bw, bh = cv2.boundingRect(c)
+        x0 = max(int(bx / scale) - REFINE_MARGIN, 0)
+        y0 = max(int(by / scale) - REFINE_MARGIN, 0)
+        x1 = min(int((bx + bw) / scale) + REFINE_MARGIN, w)
+        y1 = min(int((by + bh) / scale) + REFINE_MARGIN, h)
+        c = self._largest(region[y0:y1, x0:x1], self.kernel, 2, self.min_area, refine=True)
+        return None if c is None else c + (x + x0, y + y0)
+
+    def detect(self, frame):
+        """Größtes Objekt als (cx, cy, Fläche, Kontur) in Bildkoordinaten, sonst None."""
+        self.timings = dict.fromkeys(STAGES, 0.0)
+        h, w = frame.shape[:2]
+        best = None
+        for x, y, rw, rh in self.rois or [(0, 0, w, h)]:
+            # ROI auf das Bild begrenzen
+            x0, y0 = max(x, 0), max(y, 0)
+            x1, y1 = min(x + rw, w), min(y + rh, h)
+            if x1 <= x0 or y1 <= y0:
+                continue
+            c = self._detect_region(frame, x0, y0, x1 - x0, y1 - y0)
+            if c is not None and (best is None or cv2.contourArea(c) > cv2.contourArea(best)):
+                best = c
+        if best is None:
+            return None
+        M = cv2.moments(best)
+        if M["m00"] == 0:
+            return None
+        return int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"]), M["m00"], best
+
+    @property
+    def total_ms(self):
+        return sum(self.timings.values())
+
+    def timing_text(self):
+        return ", ".join(f"{name} {ms:.1f}" for name, ms in self.timings.items() if ms > 0) + " ms"
+
+
+def draw_rois(frame, rois, color=(255, 128, 0)):
+    for x, y, w, h in rois:
+        cv2.rectangle(frame, (x, y), (x + w, y + h), color, 1)
+    return frame
+
+
+def parse_roi(text):
+    """"x,y,w,h" -> (x, y, w, h)"""
+    values = tuple(int(v) for v in text.split(","))
+    if len(values) != 4:
+        raise argparse.ArgumentTypeError("ROI als x,y,w,h angeben")
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zeit je Stufe der HSV-Erkennung an einem Bild messen")
+    parser.add_argument("image")
+    parser.add_argument("--roi", type=parse_roi, action="append", default=[], help="x,y,w,h (mehrfach möglich)")
+    parser.add_argument("--scale", type=float, default=COARSE_SCALE, help="Verkleinerung der Grobsuche")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    frame = cv2.imread(args.image, cv2.IMREAD_COLOR)
+    if frame is None:
+        raise SystemExit(f"Bild {args.image} konnte nicht geladen werden")
+    variants = [("ganzes Bild", [], None), ("ganzes Bild grob-fein", [], args.scale)]
+    if args.roi:
+        variants += [("ROI", args.roi, None), ("ROI grob-fein", args.roi, args.scale)]
+    for label, rois, scale in variants:
+        detector = ColorDetector((40, 40, 40), (80, 255, 255), rois, scale)
+        sums = dict.fromkeys(STAGES, 0.0)
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            found = detector.detect(frame)
+            for name, ms in detector.timings.items():
+                sums[name] += ms
+        total = 1000.0 * (time.perf_counter() - t0) / args.repeat
+        stages = ", ".join(f"{n} {v / args.repeat:.2f}" for n, v in sums.items() if v > 0)
+        position = None if found is None else found[:2]
+        print(f"{label:<24} {total:6.2f} ms  ({stages})  Objekt {position}")
+
+
+if __name__ == "__main__":
+    main()
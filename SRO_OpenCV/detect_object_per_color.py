@@ -1,8 +1,14 @@
 import sys
 import cv2
-import numpy as np
 from PyQt6 import QtCore, QtGui, QtWidgets
 
+from camera_capture import CameraCapture
+from color_detector import COARSE_SCALE, ColorDetector, draw_rois
+
+# Bereiche, in denen Teile liegen können (x, y, w, h im gespiegelten Bild), z.B. das Förderband;
+# leere Liste = ganzes Bild
+ROIS = [(0, 160, 640, 200)]
+
 
 class VideoWidget(QtWidgets.QLabel):
     def __init__(self, parent=None):
@@ -16,7 +22,8 @@ class MainWindow(QtWidgets.QMainWindow):
         super().__init__()
 
         self.setWindowTitle("HSV Farbtracker (PyQt6 + OpenCV)")
-        self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)  # ggf. CAP_DSHOW unter Windows weglassen
+        # Kamera in eigenem Thread einlesen; ggf. CAP_DSHOW unter Windows weglassen
+        self.camera = CameraCapture(0, cv2.CAP_DSHOW).start()
 
         # Default HSV-Bereiche (z.B. für „grünähnlich“)
         self.h_min = 40
@@ -26,6 +33,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.s_max = 255
         self.v_max = 255
 
+        # Erkennung nur in den ROIs, optional grob (verkleinert) und dann fein
+        self.detector = ColorDetector((self.h_min, self.s_min, self.v_min),
+                                      (self.h_max, self.s_max, self.v_max), ROIS, COARSE_SCALE)
+
         central = QtWidgets.QWidget()
         self.setCentralWidget(central)
 
@@ -61,11 +72,24 @@ class MainWindow(QtWidgets.QMainWindow):
         main_layout = QtWidgets.QVBoxLayout(central)
         main_layout.addWidget(self.video_label)
         main_layout.addLayout(sliders_layout)
-
-        # Timer für Video-Update
+        options_layout = QtWidgets.QHBoxLayout()
+        self.roi_checkbox = QtWidgets.QCheckBox("nur in ROIs suchen")
+        self.roi_checkbox.setChecked(bool(ROIS))
+        self.roi_checkbox.setEnabled(bool(ROIS))
+        self.roi_checkbox.toggled.connect(self.on_options_changed)
+        self.coarse_checkbox = QtWidgets.QCheckBox(f"Grob-Fein-Suche (Faktor {COARSE_SCALE})")
+        self.coarse_checkbox.setChecked(True)
+        self.coarse_checkbox.toggled.connect(self.on_options_changed)
+        options_layout.addWidget(self.roi_checkbox)
+        options_layout.addWidget(self.coarse_checkbox)
+        main_layout.addLayout(options_layout)
+        self.status_label = QtWidgets.QLabel()
+        main_layout.addWidget(self.status_label)
+
+        # Timer für Video-Update; ohne neues Kamerabild kehrt update_frame sofort zurück
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self.update_frame)
-        self.timer.start(30)  # ~33fps
+        self.timer.start(10)
 
     # Slider-Callbacks
     def on_h_min_changed(self, value):
@@ -86,48 +110,37 @@ class MainWindow(QtWidgets.QMainWindow):
     def on_v_max_changed(self, value):
         self.v_max = value
 
+    def on_options_changed(self, _checked):
+        self.detector.rois = list(ROIS) if self.roi_checkbox.isChecked() else []
+        self.detector.coarse_scale = COARSE_SCALE if self.coarse_checkbox.isChecked() else None
+
     def update_frame(self):
-        if not self.cap.isOpened():
+        if not self.camera.isOpened():
             return
 
-        ret, frame = self.cap.read()
+        # neuestes Bild aus dem Kamera-Thread, veraltete werden übersprungen
+        ret, frame = self.camera.read(timeout=0)
         if not ret:
             return
+        t_start = cv2.getTickCount()
 
         # Bild spiegeln (optional, „Spiegelmodus“)
         frame = cv2.flip(frame, 1)
 
-        # BGR → HSV
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-
-        lower = np.array([self.h_min, self.s_min, self.v_min], dtype=np.uint8)
-        upper = np.array([self.h_max, self.s_max, self.v_max], dtype=np.uint8)
-
-        # Maske und Objektfindung
-        mask = cv2.inRange(hsv, lower, upper)
-        # etwas rauschen reduzieren
-        kernel = np.ones((5, 5), np.uint8)
-        mask = cv2.erode(mask, kernel, iterations=1)
-        mask = cv2.dilate(mask, kernel, iterations=2)
-
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        if contours:
-            # größtes Objekt nehmen
-            c = max(contours, key=cv2.contourArea)
-            area = cv2.contourArea(c)
-            if area > 500:  # Schwellwert, um kleine Flecken zu ignorieren
-                # Kontur zeichnen
-                cv2.drawContours(frame, [c], -1, (0, 255, 0), 2)
-
-                M = cv2.moments(c)
-                if M["m00"] != 0:
-                    cx = int(M["m10"] / M["m00"])
-                    cy = int(M["m01"] / M["m00"])
-                    # Schwerpunkt markieren
-                    cv2.circle(frame, (cx, cy), 7, (0, 0, 255), -1)
-                    cv2.putText(frame, f"({cx},{cy})", (cx + 10, cy - 10),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1, cv2.LINE_AA)
+        # BGR → HSV, Maske, Rauschen entfernen, Konturen - je Stufe gemessen
+        self.detector.set_range((self.h_min, self.s_min, self.v_min), (self.h_max, self.s_max, self.v_max))
+        found = self.detector.detect(frame)
+        draw_rois(frame, self.detector.rois)
+
+        if found is not None:
+            # größtes Objekt (Fläche > MIN_AREA, kleine Flecken werden ignoriert)
+            cx, cy, area, c = found
+            # Kontur zeichnen
+            cv2.drawContours(frame, [c], -1, (0, 255, 0), 2)
+            # Schwerpunkt markieren
+            cv2.circle(frame, (cx, cy), 7, (0, 0, 255), -1)
+            cv2.putText(frame, f"({cx},{cy})", (cx + 10, cy - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1, cv2.LINE_AA)
 
         # nach RGB für Qt
         rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -139,10 +152,15 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.video_label.setPixmap(pixmap)
 
+        t_detect = (cv2.getTickCount() - t_start) / cv2.getTickFrequency()
+        self.status_label.setText(f"Kamera {self.camera.fps:.1f} fps, Verarbeitung {1000 * t_detect:.1f} ms, "
+                                  f"verworfen {self.camera.dropped}\n"
+                                  f"Erkennung {self.detector.total_ms:.1f} ms: {self.detector.timing_text()}")
+
     def closeEvent(self, event):
-        # Kamera freigeben
-        if self.cap.isOpened():
-            self.cap.release()
+        # Kamera-Thread beenden und Kamera freigeben
+        self.timer.stop()
+        self.camera.release()
         super().closeEvent(event)
 
 
@@ -11,22 +11,30 @@ Pfad zu TEMPLATE_PATH anpassen.
 Starten:"""
 import sys
 import cv2
-import numpy as np
 
 from PyQt6.QtWidgets import QApplication, QMainWindow, QLabel, QMessageBox
 from PyQt6.QtCore import QTimer, Qt
 from PyQt6.QtGui import QImage, QPixmap
 
+from camera_capture import CameraCapture
+from orb_recognizer import OrbRecognizer, OrbTracker, draw_detections, load_library
 
-# Pfad zum Referenzbild (Foto des Objekts, das Sie erkennen wollen)
+
+# Pfad zum Referenzbild (Foto des Objekts, das Sie erkennen wollen), alternativ ein Ordner
+# mit mehreren Referenzbildern (ein Bild je Teil) oder eine mit orb_recognizer.py erzeugte .npz
 TEMPLATE_PATH = "foto02_roi.jpg"   # <- anpassen
 
+# Track-then-detect: nach der Erkennung nur optischer Fluss, volle Erkennung bei Verlust
+# oder jedes REDETECT_EVERY-te Bild (Taste T schaltet um)
+TRACKING = True
+REDETECT_EVERY = 15
+
 
 class ObjectDetectorWindow(QMainWindow):
     def __init__(self, camera_index=0, parent=None):
         super().__init__(parent)
 
-        self.setWindowTitle("Objekterkennung mit ORB + Homographie (PyQt6 + OpenCV)")
+        self.setWindowTitle("Objekterkennung mit ORB + FLANN-LSH + Homographie (PyQt6 + OpenCV)")
         self.resize(960, 720)
 
         # Video-Anzeige
@@ -34,153 +42,80 @@ class ObjectDetectorWindow(QMainWindow):
         self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setCentralWidget(self.label)
 
-        # Kamera öffnen
-        self.cap = cv2.VideoCapture(camera_index)
-        if not self.cap.isOpened():
+        # Kamera öffnen, Bilder werden in einem eigenen Thread eingelesen
+        self.camera = CameraCapture(camera_index)
+        if not self.camera.isOpened():
             QMessageBox.critical(self, "Fehler", "Kamera konnte nicht geöffnet werden.")
             sys.exit(1)
+        self.camera.start()
 
-        # ORB-Detektor und Matcher vorbereiten
-        self.orb = cv2.ORB_create(
-            nfeatures=1500,
-            scaleFactor=1.2,
-            nlevels=8,
-            edgeThreshold=31,
-            patchSize=31
-        )
-        self.matcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=False)
-
-        # Referenzbild laden und Features berechnen
-        self.template_img_color, self.template_kp, self.template_des = self.load_template(TEMPLATE_PATH)
-        if self.template_img_color is None:
+        # Referenzbilder laden (vorberechnete Merkmale aus templates.npz, falls aktuell)
+        # und gemeinsamen FLANN-LSH-Index für alle Objekte aufbauen
+        self.library = load_library(TEMPLATE_PATH)
+        if not len(self.library):
             QMessageBox.critical(self, "Fehler", f"Referenzbild '{TEMPLATE_PATH}' konnte nicht geladen werden.")
             sys.exit(1)
+        self.detector = OrbRecognizer(self.library)
+        self.tracker = OrbTracker(self.detector, REDETECT_EVERY)
+        self.recognizer = self.tracker if TRACKING else self.detector
+        print(f"[INFO] {len(self.library)} Objekte: {', '.join(self.library.names)}")
 
-        # Template-Eckpunkte (in Template-Koordinaten)
-        h, w = self.template_img_color.shape[:2]
-        self.template_corners = np.float32(
-            [[0, 0],
-             [w - 1, 0],
-             [w - 1, h - 1],
-             [0, h - 1]]
-        ).reshape(-1, 1, 2)
-
-        # Timer für Livebild
+        # Timer für Livebild; ohne neues Kamerabild kehrt update_frame sofort zurück
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_frame)
-        self.timer.start(30)  # ca. 30 fps
-
-    def load_template(self, path):
-        """
-        Referenzbild laden und ORB-Features berechnen.
-        """
-        img_color = cv2.imread(path, cv2.IMREAD_COLOR)
-        if img_color is None:
-            return None, None, None
-
-        img_gray = cv2.cvtColor(img_color, cv2.COLOR_BGR2GRAY)
-        kp, des = self.orb.detectAndCompute(img_gray, None)
-        print(f"[INFO] Template: {len(kp)} Keypoints gefunden")
-        return img_color, kp, des
+        self.timer.start(10)
 
     def update_frame(self):
         """
         Wird vom QTimer zyklisch aufgerufen:
-        - Frame von der Kamera holen
+        - neuestes Frame aus dem Kamera-Thread holen (veraltete werden übersprungen)
         - Objekterkennung durchführen
         - Ergebnisbild im QLabel anzeigen
         """
-        ret, frame = self.cap.read()
+        ret, frame = self.camera.read(timeout=0)
         if not ret:
             return
+        t_start = cv2.getTickCount()
 
         frame_draw = frame.copy()
 
-        # Graubild für Feature-Erkennung
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-        # Keypoints und Deskriptoren im aktuellen Frame berechnen
-        kp_frame, des_frame = self.orb.detectAndCompute(gray, None)
-
-        if des_frame is not None and self.template_des is not None and len(des_frame) > 0:
-            # k-Nächste-Nachbarn-Matching (k=2) für Ratio-Test
-            matches = self.matcher.knnMatch(self.template_des, des_frame, k=2)
-
-            good_matches = []
-            for m, n in matches:
-                # Lowe's Ratio-Test
-                if m.distance < 0.75 * n.distance:
-                    good_matches.append(m)
-
-            # Debug-Ausgabe
-            # print(f"Matches: {len(matches)}, gute Matches: {len(good_matches)}")
-
-            # Nur wenn ausreichend gute Matches vorhanden sind, Homographie schätzen
-            MIN_MATCH_COUNT = 15
-            if len(good_matches) >= MIN_MATCH_COUNT:
-                # Quell- (Template) und Zielpunkte (Frame)
-                src_pts = np.float32([self.template_kp[m.queryIdx].pt for m in good_matches]).reshape(-1, 1, 2)
-                dst_pts = np.float32([kp_frame[m.trainIdx].pt for m in good_matches]).reshape(-1, 1, 2)
-
-                # Homographie berechnen (RANSAC für Robustheit)
-                H, mask = cv2.findHomography(src_pts, dst_pts, cv2.RANSAC, 5.0)
-
-                if H is not None:
-                    # Template-Eckpunkte in das Kamerabild projizieren
-                    dst_corners = cv2.perspectiveTransform(self.template_corners, H)
-
-                    # Polygon (Umriss des erkannten Objekts) einzeichnen
-                    frame_draw = cv2.polylines(
-                        frame_draw,
-                        [np.int32(dst_corners)],
-                        isClosed=True,
-                        color=(0, 255, 0),
-                        thickness=3
-                    )
-
-                    cv2.putText(
-                        frame_draw,
-                        f"Objekt erkannt ({len(good_matches)} Matches)",
-                        (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1.0,
-                        (0, 255, 0),
-                        2,
-                        cv2.LINE_AA
-                    )
-                else:
-                    cv2.putText(
-                        frame_draw,
-                        f"Keine gueltige Homographie ({len(good_matches)} Matches)",
-                        (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1.0,
-                        (0, 0, 255),
-                        2,
-                        cv2.LINE_AA
-                    )
-            else:
-                cv2.putText(
-                    frame_draw,
-                    f"Zu wenige Matches: {len(good_matches)}",
-                    (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    1.0,
-                    (0, 0, 255),
-                    2,
-                    cv2.LINE_AA
-                )
+        # alle Objekte der Bibliothek in einem Durchgang erkennen
+        detections = self.recognizer.recognize(frame)
+        draw_detections(frame_draw, detections)
+
+        if detections:
+            text = f"{len(detections)} Objekt(e) erkannt: " + ", ".join(d.name for d in detections)
+            color = (0, 255, 0)
+        elif self.recognizer.keypoint_count == 0:
+            text = "Keine Features im Frame gefunden"
+            color = (0, 0, 255)
         else:
-            cv2.putText(
-                frame_draw,
-                "Keine Features im Frame gefunden",
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1.0,
-                (0, 0, 255),
-                2,
-                cv2.LINE_AA
-            )
+            text = "Kein Objekt erkannt"
+            color = (0, 0, 255)
+        cv2.putText(
+            frame_draw,
+            text,
+            (10, 30),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.0,
+            color,
+            2,
+            cv2.LINE_AA
+        )
+
+        # Kamera-Bildrate und Verarbeitungszeit anzeigen
+        t_detect = (cv2.getTickCount() - t_start) / cv2.getTickFrequency()
+        cv2.putText(
+            frame_draw,
+            f"Kamera {self.camera.fps:.1f} fps, Erkennung {1000 * t_detect:.0f} ms, "
+            f"verworfen {self.camera.dropped}, Suche: {self.recognizer.last_mode}",
+            (10, frame_draw.shape[0] - 10),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.5,
+            (255, 255, 0),
+            1,
+            cv2.LINE_AA
+        )
 
         # OpenCV BGR -> Qt QImage (BGR888)
         h, w, ch = frame_draw.shape
@@ -195,12 +130,21 @@ class ObjectDetectorWindow(QMainWindow):
             Qt.TransformationMode.SmoothTransformation
         ))
 
+    def keyPressEvent(self, event):
+        """Taste T: zwischen Tracking und Erkennung in jedem Bild umschalten."""
+        if event.key() == Qt.Key.Key_T:
+            self.tracker.tracks = {}
+            self.recognizer = self.detector if self.recognizer is self.tracker else self.tracker
+            print(f"[INFO] Tracking {'an' if self.recognizer is self.tracker else 'aus'}")
+        else:
+            super().keyPressEvent(event)
+
     def closeEvent(self, event):
         """
         Aufräumen beim Schließen des Fensters.
         """
-        if self.cap.isOpened():
-            self.cap.release()
+        self.timer.stop()
+        self.camera.release()
         super().closeEvent(event)
 
 
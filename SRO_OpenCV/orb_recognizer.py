@@ -0,0 +1,433 @@
+# orb_recognizer.py
+# Erkennung vieler Objekte (Teile) mit ORB-Merkmalen, FLANN-LSH-Index und Cache je Objekt
+#
+# Bisher (object_detection_pyqt.py): ein Referenzbild, BFMatcher.knnMatch gegen alle Merkmale
+# des Kamerabildes - bei 50 Teilen wären das 50 Brute-Force-Suchen je Bild. Hier:
+#   1. TemplateLibrary: Referenzbilder einmal auswerten (ORB in mehreren Skalierungen, damit auch
+#      Objekte erkannt werden, die größer als im Referenzbild erscheinen) und als .npz speichern.
+#      Beim nächsten Start wird die Datei geladen, solange kein Referenzbild neuer ist.
+#   2. OrbRecognizer: die Deskriptoren ALLER Objekte liegen in einem gemeinsamen FLANN-LSH-Index.
+#      Jeder Bild-Deskriptor wird einmal gesucht; der Treffer sagt über imgIdx, zu welchem Objekt
+#      er gehört (Stimmen je Objekt). Der Aufwand wächst kaum mit der Zahl der Objekte.
+#   3. Cache je Objekt: für erkannte Objekte wird die Homographie gemerkt. In den folgenden
+#      Bildern werden nur die Deskriptoren dieser Objekte gegen die Merkmale in der Umgebung
+#      der letzten Position geprüft (kleiner BFMatcher). Die vollständige Suche im Index läuft
+#      nur jedes FULL_SEARCH_EVERY-te Bild oder wenn ein Objekt verloren ging.
+#   4. OrbTracker (track-then-detect): nach der Erkennung werden nur noch Eckpunkte im Objekt mit
+#      optischem Fluss (calcOpticalFlowPyrLK) im Ausschnitt um das Objekt verfolgt und die
+#      Homographie fortgeschrieben - ohne ORB-Merkmale und ohne RANSAC-Homographie. Vollständig
+#      erkannt wird erst wieder bei Verlust eines Objekts oder jedes REDETECT_EVERY-te Bild
+#      (dann erscheinen auch neu ins Bild gekommene Objekte).
+#
+# Start:  python orb_recognizer.py build teile/                   (Ordner mit teil_a.jpg, teil_b.png, ...)
+#         python orb_recognizer.py benchmark teile/ --image bild_von_webcam.png --replicate 50
+
+import argparse
+import os
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+TEMPLATE_FEATURES = 500          # ORB-Merkmale je Referenzbild und Skalierung
+TEMPLATE_SCALES = (1.0, 1.5)     # ORB baut nur kleinere Stufen, 1.5 deckt größere Ansichten ab
+FRAME_FEATURES = 1500
+RATIO = 0.75                     # Lowe's Ratio-Test
+MIN_MATCH_COUNT = 15
+FULL_SEARCH_EVERY = 5            # jedes n-te Bild vollständige Suche im Index
+TRACK_MARGIN = 40                # px um die letzte Position, in der gecachte Objekte gesucht werden
+REDETECT_EVERY = 15              # OrbTracker: spätestens jedes n-te Bild wieder vollständig erkennen
+MAX_TRACK_POINTS = 80            # Eckpunkte (goodFeaturesToTrack) je verfolgtem Objekt
+MIN_TRACK_POINTS = 10            # weniger verfolgte Punkte -> Objekt verloren
+FB_ERROR = 1.0                   # px, erlaubter Vorwärts-Rückwärts-Fehler des optischen Flusses
+LK_PARAMS = dict(winSize=(21, 21), maxLevel=3,
+                 criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+CACHE_FILE = "templates.npz"
+
+# FLANN mit LSH (Locality Sensitive Hashing) für binäre Deskriptoren wie ORB
+FLANN_INDEX_LSH = 6
+LSH_INDEX_PARAMS = dict(algorithm=FLANN_INDEX_LSH, table_number=6, key_size=12, multi_probe_level=1)
+LSH_SEARCH_PARAMS = dict(checks=50)
+
+Detection = namedtuple("Detection", "name corners matches inliers")
+
+
+def create_orb(nfeatures):
+    return cv2.ORB_create(nfeatures=nfeatures, scaleFactor=1.2, nlevels=8, edgeThreshold=31, patchSize=31)
+
+
+class TemplateLibrary:
+    """Vorberechnete ORB-Merkmale mehrerer Referenzbilder: Name, Größe, Punkte und Deskriptoren."""
+
+    def __init__(self):
+        self.names = []
+        self.sizes = []   # (w, h) des Referenzbildes
+        self.pts = []     # N x 2 float32, Keypoint-Koordinaten im Referenzbild (Skalierung 1)
+        self.des = []     # N x 32 uint8, ORB-Deskriptoren
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, image, scales=TEMPLATE_SCALES):
+        """Referenzbild (BGR oder Grau) auswerten; liefert die Zahl der Merkmale."""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        orb = create_orb(TEMPLATE_FEATURES)
+        pts, des = [], []
+        for scale in scales:
+            scaled = gray if scale == 1.0 else cv2.resize(gray, None, fx=scale, fy=scale,
+                                                          interpolation=cv2.INTER_LINEAR)
+            kp, d = orb.detectAndCompute(scaled, None)
+            if d is None:
+                continue
+            pts.append(np.float32([k.pt for k in kp]) / scale)
+            des.append(d)
+        if not des:
+            print(f"[WARN] {name}: keine Merkmale gefunden, wird übersprungen")
+            return 0
+        self.names.append(name)
+        self.sizes.append((gray.shape[1], gray.shape[0]))
+        self.pts.append(np.concatenate(pts))
+        self.des.append(np.concatenate(des))
+        return len(self.des[-1])
+
+    def corners(self, index):
+        w, h = self.sizes[index]
+        return np.float32([[0, 0], [w - 1, 0], [w - 1, h - 1], [0, h - 1]]).reshape(-1, 1, 2)
+
+    def save(self, path):
+        counts = [len(d) for d in self.des]
+        np.savez_compressed(
+            path,
+            names=np.array(self.names),
+            sizes=np.array(self.sizes, dtype=np.int32).reshape(-1, 2),
+            offsets=np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+            pts=np.concatenate(self.pts) if self.pts else np.empty((0, 2), np.float32),
+            des=np.concatenate(self.des) if self.des else np.empty((0, 32), np.uint8),
+        )
+
+    @classmethod
+    def load(cls, path):
+        library = cls()
+        with np.load(path) as data:
+            offsets = data["offsets"]
+            for i, name in enumerate(data["names"]):
+                library.names.append(str(name))
+                library.sizes.append(tuple(int(v) for v in data["sizes"][i]))
+                library.pts.append(data["pts"][offsets[i]:offsets[i + 1]])
+                library.des.append(data["des"][offsets[i]:offsets[i + 1]])
+        return library
+
+    @classmethod
+    def from_directory(cls, directory, cache_file=CACHE_FILE):
+        """Alle Bilder eines Ordners (Name = Dateiname ohne Endung); nutzt die gespeicherte .npz,
+        solange kein Bild neuer ist, sonst neu berechnen und speichern."""
+        files = sorted(f for f in os.listdir(directory) if f.lower().endswith(IMAGE_EXTENSIONS))
+        cache_path = os.path.join(directory, cache_file)
+        newest = max((os.path.getmtime(os.path.join(directory, f)) for f in files), default=0)
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= newest:
+            library = cls.load(cache_path)
+            if library.names == [os.path.splitext(f)[0] for f in files]:
+                print(f"[INFO] {len(library)} Templates aus {cache_path} geladen")
+                return library
+        library = cls()
+        for f in files:
+            image = cv2.imread(os.path.join(directory, f), cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                print(f"[WARN] {f} konnte nicht geladen werden")
+                continue
+            count = library.add(os.path.splitext(f)[0], image)
+            print(f"[INFO] Template {f}: {count} Merkmale")
+        library.save(cache_path)
+        print(f"[INFO] {len(library)} Templates berechnet und in {cache_path} gespeichert")
+        return library
+
+
+def load_library(path):
+    """Ein Referenzbild, ein Ordner mit Referenzbildern oder eine gespeicherte .npz."""
+    if os.path.isdir(path):
+        return TemplateLibrary.from_directory(path)
+    if path.endswith(".npz"):
+        return TemplateLibrary.load(path)
+    library = TemplateLibrary()
+    image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if image is not None:
+        library.add(os.path.splitext(os.path.basename(path))[0], image)
+    return library
+
+
+class OrbRecognizer:
+    """Erkennt alle Objekte einer TemplateLibrary in einem Kamerabild."""
+
+    def __init__(self, library, full_search_every=FULL_SEARCH_EVERY):
+        self.library = library
+        self.full_search_every = full_search_every
+        self.orb = create_orb(FRAME_FEATURES)
+        # ein gemeinsamer Index, Bild i = Objekt i
+        self.flann = cv2.FlannBasedMatcher(LSH_INDEX_PARAMS, LSH_SEARCH_PARAMS)
+        if len(library):
+            self.flann.add(library.des)
+            self.flann.train()
+        self.bf = cv2.BFMatcher(cv2.NORM_HAMMING)
+        self.cache = {}        # Objekt-Index -> Homographie aus dem letzten Bild
+        self.frame_count = 0
+        self.last_mode = None  # "index" oder "cache", zur Anzeige
+        self.keypoint_count = 0
+
+    def recognize(self, frame):
+        """Liefert eine Liste von Detection(name, corners (4x1x2), matches, inliers)."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        kp, des = self.orb.detectAndCompute(gray, None)
+        self.frame_count += 1
+        self.keypoint_count = len(kp)
+        if des is None or not len(self.library):
+            self.cache.clear()
+            return []
+        frame_pts = np.float32([k.pt for k in kp])
+
+        tracked = len(self.cache)
+        if tracked and self.frame_count % self.full_search_every:
+            detections = self._recognize_cached(frame_pts, des)
+            if len(detections) == tracked:
+                self.last_mode = "cache"
+                return detections
+            # ein Objekt ging verloren -> im selben Bild vollständig suchen
+        self.last_mode = "index"
+        return self._recognize_index(frame_pts, des)
+
+    def _recognize_index(self, frame_pts, des):
+        """Vollständige Suche: jeder Bild-Deskriptor einmal im gemeinsamen LSH-Index."""
+        votes = {}
+        for pair in self.flann.knnMatch(des, k=2):
+            # LSH liefert gelegentlich weniger als 2 Nachbarn
+            if len(pair) == 2 and pair[0].distance < RATIO * pair[1].distance:
+                m = pair[0]
+                votes.setdefault(m.imgIdx, []).append((m.trainIdx, m.queryIdx))
+        self.cache.clear()
+        detections = []
+        for obj, pairs in votes.items():
+            if len(pairs) < MIN_MATCH_COUNT:
+                continue
+            detection = self._locate(obj, pairs, frame_pts)
+            if detection:
+                detections.append(detection)
+        return detections
+
+    def _recognize_cached(self, frame_pts, des):
+        """Nur die gecachten Objekte, nur gegen Merkmale nahe ihrer letzten Position."""
+        detections = []
+        for obj, H in list(self.cache.items()):
+            corners = cv2.perspectiveTransform(self.library.corners(obj), H).reshape(-1, 2)
+            x0, y0 = corners.min(axis=0) - TRACK_MARGIN
+            x1, y1 = corners.max(axis=0) + TRACK_MARGIN
+            near = np.flatnonzero((frame_pts[:, 0] >= x0) & (frame_pts[:, 0] <= x1) &
+                                  (frame_pts[:, 1] >= y0) & (frame_pts[:, 1] <= y1))
+            del self.cache[obj]
+            if len(near) < MIN_MATCH_COUNT:
+                continue
+            pairs = [(m.queryIdx, near[m.trainIdx])
+                     for m, n in (p for p in self.bf.knnMatch(self.library.des[obj], des[near], k=2)
+                                  if len(p) == 2)
+                     if m.distance < RATIO * n.distance]
+            if len(pairs) < MIN_MATCH_COUNT:
+                continue
+            detection = self._locate(obj, pairs, frame_pts)
+            if detection:
+                detections.append(detection)
+        return detections
+
+    def _locate(self, obj, pairs, frame_pts):
+        """Homographie Template -> Bild per RANSAC; bei Erfolg Objekt in den Cache."""
+        idx = np.array(pairs)
+        src = self.library.pts[obj][idx[:, 0]].reshape(-1, 1, 2)
+        dst = frame_pts[idx[:, 1]].reshape(-1, 1, 2)
+        H, mask = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
+        if H is None:
+            return None
+        inliers = int(mask.sum())
+        corners = cv2.perspectiveTransform(self.library.corners(obj), H)
+        # verdrehte/entartete Vierecke verwerfen
+        if inliers < MIN_MATCH_COUNT or not cv2.isContourConvex(np.int32(corners)):
+            return None
+        self.cache[obj] = H
+        return Detection(self.library.names[obj], corners, len(pairs), inliers)
+
+
+class OrbTracker:
+    """Track-then-detect: OrbRecognizer nur zum (Wieder-)Finden, dazwischen optischer Fluss.
+
+    Gleiche Schnittstelle wie OrbRecognizer: recognize(frame) -> Liste von Detection;
+    last_mode ist zusätzlich "track", wenn nur verfolgt wurde.
+    """
+
+    def __init__(self, recognizer, redetect_every=REDETECT_EVERY):
+        self.recognizer = recognizer
+        self.library = recognizer.library
+        self.redetect_every = redetect_every
+        self.tracks = {}        # Objekt-Index -> [Homographie, Punkte N x 1 x 2 im Bild]
+        self.prev_gray = None
+        self.frames_since_detect = 0
+        self.last_mode = None
+
+    @property
+    def keypoint_count(self):
+        return self.recognizer.keypoint_count
+
+    def recognize(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        detections = None
+        if self.tracks and self.prev_gray is not None and self.frames_since_detect < self.redetect_every:
+            detections = self._track(self.prev_gray, gray)
+        if detections is None:
+            detections = self._detect(gray)
+        self.prev_gray = gray
+        return detections
+
+    def _detect(self, gray):
+        """Vollständige Erkennung; die letzten verfolgten Positionen dienen dem Recognizer als Cache."""
+        self.recognizer.cache = {obj: H for obj, (H, _) in self.tracks.items()}
+        detections = self.recognizer.recognize(gray)
+        self.last_mode = self.recognizer.last_mode
+        self.frames_since_detect = 0
+        self.tracks = {}
+        for obj, H in self.recognizer.cache.items():
+            pts = self._features(gray, obj, H)
+            if pts is not None and len(pts) >= MIN_TRACK_POINTS:
+                self.tracks[obj] = [H, pts]
+        return detections
+
+    def _features(self, gray, obj, H):
+        """Gut verfolgbare Eckpunkte innerhalb des erkannten Objekts."""
+        corners = cv2.perspectiveTransform(self.library.corners(obj), H)
+        mask = np.zeros_like(gray)
+        cv2.fillConvexPoly(mask, np.int32(corners).reshape(-1, 2), 255)
+        return cv2.goodFeaturesToTrack(gray, MAX_TRACK_POINTS, 0.01, 5, mask=mask)
+
+    def _track(self, prev_gray, gray):
+        """Alle Objekte per optischem Fluss weiterschieben; None, sobald eines verloren geht."""
+        self.frames_since_detect += 1
+        h_img, w_img = gray.shape[:2]
+        detections = []
+        for obj, track in self.tracks.items():
+            H, pts = track
+            # nur der Ausschnitt um das Objekt wird für die Bildpyramiden von LK gebraucht
+            corners = cv2.perspectiveTransform(self.library.corners(obj), H).reshape(-1, 2)
+            x0, y0 = np.maximum(corners.min(axis=0) - TRACK_MARGIN, 0).astype(int)
+            x1, y1 = np.minimum(corners.max(axis=0) + TRACK_MARGIN, (w_img, h_img)).astype(int)
+            if x1 - x0 < 2 * MIN_TRACK_POINTS or y1 - y0 < 2 * MIN_TRACK_POINTS:
+                return None
+            offset = np.float32([x0, y0])
+            prev_roi, roi = prev_gray[y0:y1, x0:x1], gray[y0:y1, x0:x1]
+            p0 = pts - offset
+            p1, st, _ = cv2.calcOpticalFlowPyrLK(prev_roi, roi, p0, None, **LK_PARAMS)
+            p0r, st_back, _ = cv2.calcOpticalFlowPyrLK(roi, prev_roi, p1, None, **LK_PARAMS)
+            fb_error = np.abs(p0 - p0r).reshape(-1, 2).max(axis=1)
+            good = (st.ravel() == 1) & (st_back.ravel() == 1) & (fb_error < FB_ERROR)
+            if good.sum() < MIN_TRACK_POINTS:
+                return None
+            old, new = pts[good], p1[good] + offset
+            # Bewegung zwischen zwei Bildern: Verschiebung, Drehung, Skalierung
+            A, inliers = cv2.estimateAffinePartial2D(old, new)
+            if A is None or inliers.sum() < MIN_TRACK_POINTS:
+                return None
+            H = np.vstack([A, [0.0, 0.0, 1.0]]) @ H
+            corners = cv2.perspectiveTransform(self.library.corners(obj), H)
+            if not cv2.isContourConvex(np.int32(corners)):
+                return None
+            track[0], track[1] = H, new[inliers.ravel() == 1].reshape(-1, 1, 2)
+            count = int(inliers.sum())
+            detections.append(Detection(self.library.names[obj], corners, count, count))
+        self.last_mode = "track"
+        return detections
+
+
+def draw_detections(frame, detections):
+    """Umriss und Name aller erkannten Objekte einzeichnen."""
+    for d in detections:
+        cv2.polylines(frame, [np.int32(d.corners)], isClosed=True, color=(0, 255, 0), thickness=3)
+        x, y = np.int32(d.corners[0, 0])
+        cv2.putText(frame, f"{d.name} ({d.inliers})", (int(x), max(int(y) - 8, 15)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2, cv2.LINE_AA)
+    return frame
+
+
+def replicate(library, count):
+    """Templates unter neuen Namen wiederholen, um eine Bibliothek mit count Teilen nachzubilden."""
+    big = TemplateLibrary()
+    for i in range(count):
+        j = i % len(library)
+        big.names.append(f"{library.names[j]}_{i}")
+        big.sizes.append(library.sizes[j])
+        big.pts.append(library.pts[j])
+        big.des.append(library.des[j])
+    return big
+
+
+def benchmark(library, image, repeat=30):
+    """Zeit je Bild: BFMatcher je Template (bisheriges Verfahren) gegen LSH-Index, Cache und Tracking."""
+    orb = create_orb(FRAME_FEATURES)
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    _, des = orb.detectAndCompute(gray, None)
+    bf = cv2.BFMatcher(cv2.NORM_HAMMING)
+    for count in sorted({1, max(1, len(library) // 5), len(library)}):
+        sub = replicate(library, count)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for d in sub.des:
+                bf.knnMatch(d, des, k=2)
+        t_bf = (time.perf_counter() - t0) / repeat
+        recognizer = OrbRecognizer(sub, full_search_every=1)  # ohne Cache: immer Indexsuche
+        recognizer.recognize(image)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            recognizer.recognize(image)
+        t_index = (time.perf_counter() - t0) / repeat
+        recognizer = OrbRecognizer(sub)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            recognizer.recognize(image)
+        t_cached = (time.perf_counter() - t0) / repeat
+        tracker = OrbTracker(OrbRecognizer(sub))
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            tracker.recognize(image)
+        t_tracked = (time.perf_counter() - t0) / repeat
+        print(f"{count:4d} Objekte: BF je Template {1000 * t_bf:7.1f} ms | LSH-Index (inkl. ORB) "
+              f"{1000 * t_index:7.1f} ms | mit Cache {1000 * t_cached:7.1f} ms | "
+              f"mit Tracking {1000 * t_tracked:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ORB-Templates vorberechnen und Erkennung messen")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="Ordner mit Referenzbildern auswerten und .npz speichern")
+    p.add_argument("directory")
+    p.add_argument("-o", "--output", default=None, help="Zieldatei (Standard: <Ordner>/templates.npz)")
+    p = sub.add_parser("benchmark", help="Zeit je Bild in Abhängigkeit der Objektzahl")
+    p.add_argument("templates", help="Referenzbild, Ordner oder .npz")
+    p.add_argument("--image", required=True, help="Kamerabild für die Messung")
+    p.add_argument("--replicate", type=int, default=0, help="Bibliothek auf so viele Objekte vervielfachen")
+    p.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        library = TemplateLibrary.from_directory(args.directory)
+        if args.output:
+            library.save(args.output)
+        for name, d in zip(library.names, library.des):
+            print(f"{name:<30} {len(d):5d} Deskriptoren")
+    else:
+        library = load_library(args.templates)
+        if not len(library):
+            raise SystemExit("Keine Templates gefunden")
+        if args.replicate:
+            library = replicate(library, args.replicate)
+        image = cv2.imread(args.image, cv2.IMREAD_COLOR)
+        if image is None:
+            raise SystemExit(f"Bild {args.image} konnte nicht geladen werden")
+        benchmark(library, image, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import os
 import sys
 import math
 import threading
@@ -7,13 +8,10 @@ from PyQt6.QtWidgets import (
     QDoubleSpinBox, QLabel, QGroupBox, QHBoxLayout, QVBoxLayout
 )
 
-# ur_rtde
-try:
-    import rtde_control
-    import rtde_receive
-except ImportError:
-    rtde_control = None
-    rtde_receive = None
+# Roboter-Backend: ur_rtde, Webots oder Mock (Auswahl über SRO_ROBOT_BACKEND)
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..",
+                                "SRO_ur_rtde_scripts_4_realbot"))
+import robot_backend
 
 
 class URJogGUI(QWidget):
@@ -199,20 +197,21 @@ class URJogGUI(QWidget):
     def connect_robot(self):
         if self.connected:
             return
-        if rtde_control is None or rtde_receive is None:
-            QtWidgets.QMessageBox.critical(self, "Fehler",
-                                           "ur_rtde ist nicht installiert (pip install ur_rtde).")
-            return
         ip = self.ip_edit.text().strip()
         try:
-            self.rtde_c = rtde_control.RTDEControlInterface(ip)
-            self.rtde_r = rtde_receive.RTDEReceiveInterface(ip)
+            self.robot = robot_backend.connect(ip=ip)
+            self.rtde_c = self.robot.rtde_c
+            self.rtde_r = self.robot.rtde_r
             self.connected = True
             self.status_lbl.setText(f"Verbunden mit {ip}")
             self._set_controls_enabled(True)
             self.connect_btn.setEnabled(False)
             self.disconnect_btn.setEnabled(True)
             self.timer.start()
+        except ImportError:
+            QtWidgets.QMessageBox.critical(self, "Fehler",
+                                           "ur_rtde ist nicht installiert (pip install ur_rtde).")
+            return
         except Exception as e:
             self.rtde_c = None
             self.rtde_r = None
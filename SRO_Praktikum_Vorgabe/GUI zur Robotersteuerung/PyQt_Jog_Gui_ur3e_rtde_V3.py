@@ -1,5 +1,6 @@
 # Tested OK an Roboter 03: UR3e und ur_rtde 2025_11_27
 
+import os
 import sys
 import math
 import csv
@@ -7,16 +8,14 @@ import threading
 from PyQt6 import QtWidgets, QtCore
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QGridLayout, QPushButton, QLineEdit, QListWidget,
-    QDoubleSpinBox, QLabel, QGroupBox, QHBoxLayout, QVBoxLayout, QFileDialog
+    QDoubleSpinBox, QLabel, QGroupBox, QHBoxLayout, QVBoxLayout, QFileDialog, QProgressBar
 )
+from motion_executor import MotionExecutor
 
-# ur_rtde
-try:
-    import rtde_control
-    import rtde_receive
-except ImportError:
-    rtde_control = None
-    rtde_receive = None
+# Roboter-Backend: ur_rtde, Webots oder Mock (Auswahl über SRO_ROBOT_BACKEND)
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..",
+                                "SRO_ur_rtde_scripts_4_realbot"))
+import robot_backend
 
 
 def r2d(rad):
@@ -37,6 +36,7 @@ class URJogGUI(QWidget):
         self.rtde_c = None
         self.rtde_r = None
         self.connected = False
+        self.motion = None  # MotionExecutor für moveL im Hintergrund
 
         # Jog-Status
         self.current_twist = [0, 0, 0, 0, 0, 0]  # [vx,vy,vz,wx,wy,wz]  m/s, rad/s
@@ -276,11 +276,16 @@ class URJogGUI(QWidget):
         # Status & Stopp
         bottom = QHBoxLayout()
         self.status_lbl = QLabel("Getrennt")
+        self.move_progress = QProgressBar()
+        self.move_progress.setRange(0, 100)
+        self.move_progress.setMaximumWidth(160)
         self.estop_btn = QPushButton("Stopp (speedStop)")
         self.estop_btn.setStyleSheet("QPushButton { font-weight: bold; }")
         self.estop_btn.setEnabled(False)
         bottom.addWidget(self.status_lbl)
         bottom.addStretch(1)
+        bottom.addWidget(QLabel("moveL:"))
+        bottom.addWidget(self.move_progress)
         bottom.addWidget(self.estop_btn)
         main.addLayout(bottom)
 
@@ -334,20 +339,25 @@ class URJogGUI(QWidget):
     def connect_robot(self):
         if self.connected:
             return
-        if rtde_control is None or rtde_receive is None:
-            QtWidgets.QMessageBox.critical(self, "Fehler",
-                                           "ur_rtde ist nicht installiert (pip install ur_rtde).")
-            return
         ip = self.ip_edit.text().strip()
         try:
-            self.rtde_c = rtde_control.RTDEControlInterface(ip)
-            self.rtde_r = rtde_receive.RTDEReceiveInterface(ip)
+            self.robot = robot_backend.connect(ip=ip)
+            self.rtde_c = self.robot.rtde_c
+            self.rtde_r = self.robot.rtde_r
+            self.motion = MotionExecutor(self.rtde_c, self.rtde_r.getActualTCPPose)
+            self.motion.progress.connect(self.move_progress.setValue)
+            self.motion.motionFinished.connect(self._on_move_finished)
+            self.motion.start()
             self.connected = True
             self.status_lbl.setText(f"Verbunden mit {ip}")
             self._set_controls_enabled(True)
             self.connect_btn.setEnabled(False)
             self.disconnect_btn.setEnabled(True)
             self.timer.start()
+        except ImportError:
+            QtWidgets.QMessageBox.critical(self, "Fehler",
+                                           "ur_rtde ist nicht installiert (pip install ur_rtde).")
+            return
         except Exception as e:
             self.rtde_c = None
             self.rtde_r = None
@@ -359,6 +369,9 @@ class URJogGUI(QWidget):
         self.timer.stop()
         self._stop_jog()
         self._disable_hold()
+        if self.motion:
+            self.motion.stop()  # bricht eine laufende moveL-Bewegung ab
+            self.motion = None
         try:
             if self.rtde_c:
                 try:
@@ -382,8 +395,9 @@ class URJogGUI(QWidget):
     def _start_jog(self, axis: int, sign: int, rotational: bool):
         if not self.connected or self.rtde_c is None:
             return
-        # Hold aus, sobald man manuell joggt
+        # Hold aus und laufendes moveL abbrechen, sobald man manuell joggt
         self._disable_hold()
+        self._cancel_move()
         v_lin = self.lin_speed_spin.value()
         v_ang = self.ang_speed_spin.value()
         twist = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
@@ -406,10 +420,18 @@ class URJogGUI(QWidget):
             pass
 
     def estop(self):
-        # Not-Aus (softwareseitig): stoppe Jog & Hold
+        # Not-Aus (softwareseitig): stoppe Jog, Hold & moveL
+        self._cancel_move()
         self._stop_jog()
         self._disable_hold()
 
+    def _cancel_move(self):
+        if self.motion:
+            self.motion.cancel()  # stopL im Worker-Thread
+
+    def _on_move_finished(self, reached: bool, message: str):
+        self.status_lbl.setText(message)
+
     # -------------- Teach --------------
     def _teach_current_pose(self):
         if not self.connected or self.rtde_r is None:
@@ -452,12 +474,10 @@ class URJogGUI(QWidget):
         target = list(self.teach_points[idx]["pose"])
         v = self.movel_v_spin.value()
         a = self.movel_a_spin.value()
-        try:
-            # Blocking moveL – Achtung: blockiert GUI nicht, da RTDE intern blockierend ist,
-            # aber Aufruf in GUI-Thread ist für kurze Bewegungen ok. Für lange Trajektorien -> Thread.
-            self.rtde_c.moveL(target, a, v)  # blend=0, async=False (default)
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "moveL Fehler", str(e))
+        # moveL läuft im MotionExecutor (asynchron), die GUI bleibt bedienbar;
+        # "Stopp" bricht die Bewegung per stopL ab, Fehler kommen über motionFinished
+        self.motion.move_to(target, v, a)
+        self.status_lbl.setText(f'Fahre zu {self.teach_points[idx]["name"]} …')
 
     def _delete_selected(self):
         idx = self._selected_teach_index()
@@ -491,7 +511,8 @@ class URJogGUI(QWidget):
                 QtWidgets.QMessageBox.information(self, "Info", "Kein Hold-Ziel gesetzt.")
                 self.btn_hold_toggle.setChecked(False)
                 return
-            # Beim Aktivieren Jog stoppen
+            # Beim Aktivieren Jog und moveL stoppen
+            self._cancel_move()
             self._stop_jog()
             self.hold_active = True
             self.btn_hold_toggle.setText("Hold EIN")
@@ -541,12 +562,15 @@ class URJogGUI(QWidget):
         if not self.connected:
             return
 
+        # Während einer moveL-Bewegung keine speedL/servoL-Befehle dazwischenschicken
+        moving = self.motion is not None and self.motion.is_busy()
+
         # 1) Jog Command
         try:
             with self.lock:
                 jog = self.jog_active
                 twist = list(self.current_twist)
-            if jog and self.rtde_c:
+            if jog and self.rtde_c and not moving:
                 acc = self.acc_spin.value()
                 self.rtde_c.speedL(twist, acc, 0.1)  # time=0.1s
         except Exception as e:
@@ -555,7 +579,7 @@ class URJogGUI(QWidget):
 
         # 2) Pose-Hold per servoL (sofern aktiv)
         try:
-            if self.hold_active and self.hold_pose and self.rtde_c:
+            if self.hold_active and self.hold_pose and self.rtde_c and not moving:
                 a = self.servo_a_spin.value()
                 v = self.servo_v_spin.value()
                 lookahead = self.servo_lookahead_spin.value()
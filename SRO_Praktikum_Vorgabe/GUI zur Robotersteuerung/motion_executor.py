@@ -0,0 +1,169 @@
+# motion_executor.py
+# Nicht-blockierende Ausführung von moveL-Bewegungen für die PyQt-GUIs (ur_rtde)
+# Hinweis: identische Kopie in SRO_ur_rtde_scripts_4_realbot/motion_executor.py
+#
+# Ein blockierendes rtde_c.moveL(...) im Slot-Handler friert die Ereignisschleife ein,
+# bis der Roboter angekommen ist. Der MotionExecutor führt die Bewegungen stattdessen
+# in einem eigenen QThread asynchron aus (moveL(..., asynchronous=True)), meldet den
+# Fortschritt per Signal und kann die laufende Bewegung mit stopL abbrechen.
+#
+# Jog-Klicks, die während einer laufenden Bewegung eintreffen, werden zu EINEM Folgeziel
+# zusammengefasst: 10 Klicks à 5 mm ergeben eine Bewegung um 50 mm statt 10 Einzelfahrten
+# mit Stillstand dazwischen.
+#
+# Verwendung, z.B.:
+#   self.motion = MotionExecutor(self.rtde_c, self.rtde_r.getActualTCPPose)
+#   self.motion.progress.connect(self.progressBar.setValue)
+#   self.motion.start()
+#   self.motion.jog(dz=0.005)         # kehrt sofort zurück
+#   self.motion.cancel()              # stopL
+#   self.motion.stop()                # beim Schließen des Fensters
+
+import math
+import threading
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class MotionExecutor(QThread):
+    """Führt moveL-Bewegungen im Hintergrund aus; es gibt höchstens ein wartendes Ziel."""
+    progress = pyqtSignal(int)              # Fortschritt der laufenden Bewegung in %
+    motionStarted = pyqtSignal(list)        # Zielpose
+    motionFinished = pyqtSignal(bool, str)  # (erreicht, Meldung)
+
+    def __init__(self, rtde_c, get_pose, speed=0.25, acceleration=0.5,
+                 stop_deceleration=2.0, poll_interval=0.02):
+        """
+        :param rtde_c: RTDEControlInterface
+        :param get_pose: Funktion ohne Argumente, liefert die aktuelle TCP-Pose [x, y, z, rx, ry, rz]
+                         (z.B. rtde_r.getActualTCPPose oder ein Telemetrie-Schnappschuss)
+        :param stop_deceleration: Verzögerung für stopL beim Abbrechen in m/s^2
+        """
+        super().__init__()
+        self.rtde_c = rtde_c
+        self.get_pose = get_pose
+        self.speed = speed
+        self.acceleration = acceleration
+        self.stop_deceleration = stop_deceleration
+        self.poll_interval = poll_interval
+        self.running = True
+        self._cond = threading.Condition()
+        self._pending = None    # (Zielpose, speed, acceleration) der nächsten Bewegung
+        self._active = None     # Zielpose der laufenden Bewegung
+        self._cancel = False
+        self._coalesced = 0     # Anzahl zusammengefasster Jog-Klicks im wartenden Ziel
+
+    # -------------- Aufrufe aus dem GUI-Thread (kehren sofort zurück) --------------
+    def move_to(self, pose, speed=None, acceleration=None):
+        """Neues Ziel vorgeben; ein noch wartendes Ziel wird ersetzt."""
+        with self._cond:
+            self._pending = ([float(v) for v in pose],
+                             self.speed if speed is None else speed,
+                             self.acceleration if acceleration is None else acceleration)
+            self._coalesced = 0
+            self._cond.notify()
+
+    def jog(self, dx=0.0, dy=0.0, dz=0.0, speed=None, acceleration=None):
+        """Relativbewegung des TCP im Basis-KS in m.
+
+        Bezug ist das zuletzt vorgegebene Ziel (wartend oder laufend), sonst die aktuelle Pose.
+        Mehrere Klicks während einer Bewegung summieren sich so zu einem einzigen Folgeziel.
+        """
+        with self._cond:
+            if self._pending is not None:
+                base, speed_old, acceleration_old = self._pending
+                speed = speed_old if speed is None else speed
+                acceleration = acceleration_old if acceleration is None else acceleration
+            elif self._active is not None:
+                base = self._active
+            else:
+                base = None
+        if base is None:
+            # Poseabfrage außerhalb des Locks, damit der Worker nicht warten muss
+            base = list(self.get_pose())
+        target = [base[0] + dx, base[1] + dy, base[2] + dz, base[3], base[4], base[5]]
+        with self._cond:
+            coalesced = self._coalesced + 1 if self._pending is not None else 1
+            self._pending = (target,
+                             self.speed if speed is None else speed,
+                             self.acceleration if acceleration is None else acceleration)
+            self._coalesced = coalesced
+            self._cond.notify()
+
+    def cancel(self):
+        """Laufende Bewegung per stopL abbrechen und wartendes Ziel verwerfen.
+
+        Das abgebrochene Ziel gilt sofort nicht mehr als Bezug: ein Jog während des Abbremsens
+        geht von der tatsächlichen Pose aus.
+        """
+        with self._cond:
+            self._pending = None
+            self._active = None
+            self._coalesced = 0
+            self._cancel = True
+            self._cond.notify()
+
+    def is_busy(self):
+        with self._cond:
+            return self._active is not None or self._pending is not None
+
+    def stop(self):
+        """Worker beenden (z.B. in closeEvent); eine laufende Bewegung wird abgebrochen."""
+        with self._cond:
+            self.running = False
+            self._pending = None
+            self._cancel = True
+            self._cond.notify()
+        self.wait()
+
+    # -------------- Worker-Thread --------------
+    def run(self):
+        while True:
+            with self._cond:
+                while self.running and self._pending is None:
+                    self._cond.wait()
+                if not self.running:
+                    break
+                target, speed, acceleration = self._pending
+                coalesced = self._coalesced
+                self._pending = None
+                self._coalesced = 0
+                self._active = target
+                self._cancel = False
+            try:
+                if coalesced > 1:
+                    print(f"{coalesced} Jog-Klicks zu einer Bewegung zusammengefasst")
+                self.motionStarted.emit(target)
+                reached = self._execute(target, speed, acceleration)
+                self.motionFinished.emit(reached, "Ziel erreicht" if reached else "Bewegung abgebrochen")
+            except Exception as e:
+                self.motionFinished.emit(False, f"moveL Fehler: {e}")
+            finally:
+                with self._cond:
+                    self._active = None
+
+    def _execute(self, target, speed, acceleration):
+        start = list(self.get_pose())
+        distance = math.dist(start[:3], target[:3])
+        self.progress.emit(0)
+        self.rtde_c.moveL(target, speed, acceleration, True)  # asynchronous=True
+        t_sent = time.monotonic()
+        started = False
+        while True:
+            if self._cancel:
+                self.rtde_c.stopL(self.stop_deceleration)
+                return False
+            # < 0: keine asynchrone Bewegung aktiv, d.h. abgeschlossen
+            # (oder kurz nach dem Senden noch nicht gestartet)
+            if self.rtde_c.getAsyncOperationProgress() < 0:
+                if started or time.monotonic() - t_sent > 1.0:
+                    break
+            else:
+                started = True
+                if distance > 1e-6:
+                    remaining = math.dist(self.get_pose()[:3], target[:3])
+                    self.progress.emit(int(100 * max(0.0, min(1.0, 1.0 - remaining / distance))))
+            time.sleep(self.poll_interval)
+        self.progress.emit(100)
+        return True
@@ -4,12 +4,15 @@
 # https://sdurobotics.gitlab.io/ur_rtde/examples/examples.html
 
 # import rtde_control  # > pip install ur-rtde  ggf. pip iupdaten mit > python.exe -m pip install --upgrade pip
-import rtde_receive
 # import rtde_io
-import robotiq_gripper
 # import time
 
+import os
 import sys
+# Roboter-Backend: ur_rtde, Webots oder Mock (Auswahl über SRO_ROBOT_BACKEND)
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..",
+                                "SRO_ur_rtde_scripts_4_realbot"))
+import robot_backend
 from PyQt6 import QtWidgets, QtCore
 from PyQt6.QtWidgets import QMainWindow
 from PyQt6.QtCore import QSize   
@@ -21,9 +24,9 @@ ROBOT_IP = "192.168.0.3"
 class MainWindow(QMainWindow):
     def __init__(self):
         QMainWindow.__init__(self)
-        self.rtde_r = rtde_receive.RTDEReceiveInterface(ROBOT_IP)
-        self.gripper = robotiq_gripper.RobotiqGripper()
-        self.gripper.connect(ROBOT_IP, 63352)
+        self.robot = robot_backend.connect(ip=ROBOT_IP, receive_only=True)
+        self.rtde_r = self.robot.rtde_r
+        self.gripper = self.robot.connect_gripper()  # None, wenn das Backend keinen Greifer hat
 
         self.setMinimumSize(QSize(300, 300))    
         self.setWindowTitle("SRO -  get Robot Infos")
@@ -51,8 +54,12 @@ class MainWindow(QMainWindow):
         self.lbl_gripper.resize(250,20)       
         self.lbl_gripper.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
         self.lbl_gripper.move(50, 190)
+        if self.gripper is None:
+            self.lbl_gripper.setText("kein Greifer")
 
     def log_info(self ):
+        if self.gripper is None:
+            return
         print(f"Pos: {str(self.gripper.get_current_position()): >3}  "
               f"Open: {self.gripper.is_open(): <2}  "
               f"Closed: {self.gripper.is_closed(): <2}  ")
@@ -73,6 +80,8 @@ class MainWindow(QMainWindow):
         self.lbl_pose_z.setText('z: '+ str(z) +' mm' )
         
         self.log_info()
+        if self.gripper is None:
+            return
         grpr_pos = self.gripper.get_current_position()
         # self.lbl_gripper.setText('Gripper: ' + str(grpr_pos))
         if grpr_pos < 10:
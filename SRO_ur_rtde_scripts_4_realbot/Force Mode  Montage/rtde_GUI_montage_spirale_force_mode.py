@@ -3,31 +3,151 @@ THIS FILE IS UNDER HEAVY CONSTRUCTION
 
 ur_rtde Skript für die Montage eines Objekts per Spiralbewegung unter konstantem Kraftstoß nach unten. 
 Im GUI gibst du Zielpose, Kraft und Spiral-Parameter ein; der Roboter fährt die Spirale im Kraftmodus ab. 
-Das Skript orientiert sich an der Dokumentation und Praxis für UR-e-Roboter mit Force-Mode."""
+Das Skript orientiert sich an der Dokumentation und Praxis für UR-e-Roboter mit Force-Mode.
+
+Die Spirale wird nicht mehr Punkt für Punkt mit blockierendem moveL abgefahren, sondern
+in einem Worker-Thread gestreamt (das GUI bleibt bedienbar, Abbruch jederzeit möglich):
+  - "Pfad (moveL mit Überschleifen)": alle Punkte als ein Pfad mit Blend-Radien, ein einziger Befehl
+  - "servoL (fester Takt)": Spirale auf Bahngeschwindigkeit abgetastet, servoL mit 500 Hz
+  - "Einzel-moveL": bisheriges Verhalten, ein moveL pro Punkt (zum Vergleich der Taktzeit)"""
 
 import sys
+import os
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout
+    QApplication, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout,
+    QComboBox, QProgressBar
 )
+from PyQt6.QtCore import QThread, pyqtSignal
 import numpy as np
 import time
 
-import rtde_control
-import rtde_receive
+# Gemeinsame Bahngenerierung aus SRO_Kinematik, Roboterzugang über robot_backend
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SRO_Kinematik"))
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import path_patterns
+import robot_backend
 
 ROBOT_IP = "192.168.0.17"  # setze IP passend
 
+MODE_PATH = "Pfad (moveL mit Überschleifen)"
+MODE_SERVO = "servoL (fester Takt)"
+MODE_SINGLE = "Einzel-moveL"
+SERVO_DT = 0.002  # 500 Hz Regeltakt der e-Series
+
 def generate_spiral_points(center_pose, radius, steps, revolutions, height_step):
-    points = []
-    for i in range(steps * revolutions):
-        theta = 2 * np.pi * i / steps
-        r = radius * (i / (steps * revolutions))
-        x = center_pose[0] + r * np.cos(theta)
-        y = center_pose[1] + r * np.sin(theta)
-        z = center_pose[2] + height_step * (i / (steps * revolutions))
-        pose = [x, y, z, center_pose[3], center_pose[4], center_pose[5]]
-        points.append(pose)
-    return points
+    # vektorisiert, liefert dieselben Punkte wie die frühere Schleife
+    return path_patterns.spiral(center_pose, radius, revolutions, steps, height=height_step)
+
+def build_blended_path(points, speed, acceleration, blend):
+    """Wegpunkte als moveL-Pfad [x, y, z, rx, ry, rz, v, a, blend] für ur_rtde.
+    Der Blend-Radius darf höchstens knapp die halbe Segmentlänge betragen."""
+    points = np.asarray(points, dtype=float)
+    seg = np.linalg.norm(np.diff(points[:, :3], axis=0), axis=1)
+    blend_max = 0.45 * np.minimum(np.r_[seg, np.inf], np.r_[np.inf, seg])
+    blends = np.minimum(blend, blend_max)
+    blends[-1] = 0.0  # am letzten Punkt muss der Roboter anhalten
+    return [[float(v) for v in p] + [speed, acceleration, float(b)] for p, b in zip(points, blends)]
+
+def resample_path(points, speed, dt):
+    """Wegpunkte so dicht abtasten, dass bei Bahngeschwindigkeit speed pro Takt dt ein Punkt folgt."""
+    return path_patterns.resample_by_time(points, speed, dt)
+
+class MontageWorker(QThread):
+    """Führt die Montage im Hintergrund aus, damit das GUI nicht einfriert."""
+    progress = pyqtSignal(int, int)   # aktueller Punkt, Anzahl Punkte
+    finished_msg = pyqtSignal(str)
+
+    def __init__(self, mode, pose, points, force, speed, acceleration, blend):
+        super().__init__()
+        self.mode = mode
+        self.pose = pose
+        self.points = points
+        self.force = force
+        self.speed = speed
+        self.acceleration = acceleration
+        self.blend = blend
+        self._cancel = False
+
+    def cancel(self):
+        self._cancel = True
+
+    def run(self):
+        robot = None
+        t_start = time.perf_counter()
+        try:
+            robot = robot_backend.connect(ip=ROBOT_IP)
+            robot.require("force_mode")  # Kraftmodus gibt es nur am echten UR
+            rtde_c = robot.rtde_c
+
+            task_frame = self.pose
+            selection_vector = [0, 0, 1, 0, 0, 0]
+            wrench = [0, 0, self.force, 0, 0, 0]
+            force_type = 2
+            limits = [10, 10, 5, 1, 1, 1]
+
+            rtde_c.forceMode(task_frame, selection_vector, wrench, force_type, limits)
+            if self.mode == MODE_PATH:
+                self.run_path(rtde_c)
+            elif self.mode == MODE_SERVO:
+                self.run_servo(rtde_c)
+            else:
+                self.run_single(rtde_c)
+            state = "abgebrochen" if self._cancel else "fertig"
+            self.finished_msg.emit(f"Montage {state} nach {time.perf_counter() - t_start:.2f} s")
+        except Exception as e:
+            self.finished_msg.emit(f"Fehler: {e}")
+        finally:
+            if robot is not None and robot.has("force_mode"):
+                robot.rtde_c.forceModeStop()
+                robot.rtde_c.stopScript()
+            elif robot is not None:
+                robot.disconnect()
+
+    def run_path(self, rtde_c):
+        # Ein einziger Befehl für die ganze Spirale; Fortschritt asynchron abfragen
+        path = build_blended_path(self.points, self.speed, self.acceleration, self.blend)
+        rtde_c.moveL(path, True)  # asynchronous=True
+        t_sent = time.perf_counter()
+        started = False
+        while True:
+            index = rtde_c.getAsyncOperationProgress()
+            if index < 0:
+                # < 0: kein Pfad aktiv, d.h. abgeschlossen (oder kurz nach dem Senden noch nicht gestartet)
+                if started or time.perf_counter() - t_sent > 1.0:
+                    break
+                time.sleep(0.01)
+                continue
+            started = True
+            self.progress.emit(index, len(path))
+            if self._cancel:
+                rtde_c.stopL(self.acceleration * 5)
+                break
+            time.sleep(0.05)
+        self.progress.emit(len(path), len(path))
+
+    def run_servo(self, rtde_c):
+        # Spirale auf die Bahngeschwindigkeit abtasten und im festen Takt streamen
+        samples = resample_path(self.points, self.speed, SERVO_DT)
+        lookahead_time = 0.1
+        gain = 300
+        for i, target in enumerate(samples):
+            if self._cancel:
+                break
+            t_cycle = rtde_c.initPeriod()
+            rtde_c.servoL(target.tolist(), 0.0, 0.0, SERVO_DT, lookahead_time, gain)
+            if i % 50 == 0:
+                self.progress.emit(i, len(samples))
+            rtde_c.waitPeriod(t_cycle)
+        rtde_c.servoStop()
+        self.progress.emit(len(samples), len(samples))
+
+    def run_single(self, rtde_c):
+        # Bisheriges Verfahren: blockierendes moveL pro Punkt (Stillstand an jedem Punkt)
+        for i, p in enumerate(self.points):
+            if self._cancel:
+                break
+            rtde_c.moveL([float(v) for v in p], self.speed, self.acceleration)
+            self.progress.emit(i + 1, len(self.points))
 
 class SpiralForceGUI(QWidget):
     def __init__(self):
@@ -53,6 +173,9 @@ class SpiralForceGUI(QWidget):
         self.steps_edit = QLineEdit("36")
         self.rev_edit = QLineEdit("3")
         self.hstep_edit = QLineEdit("0.0")
+        self.speed_edit = QLineEdit("0.05")
+        self.acc_edit = QLineEdit("0.1")
+        self.blend_edit = QLineEdit("0.001")
         layout.addWidget(QLabel("Spiralradius [m]"))
         layout.addWidget(self.radius_edit)
         layout.addWidget(QLabel("Schritte/Umdrehung"))
@@ -61,11 +184,33 @@ class SpiralForceGUI(QWidget):
         layout.addWidget(self.rev_edit)
         layout.addWidget(QLabel("Z-Schritt pro Umdrehung [m]"))
         layout.addWidget(self.hstep_edit)
+        layout.addWidget(QLabel("Bahngeschwindigkeit [m/s]"))
+        layout.addWidget(self.speed_edit)
+        layout.addWidget(QLabel("Beschleunigung [m/s²]"))
+        layout.addWidget(self.acc_edit)
+        layout.addWidget(QLabel("Blend-Radius [m] (nur Pfad-Modus)"))
+        layout.addWidget(self.blend_edit)
+
+        self.mode_box = QComboBox()
+        self.mode_box.addItems([MODE_PATH, MODE_SERVO, MODE_SINGLE])
+        layout.addWidget(QLabel("Bewegungsart"))
+        layout.addWidget(self.mode_box)
 
         self.btn_start = QPushButton("Montage starten")
         self.btn_start.clicked.connect(self.start_montage)
         layout.addWidget(self.btn_start)
 
+        self.btn_stop = QPushButton("Abbrechen")
+        self.btn_stop.clicked.connect(self.stop_montage)
+        self.btn_stop.setEnabled(False)
+        layout.addWidget(self.btn_stop)
+
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+        self.status_label = QLabel("Bereit")
+        layout.addWidget(self.status_label)
+        self.worker = None
+
         self.setLayout(layout)
 
     def start_montage(self):
@@ -76,21 +221,39 @@ class SpiralForceGUI(QWidget):
         revs = int(self.rev_edit.text())
         hstep = float(self.hstep_edit.text())
 
+        speed = float(self.speed_edit.text())
+        acceleration = float(self.acc_edit.text())
+        blend = float(self.blend_edit.text())
+
         points = generate_spiral_points(pose, radius, steps, revs, hstep)
-        rtde_c = rtde_control.RTDEControlInterface(ROBOT_IP)
-
-        task_frame = pose
-        selection_vector = [0, 0, 1, 0, 0, 0]
-        wrench = [0, 0, force, 0, 0, 0]
-        force_type = 2
-        limits = [10, 10, 5, 1, 1, 1]
-
-        rtde_c.forceMode(task_frame, selection_vector, wrench, force_type, limits)
-        for p in points:
-            rtde_c.moveL(p, 0.05, 0.1)
-            time.sleep(0.1)
-        rtde_c.forceModeStop()
-        rtde_c.stopScript()
+
+        self.worker = MontageWorker(self.mode_box.currentText(), pose, points, force,
+                                    speed, acceleration, blend)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished_msg.connect(self.on_finished)
+        self.btn_start.setEnabled(False)
+        self.btn_stop.setEnabled(True)
+        self.status_label.setText("Montage läuft ...")
+        self.worker.start()
+
+    def stop_montage(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def on_progress(self, index, total):
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(index)
+
+    def on_finished(self, message):
+        self.status_label.setText(message)
+        self.btn_start.setEnabled(True)
+        self.btn_stop.setEnabled(False)
+
+    def closeEvent(self, event):
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        event.accept()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
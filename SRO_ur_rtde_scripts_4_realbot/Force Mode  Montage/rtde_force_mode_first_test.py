@@ -7,13 +7,15 @@
 # Basierend auf dem Force-Mode-Exampe auf
 # https://sdurobotics.gitlab.io/ur_rtde/examples/examples.html#forcemode-example
 
-import rtde_control      # Steuerungsfunktionen des Roboters über RTDE
-import rtde_receive
-import math
+import os
+import sys
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import robot_backend     # Verbindung über robot_backend, Kraftmodus gibt es nur am echten UR
 #ROBOT_IP = "192.168.0.3"   # IP des Roboters hier UR3e
 ROBOT_IP = "192.168.0.17" 
-rtde_c = rtde_control.RTDEControlInterface(ROBOT_IP)  # Verbindung herstellen
-rtde_r = rtde_receive.RTDEReceiveInterface(ROBOT_IP)
+robot = robot_backend.connect(ip=ROBOT_IP)  # Verbindung herstellen
+robot.require("force_mode", "contact", "fixed_rate")
+rtde_c, rtde_r = robot.rtde_c, robot.rtde_r
 
 # Bezugsrahmen für die Kraftsteuerung setzen, in diesem Fall kein Offset (ein Null-Vektor).
 # Verschiebung und/oder Rotation des Koordinatensystems in Bezug auf das Weltkoordinatensystem des Roboters.
@@ -9,14 +9,15 @@
 # Spiral tested with Wood 
 # Dübel in OSB-Platte eindrücken
 
-import rtde_control      # Steuerungsfunktionen des Roboters über RTDE
-import rtde_receive
-import time
-import numpy as np
+import os
+import sys
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import robot_backend     # Verbindung über robot_backend, Kraftmodus gibt es nur am echten UR
 import math
 ROBOT_IP = "192.168.0.17"   # IP des Roboters hier UR3e
-rtde_c = rtde_control.RTDEControlInterface(ROBOT_IP)  # Verbindung herstellen
-rtde_r = rtde_receive.RTDEReceiveInterface(ROBOT_IP)
+robot = robot_backend.connect(ip=ROBOT_IP)  # Verbindung herstellen
+robot.require("force_mode", "contact", "servoL")
+rtde_c, rtde_r = robot.rtde_c, robot.rtde_r
 
 # Kraftsteuerung konfigurieren
 task_frame = [0, 0, 0, 0, 0, 0]  
@@ -8,12 +8,17 @@
 # Last edited by Olaf Just at 19.05.2025
 # Tested on UR5e 
 #--------------------------------------------------------------------------------
-import rtde_control
 import msvcrt
 import time
 
+import robot_backend  # ur_rtde, Webots oder Mock (Auswahl über SRO_ROBOT_BACKEND)
+
 ROBOT_IP = "192.168.0.3"
-rtde_c = rtde_control.RTDEControlInterface(ROBOT_IP)
+robot = robot_backend.connect(ip=ROBOT_IP)
+robot.require("jog")
+rtde_c = robot.rtde_c
+# Konstante von ur_rtde (RTDEControlInterface.FEATURE_BASE = 0), beim Mock nicht vorhanden
+FEATURE_BASE = getattr(rtde_c, "FEATURE_BASE", 0)
 
 # TCP soll bewegt werden
 speed_magnitude = 0.03  # Geschwindigkeit in m/s
@@ -52,7 +57,7 @@ try:
         # - `FEATURE_BASE`: Bewegung relativ zum Basiskoordinatensystem (Roboterfuß).  
         # - `FEATURE_MOMENTARY_MOVEMENT`: Bewegung relativ zur aktuellen Position.
 
-        rtde_c.jogStart(speed_vector, rtde_control.RTDEControlInterface.FEATURE_BASE) 
+        rtde_c.jogStart(speed_vector, FEATURE_BASE)
 
         time.sleep(0.02)  # 20 ms Wartezeit
 finally:
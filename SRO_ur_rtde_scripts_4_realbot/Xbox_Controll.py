@@ -1,14 +1,18 @@
 # Projekt mit XBOX-Controller
 import sys
+import threading
 import time
 from PyQt5.QtCore import QTimer, QThread, pyqtSignal
 from PyQt5.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget, QProgressBar
 import pygame
-import rtde_control
-import rtde_receive
-import robotiq_gripper
+import robot_backend  # ur_rtde, Webots oder Mock (Auswahl über SRO_ROBOT_BACKEND)
 
 ROBOT_IP = "192.168.0.51"
+
+CONTROL_RATE = 125      # Hz, Takt der Jog-Regelschleife (bis 500 Hz bei e-Series)
+GUI_UPDATE_RATE = 25    # Hz, Balkenanzeige im GUI (Signale nicht mit voller Regelrate senden)
+STATS_INTERVAL = 1.0    # s, Abstand der Zykluszeit-Statistik
+
 #Notaus Label
 class ClickableLabel(QLabel):
     clicked = pyqtSignal()
@@ -16,25 +20,85 @@ class ClickableLabel(QLabel):
     def mousePressEvent(self, event):
         self.clicked.emit()
 
+class GripperWorker(QThread):
+    """Führt die blockierenden Greiferbefehle getrennt von der Jog-Schleife aus.
+
+    Es zählt nur der zuletzt angeforderte Befehl; während einer Greiferbewegung
+    eintreffende Anforderungen ersetzen sich gegenseitig.
+    """
+    updateGripperState = pyqtSignal(str, bool)
+
+    def __init__(self, gripper):
+        super().__init__()
+        self.running = True
+        self.gripper = gripper  # None, wenn das Backend keinen Greifer hat
+        if self.gripper is not None:
+            self.gripper.activate()
+        self._cond = threading.Condition()
+        self._request = None  # (Zielposition, Button-Text)
+
+    def request(self, position, button_status):
+        # kehrt sofort zurück, die Regelschleife wird nicht aufgehalten
+        with self._cond:
+            self._request = (position, button_status)
+            self._cond.notify()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self.running and self._request is None:
+                    self._cond.wait()
+                if not self.running:
+                    break
+                position, button_status = self._request
+                self._request = None
+            if self.gripper is None:
+                print(f"{button_status}: kein Greifer verbunden")
+                continue
+            try:
+                self.gripper.move_and_wait_for_pos(position, 255, 255)
+                self.updateGripperState.emit(button_status, self.gripper.is_open())
+            except Exception as e:
+                print(f"Error in gripper worker: {e}")
+
+    def stop(self):
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+
+
 class RobotControlThread(QThread):
     updateValues = pyqtSignal(float, float, float, float, float, float)
     updateGripperState = pyqtSignal(str, bool)
+    updateCycleStats = pyqtSignal(float, float, int)  # mittlere / maximale Zykluszeit in ms, Überläufe
 
-    def __init__(self, rtde_r, rtde_c, joystick):
+    def __init__(self, rtde_r, rtde_c, joystick, gripper):
         super().__init__()
         self.rtde_r = rtde_r
         self.rtde_c = rtde_c
         self.joystick = joystick
         self.running = True
         self.paused = False
-        self.gripper = robotiq_gripper.RobotiqGripper()
-        self.gripper.connect(ROBOT_IP, 63352)
-        self.gripper.activate()
+        self.gripper_worker = GripperWorker(gripper)
+        self.gripper_worker.updateGripperState.connect(self.updateGripperState)
         self.speed_magnitude = 0.05 #speed X,Y,Z
         self.speed_magnitude_r = 0.20 #speed roll,pitch,yaw
+        self.period = 1.0 / CONTROL_RATE
+        self.overruns = 0  # Zyklen, deren Rechenzeit länger als die Periode war
+        self.prev_buttons = (False, False)
 
     def run(self):
+        self.gripper_worker.start()
+        gui_every = max(1, CONTROL_RATE // GUI_UPDATE_RATE)
+        cycle = 0
+        cycle_sum = 0.0
+        cycle_max = 0.0
+        cycle_count = 0
+        t_stats = time.perf_counter()
         while self.running:
+            # Fester Takt wie in den ur_rtde-Beispielen: initPeriod() ... waitPeriod(t_start)
+            t_start = self.rtde_c.initPeriod()
+            t_cycle = time.perf_counter()
             try:
                 pygame.event.pump()
 
@@ -71,30 +135,47 @@ class RobotControlThread(QThread):
                     elif hat_y < 0:  # Down D-Pad
                         self.state_roll -= 1
 
-                    # Handle gripper actions
-                    if self.joystick.get_button(0):  # A button
+                    # Handle gripper actions (nur bei neuem Tastendruck, Ausführung im Greifer-Thread)
+                    buttons = (bool(self.joystick.get_button(0)), bool(self.joystick.get_button(1)))
+                    if buttons[0] and not self.prev_buttons[0]:  # A button
                         print("Gripper opening...")
-                        self.gripper.move_and_wait_for_pos(0, 255, 255)
-                        self.updateGripperState.emit("A Button: Pressed", self.gripper.is_open())
-                    elif self.joystick.get_button(1):  # B button
+                        self.gripper_worker.request(0, "A Button: Pressed")
+                    elif buttons[1] and not self.prev_buttons[1]:  # B button
                         print("Gripper closing...")
-                        self.gripper.move_and_wait_for_pos(255, 255, 255)
-                        self.updateGripperState.emit("B Button: Pressed", self.gripper.is_open())
+                        self.gripper_worker.request(255, "B Button: Pressed")
+                    self.prev_buttons = buttons
 
-                    # Emit signal to update bars
-                    self.updateValues.emit(
-                        self.state_x, self.state_y, self.state_z, self.state_roll, self.state_pitch, self.state_yaw
-                    )
+                    # Emit signal to update bars (gedrosselt, nicht in jedem Regelzyklus)
+                    if cycle % gui_every == 0:
+                        self.updateValues.emit(
+                            self.state_x, self.state_y, self.state_z, self.state_roll, self.state_pitch, self.state_yaw
+                        )
 
                     speed_vector = self.calculate_speed_vector()
                     self.rtde_c.jogStart(speed_vector)
-                    time.sleep(0.01)  # Adjusted frequency for control updates
 
             except Exception as e:
                 print(f"Error in run loop: {e}")
 
+            # Zykluszeit ohne Wartezeit messen, Überläufe zählen
+            duration = time.perf_counter() - t_cycle
+            if duration > self.period:
+                self.overruns += 1
+            cycle_sum += duration
+            cycle_max = max(cycle_max, duration)
+            cycle_count += 1
+            cycle += 1
+            if t_cycle - t_stats >= STATS_INTERVAL:
+                self.updateCycleStats.emit(1000.0 * cycle_sum / cycle_count, 1000.0 * cycle_max, self.overruns)
+                cycle_sum = 0.0
+                cycle_max = 0.0
+                cycle_count = 0
+                t_stats = t_cycle
+            self.rtde_c.waitPeriod(t_start)
+
     def stop(self):
         self.running = False
+        self.gripper_worker.stop()
         self.rtde_c.jogStop()
 
     def calculate_speed_vector(self):
@@ -144,11 +225,12 @@ class XBoxController(QWidget):
         self.A_button_label = QLabel("A Button: Released", self)
         self.B_button_label = QLabel("B Button: Released", self)
         self.gripper_label = QLabel("Gripper Closed", self)
+        self.cycle_label = QLabel(f"Zyklus ({CONTROL_RATE} Hz): --", self)
 
         font_style = "color: white; font-family: 'Times New Roman'; font-size: 40px;"
         for label in [self.x_label, self.y_label, self.z_label, self.roll_label,
                       self.pitch_label, self.yaw_label, self.lbl_pose_complete,
-                      self.A_button_label, self.B_button_label, self.gripper_label]:
+                      self.A_button_label, self.B_button_label, self.gripper_label, self.cycle_label]:
             label.setStyleSheet(font_style)
 
         for bar in [self.x_bar, self.y_bar, self.z_bar, self.roll_bar, self.pitch_bar, self.yaw_bar]:
@@ -167,6 +249,7 @@ class XBoxController(QWidget):
         layout.addWidget(self.B_button_label)
         layout.addWidget(self.gripper_label)
         layout.addWidget(self.lbl_pose_complete)
+        layout.addWidget(self.cycle_label)
         layout.addWidget(self.emergency_stop_label)
 
         self.setLayout(layout)
@@ -178,11 +261,15 @@ class XBoxController(QWidget):
 
     def initRobot(self):
         try:
-            self.rtde_c = rtde_control.RTDEControlInterface(ROBOT_IP)
-            self.rtde_r = rtde_receive.RTDEReceiveInterface(ROBOT_IP)
-            self.robot_thread = RobotControlThread(self.rtde_r, self.rtde_c, self.joystick)
+            self.robot = robot_backend.connect(ip=ROBOT_IP)
+            self.robot.require("jog", "fixed_rate")
+            self.rtde_c = self.robot.rtde_c
+            self.rtde_r = self.robot.rtde_r
+            self.robot_thread = RobotControlThread(self.rtde_r, self.rtde_c, self.joystick,
+                                                   self.robot.connect_gripper())
             self.robot_thread.updateValues.connect(self.updateBars)
             self.robot_thread.updateGripperState.connect(self.updateGripperInfo)
+            self.robot_thread.updateCycleStats.connect(self.updateCycleInfo)
             self.robot_thread.start()
         except Exception as e:
             print(f"Failed to initialize robot: {e}")
@@ -221,6 +308,10 @@ class XBoxController(QWidget):
         # Update gripper state
         self.gripper_label.setText("Gripper " + ("Opened" if gripper_open else "Closed"))
 
+    def updateCycleInfo(self, mean_ms, max_ms, overruns):
+        self.cycle_label.setText(f"Zyklus ({CONTROL_RATE} Hz): {mean_ms:.2f} ms, max {max_ms:.2f} ms, "
+                                 f"Überläufe {overruns}")
+
     def updateJoystickData(self):
         try:
             pygame.event.pump()
@@ -236,6 +327,7 @@ class XBoxController(QWidget):
         if self.robot_thread:
             self.robot_thread.stop()
             self.robot_thread.wait()
+            self.robot_thread.gripper_worker.wait()
         pygame.quit()
         event.accept()
 
@@ -0,0 +1,404 @@
+# production_db.py
+# Datenbankschema und Abfragen für Fertigungszyklen zur Rückverfolgung (Traceability):
+# welches Teil (z.B. RFID-UID vom ESP32-Leser, siehe SRO_MicroPython_ESP32/sw02_RFID_print.py)
+# wurde wann an welcher Station mit welchem Ergebnis und welchen Messwerten bearbeitet.
+#
+# Gegenüber Python2SQL.py:
+#   - nur parametrisierte Abfragen (Platzhalter statt Werte im SQL-Text) und explizite Spalten statt SELECT *
+#   - zusammengesetzte Indizes passend zu den Abfragen, z.B. (part_id, start_time)
+#   - zeitliche Partitionierung: je Kalendermonat (UTC) eine Tabelle cycles_JJJJMM bzw.
+#     measurements_JJJJMM. Abfragen mit Zeitbereich lesen nur die betroffenen Monate,
+#     alte Monate lassen sich mit einem DROP TABLE archivieren/löschen.
+#     (Monatstabellen statt MySQL-PARTITION BY RANGE: funktioniert gleich in SQLite und MySQL,
+#     und der Primärschlüssel muss die Monatsspalte nicht enthalten.)
+#   - die Zyklus-ID enthält den Monat (JJJJMM * 10^10 + laufende Nummer), Messwerte zu einer
+#     Zyklus-ID werden dadurch ohne Suche über alle Monate gefunden. Die laufende Nummer steht je
+#     Monat in der Tabelle cycle_sequence und wird in derselben Transaktion wie das INSERT
+#     weitergezählt, damit mehrere Stationen/Prozesse auf derselben Datenbank schreiben können
+#
+# Verwendung:
+#   db = ProductionDB.open("sqlite", "production.sqlite")        # oder ("mysql", "sro_db")
+#   cycle_id = db.record_cycle("04A1B2C3D4", "UR3e_01", time.time(), 12.4, RESULT_OK,
+#                              {"force_max": 31.2, "depth": 0.0124})
+#   rows = db.cycles_for_uid("04A1B2C3D4", t_from=time.time() - 90 * 86400)
+#
+# Benchmark (synthetische Daten, Abfragezeiten), schreibt ohne --database in eine temporäre
+# SQLite-Datei, die danach gelöscht wird (--keep behält sie); MySQL nur mit ausdrücklicher --database:
+#   python production_db.py --benchmark 10000000
+
+import argparse
+import calendar
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from rtde_sql_logger import create_pool
+
+RESULT_OK = 0
+RESULT_NOK = 1
+RESULT_ABORTED = 2
+
+MONTH_FACTOR = 10 ** 10  # cycle_id = JJJJMM * MONTH_FACTOR + laufende Nummer im Monat
+
+CYCLE_COLUMNS = ("cycle_id", "part_id", "station", "start_time", "duration", "result")
+MEASUREMENT_COLUMNS = ("cycle_id", "name", "value")
+
+
+def month_of(timestamp):
+    """Monatsschlüssel JJJJMM (UTC) für einen Unix-Zeitstempel."""
+    t = time.gmtime(timestamp)
+    return t.tm_year * 100 + t.tm_mon
+
+
+def month_start(month):
+    """Unix-Zeitstempel des Monatsanfangs (UTC) für JJJJMM."""
+    return calendar.timegm((month // 100, month % 100, 1, 0, 0, 0))
+
+
+def next_month(month):
+    year, mon = divmod(month, 100)
+    return (year + 1) * 100 + 1 if mon == 12 else month + 1
+
+
+def months_between(t_from, t_to):
+    """Alle Monatsschlüssel, die den Zeitbereich [t_from, t_to] berühren."""
+    months = []
+    month, last = month_of(t_from), month_of(t_to)
+    while month <= last:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+class ProductionDB:
+    """Zugriff auf Teile, Zyklen und Messwerte über einen Verbindungspool (SQLite oder MySQL)."""
+
+    def __init__(self, pool, placeholder, backend):
+        self.pool = pool
+        self.p = placeholder
+        self.backend = backend
+        self._months = None       # vorhandene Monatspartitionen (Cache)
+        self._create_tables()
+
+    @classmethod
+    def open(cls, backend="sqlite", database="production.sqlite", pool_size=2, **mysql_config):
+        pool, placeholder = create_pool(backend, database, pool_size, **mysql_config)
+        return cls(pool, placeholder, backend)
+
+    # -------------- Hilfsfunktionen --------------
+    def _execute(self, sql, params=(), many=False, fetch=False):
+        connection = self.pool.get_connection()
+        try:
+            cursor = connection.cursor()
+            if many:
+                cursor.executemany(sql, params)
+            else:
+                cursor.execute(sql, params)
+            rows = cursor.fetchall() if fetch else None
+            connection.commit()
+            return rows
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def _create_tables(self):
+        if self.backend == "sqlite":
+            self._execute("CREATE TABLE IF NOT EXISTS parts ("
+                          "part_id INTEGER PRIMARY KEY AUTOINCREMENT, uid VARCHAR(32) NOT NULL UNIQUE, "
+                          "first_seen DOUBLE)")
+        else:
+            self._execute("CREATE TABLE IF NOT EXISTS parts ("
+                          "part_id INT AUTO_INCREMENT PRIMARY KEY, uid VARCHAR(32) NOT NULL UNIQUE, "
+                          "first_seen DOUBLE)")
+        # nächste freie Zyklus-ID je Monat, wird nur innerhalb der Schreib-Transaktion geändert
+        self._execute("CREATE TABLE IF NOT EXISTS cycle_sequence (month INTEGER PRIMARY KEY, next_id BIGINT NOT NULL)")
+
+    def months(self):
+        """Vorhandene Monatspartitionen, aufsteigend."""
+        if self._months is None:
+            if self.backend == "sqlite":
+                sql = "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'cycles_%'"
+            else:
+                sql = ("SELECT table_name FROM information_schema.tables "
+                       "WHERE table_schema = DATABASE() AND table_name LIKE 'cycles\\_%'")
+            names = [row[0] for row in self._execute(sql, fetch=True)]
+            self._months = {int(name.split("_")[1]) for name in names if name.split("_")[1].isdigit()}
+        return sorted(self._months)
+
+    def ensure_month(self, month):
+        """Legt die Tabellen und Indizes für einen Monat an (idempotent)."""
+        if month in self.months():
+            return
+        cycles, measurements = f"cycles_{month}", f"measurements_{month}"
+        if self.backend == "sqlite":
+            statements = [
+                f"CREATE TABLE IF NOT EXISTS {cycles} (cycle_id INTEGER PRIMARY KEY, part_id INTEGER NOT NULL, "
+                f"station VARCHAR(32) NOT NULL, start_time DOUBLE NOT NULL, duration DOUBLE, result INTEGER)",
+                f"CREATE INDEX IF NOT EXISTS ix_{cycles}_part_time ON {cycles} (part_id, start_time)",
+                f"CREATE INDEX IF NOT EXISTS ix_{cycles}_station_time ON {cycles} (station, start_time)",
+                f"CREATE INDEX IF NOT EXISTS ix_{cycles}_time ON {cycles} (start_time)",
+                f"CREATE TABLE IF NOT EXISTS {measurements} (cycle_id INTEGER NOT NULL, name VARCHAR(32) NOT NULL, "
+                f"value DOUBLE, PRIMARY KEY (cycle_id, name)) WITHOUT ROWID",
+            ]
+        else:
+            statements = [
+                f"CREATE TABLE IF NOT EXISTS {cycles} (cycle_id BIGINT PRIMARY KEY, part_id INT NOT NULL, "
+                f"station VARCHAR(32) NOT NULL, start_time DOUBLE NOT NULL, duration DOUBLE, result TINYINT, "
+                f"INDEX ix_part_time (part_id, start_time), INDEX ix_station_time (station, start_time), "
+                f"INDEX ix_time (start_time))",
+                f"CREATE TABLE IF NOT EXISTS {measurements} (cycle_id BIGINT NOT NULL, name VARCHAR(32) NOT NULL, "
+                f"value DOUBLE, PRIMARY KEY (cycle_id, name))",
+            ]
+        for sql in statements:
+            self._execute(sql)
+        self._months.add(month)
+
+    def _allocate_cycle_ids(self, cursor, month, count):
+        """Reserviert count Zyklus-IDs im Monat; nur innerhalb der Schreib-Transaktion aufrufen.
+
+        Das UPDATE sperrt die Sequenzzeile (MySQL) bzw. die Datenbank (SQLite) bis zum Commit,
+        ein zweiter Schreiber bekommt daher erst danach den nächsten Block.
+        """
+        ignore = "INSERT OR IGNORE" if self.backend == "sqlite" else "INSERT IGNORE"
+        # erster Zugriff auf den Monat: hinter vorhandenen Zeilen weiterzählen (ältere Datenbanken)
+        cursor.execute(f"{ignore} INTO cycle_sequence (month, next_id) "
+                       f"SELECT {self.p}, COALESCE(MAX(cycle_id) + 1, {self.p}) FROM cycles_{month}",
+                       (month, month * MONTH_FACTOR + 1))
+        cursor.execute(f"UPDATE cycle_sequence SET next_id = next_id + {self.p} WHERE month = {self.p}",
+                       (count, month))
+        cursor.execute(f"SELECT next_id FROM cycle_sequence WHERE month = {self.p}", (month,))
+        first = cursor.fetchone()[0] - count
+        return range(first, first + count)
+
+    def _months_for(self, t_from, t_to):
+        existing = self.months()
+        if not existing:
+            return []
+        t_from = month_start(existing[0]) if t_from is None else t_from
+        t_to = time.time() if t_to is None else t_to
+        wanted = set(months_between(t_from, t_to))
+        return [month for month in existing if month in wanted]
+
+    # -------------- Schreiben --------------
+    def part_ids(self, uids, first_seen=None):
+        """Teile-IDs zu RFID-UIDs; unbekannte UIDs werden angelegt. Liefert dict uid -> part_id."""
+        uids = list(dict.fromkeys(uids))
+        ignore = "INSERT OR IGNORE" if self.backend == "sqlite" else "INSERT IGNORE"
+        first_seen = time.time() if first_seen is None else first_seen
+        self._execute(f"{ignore} INTO parts (uid, first_seen) VALUES ({self.p}, {self.p})",
+                      [(uid, first_seen) for uid in uids], many=True)
+        result = {}
+        # IN-Liste in Blöcken, damit die Anzahl Platzhalter begrenzt bleibt
+        for i in range(0, len(uids), 500):
+            chunk = uids[i:i + 500]
+            rows = self._execute(f"SELECT uid, part_id FROM parts WHERE uid IN ({', '.join([self.p] * len(chunk))})",
+                                 chunk, fetch=True)
+            result.update(rows)
+        return result
+
+    def record_cycles(self, cycles):
+        """Mehrere Zyklen in einem Block schreiben.
+
+        :param cycles: Liste von (uid, station, start_time, duration, result, measurements_dict oder None)
+        :return: Liste der vergebenen Zyklus-IDs in derselben Reihenfolge
+        """
+        part_ids = self.part_ids([cycle[0] for cycle in cycles])
+        by_month = {}
+        for index, cycle in enumerate(cycles):
+            by_month.setdefault(month_of(cycle[2]), []).append(index)
+        cycle_ids = [None] * len(cycles)
+        for month, indices in by_month.items():
+            self.ensure_month(month)
+            # IDs vergeben und Zeilen schreiben in einer Transaktion auf einer Verbindung
+            connection = self.pool.get_connection()
+            try:
+                cursor = connection.cursor()
+                cycle_rows, measurement_rows = [], []
+                for index, cycle_id in zip(indices, self._allocate_cycle_ids(cursor, month, len(indices))):
+                    uid, station, start_time, duration, result, measurements = cycles[index]
+                    cycle_ids[index] = cycle_id
+                    cycle_rows.append((cycle_id, part_ids[uid], station, start_time, duration, result))
+                    for name, value in (measurements or {}).items():
+                        measurement_rows.append((cycle_id, name, value))
+                cursor.executemany(f"INSERT INTO cycles_{month} ({', '.join(CYCLE_COLUMNS)}) "
+                                   f"VALUES ({', '.join([self.p] * len(CYCLE_COLUMNS))})", cycle_rows)
+                if measurement_rows:
+                    cursor.executemany(f"INSERT INTO measurements_{month} ({', '.join(MEASUREMENT_COLUMNS)}) "
+                                       f"VALUES ({', '.join([self.p] * len(MEASUREMENT_COLUMNS))})",
+                                       measurement_rows)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                connection.close()
+        return cycle_ids
+
+    def record_cycle(self, uid, station, start_time, duration, result=RESULT_OK, measurements=None):
+        """Einen Zyklus schreiben, liefert die Zyklus-ID."""
+        return self.record_cycles([(uid, station, start_time, duration, result, measurements)])[0]
+
+    def drop_month(self, month):
+        """Monatspartition löschen (Aufbewahrungsfrist abgelaufen)."""
+        self._execute(f"DROP TABLE IF EXISTS cycles_{month}")
+        self._execute(f"DROP TABLE IF EXISTS measurements_{month}")
+        self.months()
+        self._months.discard(month)
+        # cycle_sequence bleibt stehen: IDs archivierter Zyklen werden nie neu vergeben
+
+    # -------------- Abfragen --------------
+    def part_id(self, uid):
+        rows = self._execute(f"SELECT part_id FROM parts WHERE uid = {self.p}", (uid,), fetch=True)
+        return rows[0][0] if rows else None
+
+    def cycles_for_uid(self, uid, t_from=None, t_to=None, limit=None):
+        """Alle Zyklen eines Teils (neueste zuerst), optional auf einen Zeitbereich beschränkt.
+
+        :return: Liste von (cycle_id, part_id, station, start_time, duration, result)
+        """
+        part_id = self.part_id(uid)
+        if part_id is None:
+            return []
+        lower = -1.0 if t_from is None else t_from
+        upper = 1e18 if t_to is None else t_to
+        rows = []
+        for month in reversed(self._months_for(t_from, t_to)):
+            # Index (part_id, start_time): reine Bereichssuche je Monat
+            rows += self._execute(f"SELECT {', '.join(CYCLE_COLUMNS)} FROM cycles_{month} "
+                                  f"WHERE part_id = {self.p} AND start_time >= {self.p} AND start_time <= {self.p} "
+                                  f"ORDER BY start_time DESC", (part_id, lower, upper), fetch=True)
+            if limit is not None and len(rows) >= limit:
+                return rows[:limit]
+        return rows
+
+    def cycles_in_range(self, t_from, t_to, station=None, limit=None):
+        """Zyklen im Zeitbereich (älteste zuerst), optional nur einer Station."""
+        rows = []
+        for month in self._months_for(t_from, t_to):
+            sql = f"SELECT {', '.join(CYCLE_COLUMNS)} FROM cycles_{month} WHERE "
+            params = []
+            if station is not None:
+                sql += f"station = {self.p} AND "
+                params.append(station)
+            sql += f"start_time >= {self.p} AND start_time <= {self.p} ORDER BY start_time"
+            params += [t_from, t_to]
+            if limit is not None:
+                sql += f" LIMIT {int(limit) - len(rows)}"
+            rows += self._execute(sql, params, fetch=True)
+            if limit is not None and len(rows) >= limit:
+                break
+        return rows
+
+    def measurements(self, cycle_id):
+        """Messwerte eines Zyklus als dict name -> Wert (Monat steckt in der Zyklus-ID)."""
+        month = cycle_id // MONTH_FACTOR
+        if month not in self.months():
+            return {}
+        rows = self._execute(f"SELECT name, value FROM measurements_{month} WHERE cycle_id = {self.p}",
+                             (cycle_id,), fetch=True)
+        return dict(rows)
+
+    def station_summary(self, t_from, t_to):
+        """Je Station: Anzahl Zyklen, Anzahl n.i.O., mittlere Zykluszeit im Zeitbereich."""
+        totals = {}
+        for month in self._months_for(t_from, t_to):
+            rows = self._execute(f"SELECT station, COUNT(*), SUM(CASE WHEN result = {self.p} THEN 1 ELSE 0 END), "
+                                 f"SUM(duration) FROM cycles_{month} "
+                                 f"WHERE start_time >= {self.p} AND start_time <= {self.p} GROUP BY station",
+                                 (RESULT_NOK, t_from, t_to), fetch=True)
+            for station, count, nok, duration_sum in rows:
+                total = totals.setdefault(station, [0, 0, 0.0])
+                total[0] += count
+                total[1] += nok or 0
+                total[2] += duration_sum or 0.0
+        return {station: {"cycles": count, "nok": nok, "mean_duration": duration_sum / count}
+                for station, (count, nok, duration_sum) in totals.items()}
+
+
+def benchmark(rows, backend, database, months, parts, measurements_per_cycle, batch):
+    """Synthetische Zyklen über mehrere Monate schreiben und typische Abfragen messen."""
+    db = ProductionDB.open(backend, database)
+    stations = [f"UR3e_{i:02d}" for i in range(1, 9)]
+    uids = [f"{random.getrandbits(40):010X}" for _ in range(parts)]
+    t_end = time.time()
+    t_start = t_end - months * 30 * 86400
+
+    print(f"Schreibe {rows} Zyklen über {months} Monate ({parts} Teile, "
+          f"{measurements_per_cycle} Messwerte je Zyklus) ...")
+    t0 = time.perf_counter()
+    step = (t_end - t_start) / rows
+    for first in range(0, rows, batch):
+        cycles = []
+        for i in range(first, min(rows, first + batch)):
+            measurements = {f"m{k}": random.random() for k in range(measurements_per_cycle)}
+            cycles.append((random.choice(uids), random.choice(stations), t_start + i * step,
+                           random.uniform(8.0, 15.0), RESULT_NOK if random.random() < 0.02 else RESULT_OK,
+                           measurements))
+        db.record_cycles(cycles)
+        if (first // batch) % 20 == 0:
+            print(f"  {first + len(cycles):>10} Zeilen, {(first + len(cycles)) / (time.perf_counter() - t0):.0f}/s")
+    print(f"Schreiben: {time.perf_counter() - t0:.1f} s")
+
+    def timed(name, function, repeat=20):
+        times = []
+        result = None
+        for _ in range(repeat):
+            t = time.perf_counter()
+            result = function()
+            times.append(time.perf_counter() - t)
+        times.sort()
+        print(f"{name:<45} median {1000 * times[len(times) // 2]:8.2f} ms   "
+              f"max {1000 * times[-1]:8.2f} ms   ({len(result)} Ergebnisse)")
+
+    uid = random.choice(uids)
+    timed("Teil: alle Zyklen (alle Monate)", lambda: db.cycles_for_uid(uid))
+    timed("Teil: Zyklen der letzten 90 Tage", lambda: db.cycles_for_uid(uid, t_end - 90 * 86400, t_end))
+    timed("Zeitbereich: 1 Stunde", lambda: db.cycles_in_range(t_end - 3600, t_end))
+    timed("Zeitbereich: 1 Tag, eine Station", lambda: db.cycles_in_range(t_end - 86400, t_end, stations[0]))
+    last = db.cycles_for_uid(uid, limit=1)
+    if last and measurements_per_cycle:
+        timed("Messwerte eines Zyklus", lambda: db.measurements(last[0][0]))
+    timed("Stationsübersicht: 1 Tag", lambda: db.station_summary(t_end - 86400, t_end), repeat=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fertigungsdaten-Datenbank (Schema, Abfragen, Benchmark)")
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--database", default=None, help="SQLite-Datei bzw. MySQL-Datenbank")
+    parser.add_argument("--benchmark", type=int, default=0, help="N synthetische Zyklen schreiben und Abfragen messen")
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--parts", type=int, default=200000)
+    parser.add_argument("--measurements", type=int, default=0, help="Messwerte je Zyklus im Benchmark")
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--keep", action="store_true", help="temporäre Benchmark-Datenbank nicht löschen")
+    args = parser.parse_args()
+    if args.benchmark:
+        # nie in die echte Fertigungsdatenbank schreiben: ohne --database eine temporäre Datei
+        if args.database:
+            benchmark(args.benchmark, args.backend, args.database, args.months, args.parts,
+                      args.measurements, args.batch)
+            return
+        if args.backend != "sqlite":
+            parser.error("Benchmark mit MySQL nur mit ausdrücklicher --database (eigene Test-Datenbank)")
+        tmpdir = tempfile.mkdtemp(prefix="production_benchmark_")
+        try:
+            benchmark(args.benchmark, args.backend, os.path.join(tmpdir, "production_bench.sqlite"),
+                      args.months, args.parts, args.measurements, args.batch)
+        finally:
+            if args.keep:
+                print(f"Benchmark-Datenbank behalten in {tmpdir}")
+            else:
+                shutil.rmtree(tmpdir, ignore_errors=True)
+                print(f"Benchmark-Datenbank gelöscht ({tmpdir})")
+    else:
+        database = args.database or ("production.sqlite" if args.backend == "sqlite" else "sro_db")
+        db = ProductionDB.open(args.backend, database)
+        print(f"Monatspartitionen: {db.months()}")
+
+
+if __name__ == "__main__":
+    main()
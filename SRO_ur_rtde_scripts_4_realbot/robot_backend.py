@@ -0,0 +1,400 @@
+# robot_backend.py
+# Einheitlicher Zugang zum Roboter für GUIs und Skripte - echter UR, Webots-Simulator oder Mock:
+#   "ur"      echter Roboter über ur_rtde (rtde_control / rtde_receive)
+#   "webots"  Webots-RTDE-Server über SRO_webots/webots_ws/ur_rtde_webot_control_lib
+#   "mock"    rein in Python gerechneter kinematischer Roboter (MockRobot), ohne Netzwerk;
+#             Bewegungen mit den Profilen des Simulators (trajectory.py), Kinematik aus SRO_Kinematik
+#
+# Alle Backends liefern rtde_c / rtde_r mit der ur_rtde-Schnittstelle. Was ein Backend davon
+# tatsächlich kann, wird beim Verbinden an den vorhandenen Methoden erkannt (robot.capabilities,
+# robot.has("servo")), z.B. hat der Simulator keinen Kraftmodus.
+#
+# Auswahl ohne Codeänderung über Umgebungsvariablen:
+#   SRO_ROBOT_BACKEND=ur|webots|mock      (Standard: ur)
+#   SRO_ROBOT_IP=...                      (überschreibt die im Skript eingetragene IP)
+#   SRO_MOCK_REALTIME=0                   (Mock ohne Wartezeiten: Bewegungen sofort am Ziel,
+#                                          waitPeriod kehrt sofort zurück -> schnelle CI-Tests)
+# GUIs laufen ohne Bildschirm zusätzlich mit QT_QPA_PLATFORM=offscreen.
+#
+# Verwendung, z.B.:
+#   import robot_backend
+#   robot = robot_backend.connect(ip=ROBOT_IP)     # ROBOT_IP gilt für das Backend "ur"
+#   robot = robot_backend.connect(args.backend, address=args.ip)   # mit add_arguments(parser)
+#   self.rtde_c, self.rtde_r = robot.rtde_c, robot.rtde_r
+#   self.gripper = robot.connect_gripper()         # None, wenn das Backend keinen Greifer hat
+#   if robot.has("force_mode"): ...
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+BACKENDS = ("ur", "webots", "mock")
+DEFAULT_IPS = {"ur": "192.168.0.17", "webots": "127.0.0.1", "mock": "127.0.0.1"}
+GRIPPER_PORT = 63352
+
+# Fähigkeit -> benötigte Methoden an rtde_c bzw. rtde_r
+CAPABILITIES = {
+    "moveJ": ("moveJ",),
+    "moveL": ("moveL",),
+    "async_move": ("getAsyncOperationProgress", "stopL"),
+    "servo": ("servoJ", "servoStop"),
+    "servoL": ("servoL", "servoStop"),
+    "speed": ("speedL", "speedStop"),
+    "jog": ("jogStart", "jogStop"),
+    "fixed_rate": ("initPeriod", "waitPeriod"),
+    "force_mode": ("forceMode", "forceModeStop"),
+    "contact": ("moveUntilContact",),
+    "teach_mode": ("teachMode", "endTeachMode"),
+    "q": ("getActualQ",),
+    "qd": ("getActualQd",),
+    "tcp_pose": ("getActualTCPPose",),
+    "tcp_force": ("getActualTCPForce",),
+    "timestamp": ("getTimestamp",),
+    "streaming": ("getLatestState",),
+}
+
+
+def _repo_path(*parts):
+    """Pfad relativ zum Repository-Wurzelverzeichnis (dem Verzeichnis mit SRO_Kinematik)."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.isdir(os.path.join(directory, "SRO_Kinematik")):
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            raise FileNotFoundError("Repository-Verzeichnis mit SRO_Kinematik nicht gefunden")
+        directory = parent
+    return os.path.join(directory, *parts)
+
+
+def discover(rtde_c, rtde_r):
+    """Menge der Fähigkeiten, deren Methoden an rtde_c (Befehle) bzw. rtde_r (get...) vorhanden sind."""
+    def available(name):
+        if callable(getattr(rtde_c, name, None)):
+            return True
+        return name.startswith("get") and callable(getattr(rtde_r, name, None))
+    return frozenset(cap for cap, methods in CAPABILITIES.items() if all(available(m) for m in methods))
+
+
+class RobotBackend:
+    """Verbundener Roboter: rtde_c, rtde_r, erkannte Fähigkeiten und Greifer-Zugang."""
+
+    def __init__(self, name, ip, rtde_c, rtde_r):
+        self.name = name
+        self.ip = ip
+        self.rtde_c = rtde_c
+        self.rtde_r = rtde_r
+        self.capabilities = discover(rtde_c, rtde_r)
+        self._emulator = None
+
+    def has(self, *capabilities):
+        return all(cap in self.capabilities for cap in capabilities)
+
+    def require(self, *capabilities):
+        missing = [cap for cap in capabilities if cap not in self.capabilities]
+        if missing:
+            raise RuntimeError(f"Backend {self.name} unterstützt nicht: {', '.join(missing)}")
+
+    def connect_gripper(self):
+        """RobotiqGripper für dieses Backend; beim Mock gegen den Greifer-Emulator im selben Prozess."""
+        import robotiq_gripper
+        host, port = self.ip, GRIPPER_PORT
+        if self.name == "mock":
+            if self._emulator is None:
+                from robotiq_gripper_emulator import start_in_thread
+                self._emulator = start_in_thread("127.0.0.1", 0)
+            host, port = "127.0.0.1", self._emulator.port
+        gripper = robotiq_gripper.RobotiqGripper()
+        try:
+            gripper.connect(host, port)
+        except OSError:
+            if self.name == "ur":
+                raise
+            print(f"⚠️ Kein Greifer unter {host}:{port} ({self.name}), weiter ohne Greifer")
+            return None
+        return gripper
+
+    def disconnect(self):
+        if self.rtde_c is not None:
+            self.rtde_c.disconnect()
+        if self.rtde_r is not self.rtde_c:
+            self.rtde_r.disconnect()
+
+    def __repr__(self):
+        return f"RobotBackend({self.name}, {self.ip}, {sorted(self.capabilities)})"
+
+
+def connect(backend=None, ip=None, receive_only=False, address=None, **options):
+    """Verbindet mit dem gewählten Backend (Standard aus SRO_ROBOT_BACKEND, sonst "ur").
+
+    :param ip: im Skript eingetragene Adresse des echten Roboters (gilt nur für "ur", damit
+               z.B. Webots nicht unter der Roboter-IP gesucht wird)
+    :param address: ausdrücklich angegebene Adresse (z.B. --ip), gilt für jedes Backend,
+               z.B. Webots auf einem anderen Rechner; SRO_ROBOT_IP hat Vorrang vor beiden
+    :param receive_only: nur rtde_r öffnen (rtde_c = None), z.B. für reine Anzeige-GUIs
+    :param options: weitere Parameter für MockRobot (z.B. realtime=False)
+    """
+    backend = backend or os.environ.get("SRO_ROBOT_BACKEND", "ur")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unbekanntes Backend {backend}, erlaubt: {', '.join(BACKENDS)}")
+    ip = (os.environ.get("SRO_ROBOT_IP") or address
+          or (ip if backend == "ur" and ip else DEFAULT_IPS[backend]))
+
+    if backend == "mock":
+        options.setdefault("realtime", os.environ.get("SRO_MOCK_REALTIME", "1") != "0")
+        mock = MockRobot(**options)
+        rtde_c = None if receive_only else mock
+        rtde_r = mock
+    else:
+        if backend == "webots":
+            # gleiche Modulnamen wie bei ur_rtde, deshalb die Sim-Bibliothek voranstellen
+            sys.path.insert(0, _repo_path("SRO_webots", "webots_ws", "ur_rtde_webot_control_lib"))
+        import rtde_control  # > pip install ur-rtde (bzw. Sim-Bibliothek)
+        import rtde_receive
+        rtde_c = None if receive_only else rtde_control.RTDEControlInterface(ip)
+        rtde_r = rtde_receive.RTDEReceiveInterface(ip)
+    robot = RobotBackend(backend, ip, rtde_c, rtde_r)
+    print(f"🤖 Backend {backend} ({ip}): {', '.join(sorted(robot.capabilities))}")
+    return robot
+
+
+def add_arguments(parser, option="--backend"):
+    """Fügt die Backend-Auswahl und --ip zu einem argparse-Parser hinzu (Standardwerte aus der Umgebung).
+
+    option: Name der Auswahl, falls --backend im Skript schon anders belegt ist (z.B. "--robot");
+    auswerten mit connect(args.<option>, address=args.ip).
+    """
+    parser.add_argument(option, choices=BACKENDS, default=os.environ.get("SRO_ROBOT_BACKEND", "ur"),
+                        help="Roboter-Backend")
+    parser.add_argument("--ip", default=None,
+                        help=f"Adresse des Roboters bzw. Webots-Rechners (Standard: {DEFAULT_IPS['ur']} "
+                             f"für ur, {DEFAULT_IPS['webots']} für webots)")
+
+
+# -------------- kinematischer Mock --------------
+HOME_Q = [0.0, -1.5708, 1.5708, -1.5708, -1.5708, 0.0]
+
+
+class MockRobot:
+    """Kinematischer Roboter mit ur_rtde-Schnittstelle (Steuerung und Empfang in einem Objekt).
+
+    Der Zustand wird nicht in einem Takt gerechnet, sondern bei jeder Abfrage aus der Uhr
+    (wie beim Greifer-Emulator). Mit realtime=False sind Bewegungen sofort am Ziel und
+    waitPeriod wartet nicht - für Durchsatztests ohne Roboter und Bildschirm.
+    """
+
+    def __init__(self, q=HOME_Q, robot_type="UR3e", realtime=True, frequency=500.0, profile="trapezoid"):
+        sys.path.insert(1, _repo_path("SRO_Kinematik"))
+        sys.path.insert(1, _repo_path("SRO_webots", "ur3e_webots_ur_rtde", "ur3test", "controllers",
+                                      "ur3testcontroller"))
+        import trajectory
+        import ur_kinematics
+        self._trajectory = trajectory
+        self._kin = ur_kinematics
+        self.robot_type = robot_type
+        self.realtime = realtime
+        self.dt = 1.0 / frequency
+        self.profile = profile
+        self._lock = threading.RLock()
+        self._q = np.array(q, dtype=float)
+        self._qd = np.zeros(6)
+        self._t_start = time.monotonic()
+        self._t_update = self._t_start
+        self._motion = None       # (Bahn, "joint"/"linear", Startzeit)
+        self._velocity = None     # ("joint"/"tool", Geschwindigkeitsvektor)
+        self._async_reported = True
+
+    # ----- Zustand -----
+    def _ik(self, pose):
+        solutions, valid = self._kin.inverse_kinematics([pose], self.robot_type)
+        q, found = self._kin.nearest_solution(solutions, valid, self._q)
+        return q[0] if found[0] else None
+
+    def _set_q(self, q, dt):
+        q = np.asarray(q, dtype=float)
+        self._qd = (q - self._q) / dt if dt > 0 else np.zeros(6)
+        self._q = q
+
+    def _update(self):
+        now = time.monotonic()
+        dt = now - self._t_update
+        self._t_update = now
+        if self._motion is not None:
+            path, kind, t0 = self._motion
+            t = now - t0 if self.realtime else path.duration
+            sample = path.sample(t)
+            q = sample if kind == "joint" else self._ik(sample)
+            if q is None:
+                print(f"⚠️ Mock: keine IK-Lösung für {sample}, Bewegung abgebrochen")
+                self._motion = None
+            else:
+                self._set_q(q, dt)
+                if t >= path.duration:
+                    self._motion = None
+                    self._qd = np.zeros(6)
+        elif self._velocity is not None:
+            kind, velocity = self._velocity
+            if kind == "joint":
+                self._set_q(self._q + velocity * dt, dt)
+            else:
+                pose = self._pose() + velocity * dt  # kleine Schritte: Drehvektor näherungsweise addieren
+                q = self._ik(pose)
+                if q is not None:
+                    self._set_q(q, dt)
+        else:
+            self._qd = np.zeros(6)
+
+    def _pose(self):
+        return self._kin.forward_kinematics(self._q, self.robot_type)
+
+    def _start(self, kind, target, speed, acceleration):
+        """Legt die Bewegung an (unter self._lock aufrufen) und liefert sie für _wait_for."""
+        if kind == "joint":
+            path = self._trajectory.JointTrajectory(self._q, target, speed, acceleration, self.profile)
+        else:
+            path = self._trajectory.CartesianTrajectory(self._pose(), target, speed, acceleration, self.profile)
+        motion = self._motion = (path, kind, time.monotonic())
+        self._velocity = None
+        self._async_reported = False
+        if not self.realtime:
+            self._update()
+        return motion
+
+    def _wait_for(self, motion):
+        """Blockierende Bewegung: warten, bis sie beendet oder ersetzt ist, OHNE self._lock zu halten,
+        damit andere Threads (z.B. Telemetrie) den Zustand währenddessen abfragen können."""
+        while True:
+            with self._lock:
+                self._update()
+                if self._motion is not motion:
+                    return
+                path, _, t0 = motion
+                remaining = t0 + path.duration - time.monotonic()
+            time.sleep(min(max(remaining, 0.0), 0.01))
+
+    # ----- rtde_receive -----
+    def getActualQ(self):
+        with self._lock:
+            self._update()
+            return self._q.tolist()
+
+    def getActualQd(self):
+        with self._lock:
+            self._update()
+            return self._qd.tolist()
+
+    def getActualTCPPose(self):
+        with self._lock:
+            self._update()
+            return self._pose().tolist()
+
+    def getActualTCPForce(self):
+        return [0.0] * 6
+
+    def getTimestamp(self):
+        return time.monotonic() - self._t_start
+
+    # ----- rtde_control -----
+    def moveJ(self, q, speed=1.05, acceleration=1.4, asynchronous=False):
+        with self._lock:
+            self._update()
+            motion = self._start("joint", q, speed, acceleration)
+        if not asynchronous:
+            self._wait_for(motion)
+        return True
+
+    def moveL(self, pose, speed=0.25, acceleration=1.2, asynchronous=False):
+        with self._lock:
+            self._update()
+            if self._ik(pose) is None:
+                return False
+            motion = self._start("linear", pose, speed, acceleration)
+        if not asynchronous:
+            self._wait_for(motion)
+        return True
+
+    def getAsyncOperationProgress(self):
+        with self._lock:
+            self._update()
+            if self._motion is None:
+                # eine sofort beendete Bewegung wird einmal als laufend gemeldet, wie am Roboter
+                if not self._async_reported:
+                    self._async_reported = True
+                    return 100
+                return -1
+            path, _, t0 = self._motion
+            return int(100 * min(1.0, (time.monotonic() - t0) / max(path.duration, 1e-9)))
+
+    def isSteady(self):
+        with self._lock:
+            self._update()
+            return self._motion is None and self._velocity is None
+
+    def stopJ(self, a=2.0, asynchronous=False):
+        with self._lock:
+            self._update()
+            self._motion = None
+            self._velocity = None
+
+    stopL = stopJ
+
+    def servoJ(self, q, speed=0.0, acceleration=0.0, time=0.008, lookahead_time=0.1, gain=300):
+        with self._lock:
+            self._update()
+            self._motion = None
+            self._velocity = None
+            self._set_q(q, time)
+            return True
+
+    def servoL(self, pose, speed=0.0, acceleration=0.0, time=0.008, lookahead_time=0.1, gain=300):
+        with self._lock:
+            q = self._ik(pose)
+            return q is not None and self.servoJ(q.tolist(), speed, acceleration, time, lookahead_time, gain)
+
+    def servoStop(self, a=10.0):
+        self.stopJ()
+
+    def speedJ(self, qd, acceleration=0.5, time=0.0):
+        with self._lock:
+            self._update()
+            self._motion = None
+            self._velocity = ("joint", np.asarray(qd, dtype=float))
+            return True
+
+    def speedL(self, xd, acceleration=0.25, time=0.0):
+        with self._lock:
+            self._update()
+            self._motion = None
+            self._velocity = ("tool", np.asarray(xd, dtype=float))
+            return True
+
+    def speedStop(self, a=10.0):
+        self.stopJ()
+
+    def jogStart(self, speeds, feature=0, acc=0.5, custom_frame=None):
+        return self.speedL(speeds, acc)
+
+    def jogStop(self):
+        self.stopJ()
+
+    def initPeriod(self):
+        return time.perf_counter()
+
+    def waitPeriod(self, t_cycle_start):
+        if self.realtime:
+            remaining = t_cycle_start + self.dt - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def teachMode(self):
+        return True
+
+    def endTeachMode(self):
+        return True
+
+    def stopScript(self):
+        self.stopJ()
+
+    def disconnect(self):
+        self.stopJ()
@@ -1,10 +1,11 @@
 """Module to control Robotiq's grippers - tested with HAND-E"""
 
+import re
 import socket
 import threading
 import time
 from enum import Enum
-from typing import Union, Tuple, OrderedDict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Union, Tuple, OrderedDict
 
 class RobotiqGripper:
     """
@@ -40,6 +41,28 @@ class RobotiqGripper:
         STOPPED_INNER_OBJECT = 2
         AT_DEST = 3
 
+    class Status(NamedTuple):
+        """Snapshot of the gripper state, read with a single exchange (see get_status)."""
+        position: int
+        requested_position: int
+        object_status: 'RobotiqGripper.ObjectStatus'
+        gripper_status: 'RobotiqGripper.GripperStatus'
+        fault: int
+
+    # variables read by get_status, in this order
+    STATUS_VARS = (POS, PRE, OBJ, STA, FLT)
+
+    # events published by the background poller (see start_polling)
+    EVENT_STATUS = 'status'                    # any change of the cached status
+    EVENT_MOTION_STARTED = 'motion_started'    # object status changed to MOVING
+    EVENT_MOTION_COMPLETE = 'motion_complete'  # left MOVING (destination reached or object detected)
+    EVENT_OBJECT_DETECTED = 'object_detected'  # stopped at an inner or outer object
+    EVENT_FAULT = 'fault'                      # fault code changed to a non-zero value
+    EVENT_FAULT_CLEARED = 'fault_cleared'      # fault code changed back to zero
+
+    # one GET reply 'VAR value', without its terminating newline
+    _GET_REPLY = re.compile(rb"([A-Z]{3}) (-?\d+)")
+
     def __init__(self):
         """Constructor."""
         self.socket = None
@@ -50,6 +73,10 @@ class RobotiqGripper:
         self._max_speed = 255
         self._min_force = 0
         self._max_force = 255
+        self._status = None  # cached Status, updated by the poller
+        self._listeners = []
+        self._poll_thread = None
+        self._poll_stop = threading.Event()
 
     def connect(self, hostname: str, port: int, socket_timeout: float = 2.0) -> None:
         """Connects to a gripper at the given address.
@@ -64,8 +91,96 @@ class RobotiqGripper:
 
     def disconnect(self) -> None:
         """Closes the connection with the gripper."""
+        self.stop_polling()
         self.socket.close()
 
+    def add_listener(self, callback: Callable[[str, 'RobotiqGripper.Status'], None]) -> None:
+        """Registers callback(event, status) for the poller events (EVENT_* constants).
+
+        Callbacks run in the poller thread and should return quickly; in a Qt GUI, emit a signal from the
+        callback to get into the GUI thread.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, 'RobotiqGripper.Status'], None]) -> None:
+        self._listeners.remove(callback)
+
+    def start_polling(self, rate: float = 20.0) -> None:
+        """Starts a background thread that refreshes the cached status at the given rate in Hz.
+
+        While polling, get_current_position, is_open and is_closed answer from the cache (at most 1/rate old)
+        without a socket round trip; get_cached_status returns the full snapshot.
+        """
+        if self._poll_thread is not None:
+            return
+        self._poll_stop.clear()
+        self._status = self.get_status()
+        self._poll_thread = threading.Thread(target=self._poll_loop, args=(1.0 / rate,), daemon=True)
+        self._poll_thread.start()
+
+    def stop_polling(self) -> None:
+        """Stops the background poller; reads go to the gripper again."""
+        if self._poll_thread is None:
+            return
+        self._poll_stop.set()
+        if self._poll_thread is not threading.current_thread():
+            self._poll_thread.join()
+        self._poll_thread = None
+        self._status = None
+
+    def get_cached_status(self) -> Optional['RobotiqGripper.Status']:
+        """Returns the status cached by the poller, or None if the poller is not running."""
+        return self._status
+
+    def _poll_loop(self, period: float) -> None:
+        next_time = time.monotonic()
+        while not self._poll_stop.is_set():
+            try:
+                status = self.get_status()
+            except Exception as e:  # keep polling, e.g. after a single socket timeout
+                print(f"Gripper polling failed: {e}")
+            else:
+                previous = self._status
+                self._status = status
+                if status != previous:
+                    self._publish(self._status_events(previous, status), status)
+            # fixed rate with a monotonic deadline, without drift from the query time
+            next_time += period
+            delay = next_time - time.monotonic()
+            if delay < 0:
+                next_time = time.monotonic()
+                delay = 0
+            self._poll_stop.wait(delay)
+
+    @staticmethod
+    def _status_events(previous: Optional['RobotiqGripper.Status'], status: 'RobotiqGripper.Status') -> List[str]:
+        """Returns the events for the transition previous -> status (previous may be None)."""
+        moving = RobotiqGripper.ObjectStatus.MOVING
+        events = [RobotiqGripper.EVENT_STATUS]
+        was_moving = previous is not None and previous.object_status == moving
+        is_moving = status.object_status == moving
+        # a new requested position counts as a motion even if MOVING was never seen (stroke shorter than a poll)
+        new_request = previous is not None and status.requested_position != previous.requested_position
+        if (is_moving or new_request) and not was_moving:
+            events.append(RobotiqGripper.EVENT_MOTION_STARTED)
+        if (was_moving or new_request) and not is_moving:
+            events.append(RobotiqGripper.EVENT_MOTION_COMPLETE)
+            if status.object_status in (RobotiqGripper.ObjectStatus.STOPPED_INNER_OBJECT,
+                                        RobotiqGripper.ObjectStatus.STOPPED_OUTER_OBJECT):
+                events.append(RobotiqGripper.EVENT_OBJECT_DETECTED)
+        previous_fault = previous.fault if previous is not None else 0
+        if status.fault != previous_fault:
+            events.append(RobotiqGripper.EVENT_FAULT if status.fault else RobotiqGripper.EVENT_FAULT_CLEARED)
+        return events
+
+    def _publish(self, events: List[str], status: 'RobotiqGripper.Status') -> None:
+        for event in events:
+            for callback in list(self._listeners):
+                try:
+                    callback(event, status)
+                except Exception as e:
+                    print(f"Gripper listener failed on '{event}': {e}")
+
     def _set_vars(self, var_dict: OrderedDict[str, Union[int, float]]):
         """Sends the appropriate command via socket to set the value of n variables, and waits for its 'ack' response.
 
@@ -101,19 +216,54 @@ class RobotiqGripper:
         :param variable: Name of the variable to retrieve.
         :return: Value of the variable as integer.
         """
+        return self.get_vars([variable])[variable]
+
+    def get_vars(self, variables: Iterable[str]) -> Dict[str, int]:
+        """Retrieves several variables in one exchange: all GET commands are sent in a single write, then the
+        replies are read until one has arrived for every variable.
+
+        :param variables: Names of the variables to retrieve, e.g. [POS, OBJ, STA, FLT, PRE].
+        :return: Dictionary variable name -> integer value.
+        """
+        variables = list(variables)
+        cmd = "".join(f"GET {variable}\n" for variable in variables)
+        replies = []
         # atomic commands send/rcv
         with self.command_lock:
-            cmd = f"GET {variable}\n"
             self.socket.sendall(cmd.encode(self.ENCODING))
-            data = self.socket.recv(1024)
-
-        # expect data of the form 'VAR x', where VAR is an echo of the variable name, and X the value
-        # note some special variables (like FLT) may send 2 bytes, instead of an integer. We assume integer here
-        var_name, value_str = data.decode(self.ENCODING).split()
-        if var_name != variable:
-            raise ValueError(f"Unexpected response {data} ({data.decode(self.ENCODING)}): does not match '{variable}'")
-        value = int(value_str)
-        return value
+            data = b""
+            while len(replies) < len(variables):
+                chunk = self.socket.recv(1024)
+                if not chunk:
+                    raise ConnectionError("Connection to gripper closed")
+                data += chunk
+                # a reply may be split across TCP segments: only complete lines (ending in '\n') are parsed,
+                # an unterminated tail stays in data until the next recv completes it
+                *lines, data = data.split(b"\n")
+                for line in lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    # expect data of the form 'VAR x', where VAR is an echo of the variable name, and X the value
+                    # note some special variables (like FLT) may send 2 bytes, instead of an integer. We assume integer here
+                    match = self._GET_REPLY.fullmatch(line)
+                    if match is None:
+                        raise ValueError(f"Unexpected response {line!r}")
+                    replies.append((match.group(1).decode(self.ENCODING), int(match.group(2))))
+
+        for variable, (var_name, _) in zip(variables, replies):
+            if var_name != variable:
+                raise ValueError(f"Unexpected response {var_name}: does not match '{variable}'")
+        return {variable: value for variable, (_, value) in zip(variables, replies)}
+
+    def get_status(self) -> 'RobotiqGripper.Status':
+        """Returns position, requested position, object status, gripper status and fault in one exchange."""
+        values = self.get_vars(self.STATUS_VARS)
+        return RobotiqGripper.Status(position=values[self.POS],
+                                     requested_position=values[self.PRE],
+                                     object_status=RobotiqGripper.ObjectStatus(values[self.OBJ]),
+                                     gripper_status=RobotiqGripper.GripperStatus(values[self.STA]),
+                                     fault=values[self.FLT])
 
     @staticmethod
     def _is_ack(data: str):
@@ -138,7 +288,7 @@ class RobotiqGripper:
         """
         self._set_var(self.ACT, 0)
         self._set_var(self.ATR, 0)
-        while (not self._get_var(self.ACT) == 0 or not self._get_var(self.STA) == 0):
+        while self.get_vars([self.ACT, self.STA]) != {self.ACT: 0, self.STA: 0}:
             self._set_var(self.ACT, 0)
             self._set_var(self.ATR, 0)
         time.sleep(0.5)
@@ -178,12 +328,12 @@ class RobotiqGripper:
         """
         if not self.is_active():
             self._reset()
-            while (not self._get_var(self.ACT) == 0 or not self._get_var(self.STA) == 0):
+            while self.get_vars([self.ACT, self.STA]) != {self.ACT: 0, self.STA: 0}:
                 time.sleep(0.01)
 
             self._set_var(self.ACT, 1)
             time.sleep(1.0)
-            while (not self._get_var(self.ACT) == 1 or not self._get_var(self.STA) == 3):
+            while self.get_vars([self.ACT, self.STA]) != {self.ACT: 1, self.STA: 3}:
                 time.sleep(0.01)
 
         # auto-calibrate position range if desired
@@ -220,7 +370,10 @@ class RobotiqGripper:
         return self.get_current_position() >= self.get_closed_position()
 
     def get_current_position(self) -> int:
-        """Returns the current position as returned by the physical hardware."""
+        """Returns the current position as returned by the physical hardware (cached while polling)."""
+        status = self._status
+        if status is not None:
+            return status.position
         return self._get_var(self.POS)
 
     def auto_calibrate(self, log: bool = True) -> None:
@@ -271,13 +424,16 @@ class RobotiqGripper:
         var_dict = OrderedDict([(self.POS, clip_pos), (self.SPE, clip_spe), (self.FOR, clip_for), (self.GTO, 1)])
         return self._set_vars(var_dict), clip_pos
 
-    def move_and_wait_for_pos(self, position: int, speed: int, force: int) -> Tuple[int, ObjectStatus]:  # noqa
+    def move_and_wait_for_pos(self, position: int, speed: int, force: int,
+                              timeout: float = 10.0) -> Tuple[int, ObjectStatus]:  # noqa
         """Sends commands to start moving towards the given position, with the specified speed and force, and
         then waits for the move to complete.
 
         :param position: Position to move to [min_position, max_position]
         :param speed: Speed to move at [min_speed, max_speed]
         :param force: Force to use [min_force, max_force]
+        :param timeout: Seconds to wait for the move to complete before raising TimeoutError.
+        :raises RuntimeError: If the gripper reports a fault instead of moving.
         :return: A tuple with an integer representing the last position returned by the gripper after it notified
         that the move had completed, a status indicating how the move ended (see ObjectStatus enum for details). Note
         that it is possible that the position was not reached, if an object was detected during motion.
@@ -287,15 +443,18 @@ class RobotiqGripper:
             raise RuntimeError("Failed to set variables for move.")
 
         # wait until the gripper acknowledges that it will try to go to the requested position
-        while self._get_var(self.PRE) != cmd_pos:
+        # and is no longer moving; PRE, OBJ, POS and FLT are read together in one exchange
+        deadline = time.monotonic() + timeout
+        while True:
+            state = self.get_vars([self.PRE, self.OBJ, self.POS, self.FLT])
+            if state[self.FLT] != 0:
+                raise RuntimeError(f"Gripper fault {state[self.FLT]} during move.")
+            if (state[self.PRE] == cmd_pos
+                    and RobotiqGripper.ObjectStatus(state[self.OBJ]) != RobotiqGripper.ObjectStatus.MOVING):
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Gripper did not reach position {cmd_pos} within {timeout} s.")
             time.sleep(0.001)
 
-        # wait until not moving
-        cur_obj = self._get_var(self.OBJ)
-        while RobotiqGripper.ObjectStatus(cur_obj) == RobotiqGripper.ObjectStatus.MOVING:
-            cur_obj = self._get_var(self.OBJ)
-
         # report the actual position and the object status
-        final_pos = self._get_var(self.POS)
-        final_obj = cur_obj
-        return final_pos, RobotiqGripper.ObjectStatus(final_obj)
+        return state[self.POS], RobotiqGripper.ObjectStatus(state[self.OBJ])
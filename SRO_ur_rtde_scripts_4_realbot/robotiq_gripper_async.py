@@ -0,0 +1,297 @@
+"""asyncio client for Robotiq grippers (same socket protocol as robotiq_gripper.py, port 63352).
+
+Unlike RobotiqGripper, requests are not serialized with a lock around send + recv(1024):
+- several GET/SET commands are written in one go (pipelining), replies are matched in order
+  from a streaming receive buffer by a single reader task
+- move() returns an awaitable task, so one event loop can drive several grippers at once
+- waiting for a move polls PRE, OBJ and POS together in one exchange at a moderate rate
+  instead of thousands of single GETs per stroke
+
+Example:
+    gripper = AsyncRobotiqGripper()
+    await gripper.connect("192.168.0.17", 63352)
+    await gripper.activate()
+    position, status = await gripper.move(255, 255, 255)
+"""
+
+import asyncio
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, OrderedDict, Tuple, Union
+
+from robotiq_gripper import RobotiqGripper
+
+# One reply: 'ack' / 'nak' for SET (fixed 3-byte tokens, sent without terminator), or
+# 'VAR value\n' for GET, which is only complete once its newline has arrived. A reply split
+# across TCP segments does not match and stays in the buffer until the rest is received.
+_REPLY = re.compile(rb"\s*(?:(ack|nak)|([A-Z]{3}) (-?\d+)\r?\n)")
+
+
+class AsyncRobotiqGripper:
+    """
+    Communicates with the gripper via an asyncio stream, with pipelined string commands.
+    """
+    ACT = RobotiqGripper.ACT
+    GTO = RobotiqGripper.GTO
+    ATR = RobotiqGripper.ATR
+    FOR = RobotiqGripper.FOR
+    SPE = RobotiqGripper.SPE
+    POS = RobotiqGripper.POS
+    STA = RobotiqGripper.STA
+    PRE = RobotiqGripper.PRE
+    OBJ = RobotiqGripper.OBJ
+    FLT = RobotiqGripper.FLT
+
+    ENCODING = RobotiqGripper.ENCODING
+    GripperStatus = RobotiqGripper.GripperStatus
+    ObjectStatus = RobotiqGripper.ObjectStatus
+
+    def __init__(self, poll_interval: float = 0.01):
+        """Constructor.
+
+        :param poll_interval: Delay between status polls while waiting for a move, in seconds.
+        """
+        self.poll_interval = poll_interval
+        self.timeout = 2.0
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._pending = deque()  # (expected variable or None for SET, future) in send order
+        self._min_position = 0
+        self._max_position = 255
+        self._min_speed = 0
+        self._max_speed = 255
+        self._min_force = 0
+        self._max_force = 255
+
+    async def connect(self, hostname: str, port: int, socket_timeout: float = 2.0) -> None:
+        """Connects to a gripper at the given address and starts the reader task.
+
+        :param hostname: Hostname or ip.
+        :param port: Port.
+        :param socket_timeout: Timeout for each reply.
+        """
+        self.timeout = socket_timeout
+        self._reader, self._writer = await asyncio.wait_for(asyncio.open_connection(hostname, port),
+                                                            socket_timeout)
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+
+    async def disconnect(self) -> None:
+        """Closes the connection with the gripper; outstanding requests fail with ConnectionError."""
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+    async def _read_loop(self):
+        buffer = b""
+        error = ConnectionError("Connection to gripper closed")
+        try:
+            while True:
+                data = await self._reader.read(1024)
+                if not data:
+                    break
+                buffer += data
+                buffer = self._dispatch(buffer)
+        except Exception as e:  # noqa: BLE001 - forwarded to every waiting request
+            error = e
+        finally:
+            while self._pending:
+                _, future = self._pending.popleft()
+                if not future.done():
+                    future.set_exception(error)
+
+    def _dispatch(self, buffer: bytes) -> bytes:
+        """Resolves the futures for all complete replies in buffer, returns the unparsed rest."""
+        while True:
+            match = _REPLY.match(buffer)
+            if match is None:
+                if len(buffer) > 64:  # no partial reply is that long
+                    raise ValueError(f"Unexpected data from gripper: {buffer!r}")
+                return buffer
+            buffer = buffer[match.end():]
+            if not self._pending:
+                continue  # unsolicited reply, ignore
+            variable, future = self._pending.popleft()
+            if future.done():
+                continue  # request timed out or was cancelled
+            if variable is None:
+                if match.group(1) is None:
+                    future.set_exception(ValueError(f"Unexpected response {match.group(0).strip()!r}: "
+                                                    f"expected 'ack' or 'nak'"))
+                else:
+                    future.set_result(match.group(1) == b"ack")
+            elif match.group(2) is None or match.group(2).decode(self.ENCODING) != variable:
+                future.set_exception(ValueError(f"Unexpected response {match.group(0).strip()!r}: "
+                                                f"does not match '{variable}'"))
+            else:
+                future.set_result(int(match.group(3)))
+
+    def _send(self, commands: List[Tuple[str, Optional[str]]]) -> List[asyncio.Future]:
+        """Writes all commands at once and registers one future per expected reply.
+
+        Registering and writing happen without an await in between, so the reply order
+        always matches the order in _pending, even with several concurrent callers.
+        """
+        if self._writer is None or self._reader_task is None or self._reader_task.done():
+            raise ConnectionError("Gripper is not connected")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for _, variable in commands:
+            future = loop.create_future()
+            self._pending.append((variable, future))
+            futures.append(future)
+        self._writer.write("".join(cmd for cmd, _ in commands).encode(self.ENCODING))
+        return futures
+
+    async def _wait(self, futures: List[asyncio.Future]) -> list:
+        await self._writer.drain()
+        return list(await asyncio.wait_for(asyncio.gather(*futures), self.timeout))
+
+    async def get_vars(self, variables: Iterable[str]) -> Dict[str, int]:
+        """Retrieves several variables with pipelined GET commands (one write, one round trip).
+
+        :param variables: Names of the variables to retrieve, e.g. [POS, OBJ, STA, FLT, PRE].
+        :return: Dictionary variable name -> integer value.
+        """
+        variables = list(variables)
+        futures = self._send([(f"GET {variable}\n", variable) for variable in variables])
+        return dict(zip(variables, await self._wait(futures)))
+
+    async def get_var(self, variable: str) -> int:
+        """Retrieves the value of a single variable."""
+        return (await self.get_vars([variable]))[variable]
+
+    async def get_status(self) -> RobotiqGripper.Status:
+        """Returns the typed status snapshot (see RobotiqGripper.get_status) in one exchange."""
+        values = await self.get_vars(RobotiqGripper.STATUS_VARS)
+        return RobotiqGripper.Status(position=values[self.POS],
+                                     requested_position=values[self.PRE],
+                                     object_status=self.ObjectStatus(values[self.OBJ]),
+                                     gripper_status=self.GripperStatus(values[self.STA]),
+                                     fault=values[self.FLT])
+
+    async def set_vars(self, var_dict: OrderedDict[str, Union[int, float]]) -> bool:
+        """Sets n variables with a single SET command.
+
+        :return: True on successful reception of ack.
+        """
+        cmd = "SET" + "".join(f" {variable} {str(value)}" for variable, value in var_dict.items()) + "\n"
+        (ack,) = await self._wait(self._send([(cmd, None)]))
+        return ack
+
+    async def set_var(self, variable: str, value: Union[int, float]) -> bool:
+        return await self.set_vars(OrderedDict([(variable, value)]))
+
+    async def is_active(self) -> bool:
+        """Returns whether the gripper is active."""
+        status = await self.get_var(self.STA)
+        return self.GripperStatus(status) == self.GripperStatus.ACTIVE
+
+    async def get_current_position(self) -> int:
+        """Returns the current position as returned by the physical hardware."""
+        return await self.get_var(self.POS)
+
+    def get_open_position(self) -> int:
+        return self._min_position
+
+    def get_closed_position(self) -> int:
+        return self._max_position
+
+    async def activate(self, auto_calibrate: bool = True) -> None:
+        """Resets the activation flag and sets it back to one (same sequence as RobotiqGripper.activate)."""
+        if not await self.is_active():
+            await self.set_vars(OrderedDict([(self.ACT, 0), (self.ATR, 0)]))
+            while True:
+                state = await self.get_vars([self.ACT, self.STA])
+                if state[self.ACT] == 0 and state[self.STA] == 0:
+                    break
+                await self.set_vars(OrderedDict([(self.ACT, 0), (self.ATR, 0)]))
+                await asyncio.sleep(self.poll_interval)
+            await asyncio.sleep(0.5)
+
+            await self.set_var(self.ACT, 1)
+            await asyncio.sleep(1.0)
+            while True:
+                state = await self.get_vars([self.ACT, self.STA])
+                if state[self.ACT] == 1 and state[self.STA] == 3:
+                    break
+                await asyncio.sleep(self.poll_interval)
+
+        if auto_calibrate:
+            await self.auto_calibrate()
+
+    async def auto_calibrate(self, log: bool = True) -> None:
+        """Calibrates the open and closed positions by slowly closing and opening the gripper."""
+        position, status = await self.move(self.get_open_position(), 64, 1)
+        if status != self.ObjectStatus.AT_DEST:
+            raise RuntimeError(f"Calibration failed opening to start: {str(status)}")
+        position, status = await self.move(self.get_closed_position(), 64, 1)
+        if status != self.ObjectStatus.AT_DEST:
+            raise RuntimeError(f"Calibration failed because of an object: {str(status)}")
+        self._max_position = position
+        position, status = await self.move(self.get_open_position(), 64, 1)
+        if status != self.ObjectStatus.AT_DEST:
+            raise RuntimeError(f"Calibration failed because of an object: {str(status)}")
+        self._min_position = position
+        if log:
+            print(f"Gripper auto-calibrated to [{self._min_position}, {self._max_position}]")
+
+    def move(self, position: int, speed: int, force: int) -> asyncio.Task:
+        """Starts moving towards the given position and returns a task that completes with the move.
+
+        The task can be awaited directly or collected, e.g. asyncio.gather(g1.move(...), g2.move(...)).
+
+        :param position: Position to move to [min_position, max_position]
+        :param speed: Speed to move at [min_speed, max_speed]
+        :param force: Force to use [min_force, max_force]
+        :return: Task with (final position, ObjectStatus) as result, like RobotiqGripper.move_and_wait_for_pos.
+        """
+        return asyncio.ensure_future(self.move_and_wait_for_pos(position, speed, force))
+
+    async def move_and_wait_for_pos(self, position: int, speed: int, force: int,
+                                    timeout: float = 10.0) -> Tuple[int, RobotiqGripper.ObjectStatus]:
+        def clip_val(min_val, val, max_val):
+            return max(min_val, min(val, max_val))
+
+        cmd_pos = clip_val(self._min_position, position, self._max_position)
+        var_dict = OrderedDict([(self.POS, cmd_pos),
+                                (self.SPE, clip_val(self._min_speed, speed, self._max_speed)),
+                                (self.FOR, clip_val(self._min_force, force, self._max_force)),
+                                (self.GTO, 1)])
+        if not await self.set_vars(var_dict):
+            raise RuntimeError("Failed to set variables for move.")
+
+        # wait until the gripper took over the request and is no longer moving;
+        # PRE, OBJ, POS and FLT are fetched together in one exchange per poll
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            state = await self.get_vars([self.PRE, self.OBJ, self.POS, self.FLT])
+            if state[self.FLT] != 0:
+                raise RuntimeError(f"Gripper fault {state[self.FLT]} during move.")
+            if state[self.PRE] == cmd_pos and self.ObjectStatus(state[self.OBJ]) != self.ObjectStatus.MOVING:
+                return state[self.POS], self.ObjectStatus(state[self.OBJ])
+            if loop.time() > deadline:
+                raise TimeoutError(f"Gripper did not reach position {cmd_pos} within {timeout} s.")
+            await asyncio.sleep(self.poll_interval)
+
+
+async def _demo(hosts):
+    # Several grippers from one event loop: all strokes run at the same time
+    grippers = [AsyncRobotiqGripper() for _ in hosts]
+    await asyncio.gather(*(g.connect(host, 63352) for g, host in zip(grippers, hosts)))
+    await asyncio.gather(*(g.activate(auto_calibrate=False) for g in grippers))
+    for target in (255, 0):
+        results = await asyncio.gather(*(g.move(target, 255, 255) for g in grippers))
+        print(f"Target {target}: {results}")
+    await asyncio.gather(*(g.disconnect() for g in grippers))
+
+
+if __name__ == "__main__":
+    import sys
+    asyncio.run(_demo(sys.argv[1:] or ["192.168.0.17"]))
@@ -0,0 +1,155 @@
+# robotiq_gripper_benchmark.py
+# Latenz- und Durchsatzmessung des Greifer-Treibers ohne Hardware.
+# Startet den Emulator (robotiq_gripper_emulator.py) im selben Prozess und lässt N Clients
+# gleichzeitig darauf los; alternativ mit --host gegen einen laufenden Emulator oder echten Greifer.
+#
+# Gemessen wird je Client-Art:
+#   get_var     einzelne GET-Abfrage (RobotiqGripper._get_var, ein Round Trip je Variable)
+#   get_status  POS, PRE, OBJ, STA, FLT gebündelt (RobotiqGripper.get_status)
+#   async       dieselbe gebündelte Abfrage mit AsyncRobotiqGripper (alle Clients in einer Event-Loop)
+#   move        vollständige Greiferbewegung (move_and_wait_for_pos), Dauer und Anzahl Abfragen
+#
+# Start:  python robotiq_gripper_benchmark.py --clients 8 --requests 2000 --moves 4 [--latency 0.001]
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+import robotiq_gripper
+import robotiq_gripper_async
+from robotiq_gripper_emulator import start_in_thread
+
+
+def start_emulator(latency, object_position):
+    """Emulator in einem Hintergrund-Thread auf einem freien Port starten, liefert (Emulator, Port)."""
+    emulator = start_in_thread("127.0.0.1", 0, object_position=object_position, latency=latency)
+    return emulator, emulator.port
+
+
+def report(name, latencies, duration, operations=None):
+    """Gibt Durchsatz und Latenz-Perzentile in ms aus."""
+    latencies = sorted(latencies)
+    operations = len(latencies) if operations is None else operations
+
+    def percentile(p):
+        return 1000.0 * latencies[min(len(latencies) - 1, int(p / 100.0 * len(latencies)))]
+
+    print(f"{name:<11} {operations / duration:>10.0f} /s   "
+          f"mittel {1000.0 * statistics.fmean(latencies):7.3f} ms   "
+          f"p50 {percentile(50):7.3f}   p99 {percentile(99):7.3f}   max {1000.0 * latencies[-1]:7.3f} ms")
+
+
+def run_threads(clients, worker):
+    """worker(index, latencies) in je einem Thread pro Client, liefert (alle Latenzen, Dauer)."""
+    results = [[] for _ in range(clients)]
+    threads = [threading.Thread(target=worker, args=(i, results[i])) for i in range(clients)]
+    t_start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [x for result in results for x in result], time.perf_counter() - t_start
+
+
+def connect_grippers(host, port, clients):
+    grippers = []
+    for _ in range(clients):
+        gripper = robotiq_gripper.RobotiqGripper()
+        gripper.connect(host, port)
+        gripper.activate(auto_calibrate=False)
+        grippers.append(gripper)
+    return grippers
+
+
+def bench_sync(grippers, requests, batched):
+    def worker(i, latencies):
+        gripper = grippers[i]
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            if batched:
+                gripper.get_status()
+            else:
+                gripper._get_var(gripper.POS)
+            latencies.append(time.perf_counter() - t0)
+    return run_threads(len(grippers), worker)
+
+
+def bench_moves(grippers, moves):
+    # Abfragen zählen, um den Socket-Verkehr je Hub zu sehen
+    counts = [0] * len(grippers)
+
+    def worker(i, latencies):
+        gripper = grippers[i]
+        get_vars = gripper.get_vars
+
+        def counting_get_vars(variables):
+            counts[i] += 1
+            return get_vars(variables)
+        gripper.get_vars = counting_get_vars
+        for k in range(moves):
+            t0 = time.perf_counter()
+            gripper.move_and_wait_for_pos(255 if k % 2 == 0 else 0, 255, 255)
+            latencies.append(time.perf_counter() - t0)
+        del gripper.get_vars
+    latencies, duration = run_threads(len(grippers), worker)
+    return latencies, duration, sum(counts) / max(1, len(latencies))
+
+
+async def bench_async(host, port, clients, requests):
+    grippers = [robotiq_gripper_async.AsyncRobotiqGripper() for _ in range(clients)]
+    await asyncio.gather(*(g.connect(host, port) for g in grippers))
+    await asyncio.gather(*(g.activate(auto_calibrate=False) for g in grippers))
+    latencies = []
+
+    async def worker(gripper):
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            await gripper.get_status()
+            latencies.append(time.perf_counter() - t0)
+
+    t_start = time.perf_counter()
+    await asyncio.gather(*(worker(g) for g in grippers))
+    duration = time.perf_counter() - t_start
+    await asyncio.gather(*(g.disconnect() for g in grippers))
+    return latencies, duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des Robotiq-Greifer-Treibers")
+    parser.add_argument("--clients", type=int, default=8, help="Anzahl gleichzeitiger Greifer-Clients")
+    parser.add_argument("--requests", type=int, default=2000, help="Abfragen je Client")
+    parser.add_argument("--moves", type=int, default=4, help="Greiferbewegungen je Client")
+    parser.add_argument("--latency", type=float, default=0.0, help="künstliche Antwortzeit des Emulators in s")
+    parser.add_argument("--object", type=int, default=None, help="Objektposition im Emulator (0..255)")
+    parser.add_argument("--host", default=None, help="vorhandenen Emulator/Greifer verwenden statt eigenem")
+    parser.add_argument("--port", type=int, default=63352)
+    args = parser.parse_args()
+
+    if args.host is None:
+        emulator, port = start_emulator(args.latency, args.object)
+        host = "127.0.0.1"
+    else:
+        emulator, host, port = None, args.host, args.port
+    print(f"{args.clients} Clients, {args.requests} Abfragen je Client, Ziel {host}:{port}")
+
+    grippers = connect_grippers(host, port, args.clients)
+    latencies, duration = bench_sync(grippers, args.requests, batched=False)
+    report("get_var", latencies, duration)
+    latencies, duration = bench_sync(grippers, args.requests, batched=True)
+    report("get_status", latencies, duration)
+    latencies, duration = asyncio.run(bench_async(host, port, args.clients, args.requests))
+    report("async", latencies, duration)
+    if args.moves:
+        latencies, duration, polls = bench_moves(grippers, args.moves)
+        report("move", latencies, duration)
+        print(f"{'':<11} {polls:.0f} gebündelte Abfragen je Hub")
+    for gripper in grippers:
+        gripper.disconnect()
+    if emulator is not None:
+        print(f"Emulator: {emulator.requests} Anfragen beantwortet")
+
+
+if __name__ == "__main__":
+    main()
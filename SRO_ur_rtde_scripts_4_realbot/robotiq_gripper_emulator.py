@@ -0,0 +1,204 @@
+# robotiq_gripper_emulator.py
+# Emulator für einen Robotiq-Greifer (z.B. Hand-E) an Port 63352, ohne Roboter und Greifer testbar.
+# Spricht dasselbe ASCII-Protokoll wie die URCap-Schnittstelle, die robotiq_gripper.py verwendet:
+#   "SET VAR wert [VAR wert ...]\n"  -> "ack" (bzw. "nak" bei unbekannter Variable)
+#   "GET VAR\n"                      -> "VAR wert\n"
+#
+# Nachgebildet werden:
+#   - Aktivierung: ACT 1 -> STA 1 (aktiviert) -> nach ACTIVATION_TIME STA 3 (aktiv)
+#   - Hubzeit: Geschwindigkeit abhängig von SPE zwischen FULL_STROKE_TIME_SLOW und _FAST für 0..255
+#   - Objekterkennung: liegt ein Objekt bei --object, stoppt das Schließen dort (OBJ 2),
+#     sonst OBJ 3 am Ziel
+#   - Fehler: GTO ohne Aktivierung -> FLT 5; zufällige Fehler mit --fault-rate (FLT 8 hier
+#     frei gewählt), löschbar über ACT 0
+# Die Position wird nicht in einem Takt weitergerechnet, sondern bei jeder Abfrage aus der Zeit
+# bestimmt (kein Aufwand im Leerlauf, beliebig viele Greifer).
+#
+# Standardmäßig hat jede Verbindung ihren eigenen Greifer (N Clients = N Greifer);
+# mit --shared teilen sich alle Verbindungen einen Greifer wie an einem echten Roboter.
+#
+# Start:  python robotiq_gripper_emulator.py [--port 63352] [--object 180] [--latency 0.002]
+# Danach z.B. gripper.connect("127.0.0.1", 63352) wie am echten Roboter.
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+PORT = 63352
+ACTIVATION_TIME = 0.5         # s bis STA 3
+FULL_STROKE_TIME_FAST = 0.35  # s für 0..255 bei SPE 255
+FULL_STROKE_TIME_SLOW = 2.5   # s für 0..255 bei SPE 0
+
+WRITE_VARS = ("ACT", "GTO", "ATR", "ADR", "FOR", "SPE", "POS")
+READ_VARS = ("STA", "PRE", "OBJ", "FLT")
+
+FAULT_NOT_ACTIVATED = 5  # Aktion verzögert, Aktivierung muss erst abgeschlossen sein
+FAULT_INJECTED = 8       # künstlicher Fehler für Tests
+
+
+class EmulatedGripper:
+    """Zustand eines Greifers; alle zeitabhängigen Größen werden in update() aus der Uhr berechnet."""
+
+    def __init__(self, object_position=None, fault_rate=0.0):
+        self.object_position = object_position
+        self.fault_rate = fault_rate
+        self.vars = {name: 0 for name in WRITE_VARS + READ_VARS}
+        self.position = 0.0         # tatsächliche Fingerposition 0..255
+        self.activated_at = None    # Zeitpunkt von ACT 1
+        self.move = None            # (Startzeit, Startposition, Endposition, Geschwindigkeit, Objekt)
+
+    def update(self, now):
+        v = self.vars
+        if v["ACT"] == 1 and v["STA"] == 1 and now - self.activated_at >= ACTIVATION_TIME:
+            v["STA"] = 3
+        if self.move is None:
+            return
+        t0, start, end, speed, blocked = self.move
+        travelled = speed * (now - t0)
+        if travelled >= abs(end - start):
+            self.position = float(end)
+            v["OBJ"] = 2 if blocked else 3
+            self.move = None
+        else:
+            self.position = start + travelled * (1 if end > start else -1)
+
+    def set(self, name, value, now):
+        v = self.vars
+        if name == "ACT":
+            if value == 0:
+                # Reset: löscht auch Fehler und Bewegung
+                v.update(ACT=0, STA=0, GTO=0, FLT=0, OBJ=0)
+                self.move = None
+                self.activated_at = None
+            elif v["ACT"] == 0:
+                v.update(ACT=1, STA=1)
+                self.activated_at = now
+            return
+        v[name] = value
+        if name == "GTO" and value == 1:
+            self.start_move(now)
+
+    def start_move(self, now):
+        v = self.vars
+        # wie der echte Greifer: PRE übernimmt die Anforderung auch, wenn die Bewegung
+        # danach mit einem Fehler abgelehnt wird (Clients warten auf PRE == Sollwert)
+        target = max(0, min(255, v["POS"]))
+        v["PRE"] = target
+        if v["STA"] != 3:
+            v["FLT"] = FAULT_NOT_ACTIVATED
+            return
+        if self.fault_rate and random.random() < self.fault_rate:
+            v["FLT"] = FAULT_INJECTED
+            return
+        blocked = False
+        # beim Schließen über das Objekt hinweg stoppen die Finger am Objekt
+        if self.object_position is not None and self.position < self.object_position <= target:
+            target = self.object_position
+            blocked = True
+        spe = max(0, min(255, v["SPE"])) / 255.0
+        stroke_time = FULL_STROKE_TIME_SLOW + (FULL_STROKE_TIME_FAST - FULL_STROKE_TIME_SLOW) * spe
+        self.move = (now, self.position, target, 255.0 / stroke_time, blocked)
+        v["OBJ"] = 0
+
+    def get(self, name):
+        if name == "POS":
+            return int(round(self.position))
+        return self.vars[name]
+
+
+def handle_line(gripper, line, now):
+    """Verarbeitet eine Befehlszeile und liefert die Antwort als Bytes."""
+    parts = line.split()
+    if len(parts) == 2 and parts[0] == "GET" and parts[1] in gripper.vars:
+        gripper.update(now)
+        return f"{parts[1]} {gripper.get(parts[1])}\n".encode()
+    if len(parts) >= 3 and len(parts) % 2 == 1 and parts[0] == "SET":
+        pairs = list(zip(parts[1::2], parts[2::2]))
+        if all(name in WRITE_VARS and value.lstrip("-").isdigit() for name, value in pairs):
+            gripper.update(now)
+            for name, value in pairs:
+                gripper.set(name, int(value), now)
+            return b"ack"
+    return b"nak"
+
+
+class GripperEmulator:
+    def __init__(self, host="0.0.0.0", port=PORT, shared=False, object_position=None,
+                 fault_rate=0.0, latency=0.0):
+        self.host = host
+        self.port = port
+        self.shared = shared
+        self.object_position = object_position
+        self.fault_rate = fault_rate
+        self.latency = latency
+        self.shared_gripper = EmulatedGripper(object_position, fault_rate)
+        self.requests = 0
+        self.server = None
+
+    async def handle_client(self, reader, writer):
+        gripper = self.shared_gripper if self.shared else EmulatedGripper(self.object_position, self.fault_rate)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                self.requests += 1
+                writer.write(handle_line(gripper, line.decode("UTF-8", "replace"), time.monotonic()))
+                await writer.drain()  # kehrt sofort zurück, solange der Sendepuffer nicht voll ist
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port, reuse_address=True)
+        self.port = self.server.sockets[0].getsockname()[1]  # falls port=0 (freier Port)
+        return self.server
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"🤖 Greifer-Emulator aktiv auf {self.host}:{self.port} "
+              f"({'ein gemeinsamer Greifer' if self.shared else 'ein Greifer je Verbindung'})")
+        async with self.server:
+            await self.server.serve_forever()
+
+
+def start_in_thread(host="127.0.0.1", port=0, **options):
+    """Emulator in einem Hintergrund-Thread starten (port=0: freier Port), liefert den Emulator."""
+    emulator = GripperEmulator(host, port, **options)
+    ready = threading.Event()
+
+    def run():
+        async def serve():
+            await emulator.start()
+            ready.set()
+            await emulator.server.serve_forever()
+        asyncio.run(serve())
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return emulator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Robotiq-Greifer-Emulator (SET/GET an Port 63352)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--shared", action="store_true", help="alle Verbindungen steuern denselben Greifer")
+    parser.add_argument("--object", type=int, default=None, help="Objekt bei dieser Position (0..255)")
+    parser.add_argument("--fault-rate", type=float, default=0.0, help="Wahrscheinlichkeit eines Fehlers je Bewegung")
+    parser.add_argument("--latency", type=float, default=0.0, help="künstliche Antwortzeit je Anfrage in s")
+    args = parser.parse_args()
+    emulator = GripperEmulator(args.host, args.port, args.shared, args.object, args.fault_rate, args.latency)
+    try:
+        asyncio.run(emulator.serve_forever())
+    except KeyboardInterrupt:
+        print(f"Beendet nach {emulator.requests} Anfragen")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,8 @@
 # https://github.com/githubuser0xFFFF/py_robotiq_gripper/tree/master
 # https://sdurobotics.gitlab.io/ur_rtde/examples/examples.html
 
-import rtde_control  # > pip install ur-rtde  ggf. pip iupdaten mit > python.exe -m pip install --upgrade pip
-import rtde_receive
-import rtde_io
-import robotiq_gripper
-
-import time
+import robot_backend  # ur_rtde, Webots oder Mock (Auswahl über SRO_ROBOT_BACKEND)
+# import rtde_io
 
 ROBOT_IP = "192.168.0.11"
 def log_info(gripper):
@@ -16,11 +12,11 @@ def log_info(gripper):
           f"Open: {gripper.is_open(): <2}  "
           f"Closed: {gripper.is_closed(): <2}  ")
     
-def gripper_first_test():
-    print("Creating gripper...")
-    gripper = robotiq_gripper.RobotiqGripper()
+def gripper_first_test(robot):
     print("Connecting to gripper...")
-    gripper.connect(ROBOT_IP, 63352)
+    gripper = robot.connect_gripper()
+    if gripper is None:
+        return
     print("Activating gripper...")
     gripper.activate()
 
@@ -35,17 +31,18 @@ def deg2rad(grad):
 
 # ---- main ----
 if __name__ == '__main__':
+    robot = robot_backend.connect(ip=ROBOT_IP)
     input("Gripper startet Bewegeung nach Betätigung Enter Taste")
-    gripper_first_test()
+    gripper_first_test(robot)
 
-    rtde_r = rtde_receive.RTDEReceiveInterface(ROBOT_IP)
+    rtde_r = robot.rtde_r
     actual_q = rtde_r.getActualQ()  # in radian
     print("Aktueller Zustand - Gelenkpositionen in Grad ")
     for arg in actual_q:
         print(arg *180.0/3.1415927)
     
     input("Roboter startet Bewegung nach Eingabe beliebiger Taste")
-    rtde_c = rtde_control.RTDEControlInterface(ROBOT_IP)
+    rtde_c = robot.rtde_c
     
     new_q = actual_q
     print(new_q)
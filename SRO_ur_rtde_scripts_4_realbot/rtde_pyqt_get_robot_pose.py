@@ -4,7 +4,7 @@
 # https://sdurobotics.gitlab.io/ur_rtde/examples/examples.html
 
 # import rtde_control  # > pip install ur-rtde  ggf. pip iupdaten mit > python.exe -m pip install --upgrade pip
-import rtde_receive
+import robot_backend  # ur_rtde, Webots oder Mock, Auswahl über SRO_ROBOT_BACKEND
 # import rtde_io
 # import robotiq_gripper
 # import time
@@ -21,7 +21,8 @@ ROBOT_IP = "192.168.0.3"
 class MainWindow(QMainWindow):
     def __init__(self):
         QMainWindow.__init__(self)
-        self.rtde_r = rtde_receive.RTDEReceiveInterface(ROBOT_IP)
+        self.robot = robot_backend.connect(ip=ROBOT_IP, receive_only=True)
+        self.rtde_r = self.robot.rtde_r
 
         self.setMinimumSize(QSize(300, 200))    
         self.setWindowTitle("SRO ")
@@ -3,28 +3,119 @@
 # https://github.com/githubuser0xFFFF/py_robotiq_gripper/tree/master
 # https://sdurobotics.gitlab.io/ur_rtde/examples/examples.html
 
-import rtde_control  # > pip install ur-rtde  ggf. pip iupdaten mit > python.exe -m pip install --upgrade pip
-import rtde_receive
+import robot_backend  # ur_rtde, Webots oder Mock, Auswahl über SRO_ROBOT_BACKEND
 # import rtde_io
 import robotiq_gripper
-# import time
+from motion_executor import MotionExecutor
+import time
+import threading
 
 import sys
 from PyQt6 import QtWidgets, QtCore
+from PyQt6.QtCore import QThread, pyqtSignal
 from PyQt6.QtWidgets import QMainWindow
 from PyQt6.QtCore import QSize   
 from PyQt6.QtWidgets import QPushButton 
 from PyQt6.QtWidgets import QLabel
+from PyQt6.QtWidgets import QProgressBar
 
 ROBOT_IP = "192.168.0.17"
 
+TELEMETRY_RATE = 50   # Hz, Pose und Gelenkwinkel
+GRIPPER_RATE = 20     # Hz, Greiferstatus (Hintergrund-Poller in RobotiqGripper)
+
+JOG_STEP = 0.005          # m je Klick
+JOG_SPEED = 0.3           # m/s
+JOG_ACCELERATION = 0.1    # m/s^2
+
+
+class TelemetryWorker(QThread):
+    """Liest Pose, Gelenkwinkel und Greiferzustand zyklisch im Hintergrund.
+
+    Der letzte Stand liegt als Schnappschuss (dict) vor und wird zusätzlich per Signal
+    an das GUI gemeldet; die Slots müssen dadurch nicht mehr selbst beim Roboter nachfragen.
+    """
+    telemetryUpdated = pyqtSignal(dict)
+
+    def __init__(self, rtde_r, gripper):
+        super().__init__()
+        self.rtde_r = rtde_r
+        self.gripper = gripper
+        self.running = True
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def snapshot(self):
+        """Letzter Stand, ohne Netzwerkzugriff."""
+        with self._lock:
+            return self._snapshot
+
+    def sample(self):
+        """Liest einen neuen Stand; der Greiferstatus kommt aus dem Cache des Greifer-Pollers.
+
+        Ohne Greifer (z.B. Backend webots) sind gripper_pos und gripper_status None.
+        """
+        snapshot = {
+            "time": time.time(),
+            "pose": self.rtde_r.getActualTCPPose(),
+            "q": self.rtde_r.getActualQ(),
+            "gripper_pos": None,
+            "gripper_status": None,
+            "gripper_open": False,
+            "gripper_closed": False,
+        }
+        if self.gripper is not None:
+            gripper_status = self.gripper.get_cached_status() or self.gripper.get_status()
+            gripper_pos = gripper_status.position
+            snapshot.update(
+                gripper_pos=gripper_pos,
+                gripper_status=gripper_status,
+                # offen/geschlossen aus der kalibrierten Position, ohne weitere Abfrage
+                gripper_open=gripper_pos <= self.gripper.get_open_position(),
+                gripper_closed=gripper_pos >= self.gripper.get_closed_position(),
+            )
+        return snapshot
+
+    def run(self):
+        period = 1.0 / TELEMETRY_RATE
+        next_time = time.monotonic()
+        while self.running:
+            try:
+                snapshot = self.sample()
+                with self._lock:
+                    self._snapshot = snapshot
+                self.telemetryUpdated.emit(snapshot)
+            except Exception as e:
+                print(f"Telemetrie-Fehler: {e}")
+            # fester Takt über eine monotone Deadline, ohne Drift durch die Abfragedauer
+            next_time += period
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_time = time.monotonic()
+
+    def stop(self):
+        self.running = False
+        self.wait()
+
+
 class MainWindow(QMainWindow):
+    # Greifer-Ereignisse aus dem Poller-Thread in den GUI-Thread bringen
+    gripperEvent = pyqtSignal(str, object)
+
     def __init__(self):
         QMainWindow.__init__(self)
-        self.rtde_c = rtde_control.RTDEControlInterface(ROBOT_IP)
-        self.rtde_r = rtde_receive.RTDEReceiveInterface(ROBOT_IP)
-        self.gripper = robotiq_gripper.RobotiqGripper()
-        self.gripper.connect(ROBOT_IP, 63352)
+        self.robot = robot_backend.connect(ip=ROBOT_IP)
+        self.rtde_c = self.robot.rtde_c
+        self.rtde_r = self.robot.rtde_r
+        self.gripper = self.robot.connect_gripper()  # None, wenn das Backend keinen Greifer hat
+        # Greiferzustand im Hintergrund zwischenspeichern; Ereignisse (Objekt erkannt, Fehler,
+        # Bewegung fertig) kommen sofort per Signal statt erst bei der nächsten Abfrage
+        self.gripperEvent.connect(self.gripperEventSlot)
+        if self.gripper is not None:
+            self.gripper.add_listener(self.gripperEvent.emit)
+            self.gripper.start_polling(GRIPPER_RATE)
 
         self.setMinimumSize(QSize(400, 400))    
         self.setWindowTitle("SRO - Universal Robot GUI")
@@ -60,6 +151,22 @@ class MainWindow(QMainWindow):
         self.btn_go_ym.move(250, 30)      
 
 
+        self.btn_stop = QPushButton(' STOP Move ', self)
+        self.btn_stop.clicked.connect(self.stopMoveSlot)
+        self.btn_stop.resize(100,30)
+        self.btn_stop.move(250, 60)
+        self.btn_stop.setStyleSheet("background-color : orange")
+
+        self.progress_move = QProgressBar(self)
+        self.progress_move.setRange(0, 100)
+        self.progress_move.resize(150, 20)
+        self.progress_move.move(200, 100)
+
+        self.lbl_move = QLabel(" ", self)
+        self.lbl_move.resize(190, 20)
+        self.lbl_move.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
+        self.lbl_move.move(200, 130)
+
         self.btn_grp_open = QPushButton('open Gripper', self)
         self.btn_grp_open.clicked.connect(self.grpOpenSlot)
         self.btn_grp_open.resize(100, 30)
@@ -112,32 +219,54 @@ class MainWindow(QMainWindow):
         self.lbl_pose_complete.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
         self.lbl_pose_complete.move(5, 300)
 
+        if self.gripper is None:
+            self.btn_grp_open.setEnabled(False)
+            self.btn_grp_close.setEnabled(False)
+            self.lbl_gripper.setText("kein Greifer")
+
+        # Hintergrund-Telemetrie: Anzeige aktualisiert sich selbst, Slots nutzen den Schnappschuss
+        self.pose = None
+        self.telemetry = TelemetryWorker(self.rtde_r, self.gripper)
+        self.telemetry.telemetryUpdated.connect(self.showTelemetry)
+        self.telemetry.start()
+
+        # Bewegungen laufen im Hintergrund, die GUI bleibt während der Fahrt bedienbar
+        self.motion = MotionExecutor(self.rtde_c, lambda: self.latestSnapshot()["pose"],
+                                     JOG_SPEED, JOG_ACCELERATION)
+        self.motion.progress.connect(self.progress_move.setValue)
+        self.motion.motionStarted.connect(self.moveStartedSlot)
+        self.motion.motionFinished.connect(self.moveFinishedSlot)
+        self.motion.start()
+
     def __del__(self):  # Destruktor
         print("Destruktor ")
         self.rtde_c.stopScript()
     
     def closeEvent(self, event):
         print("Close Event ")
+        self.motion.stop()
+        self.telemetry.stop()
+        if self.gripper is not None:
+            self.gripper.stop_polling()
         self.rtde_c.stopScript()
 
+    def latestSnapshot(self):
+        """Schnappschuss der Telemetrie; vor dem ersten Zyklus einmal direkt gelesen."""
+        snapshot = self.telemetry.snapshot()
+        if snapshot is None:
+            snapshot = self.telemetry.sample()
+        return snapshot
+
     def log_info(self ):
-        print(f"Pos: {str(self.gripper.get_current_position()): >3}  "
-              f"Open: {self.gripper.is_open(): <2}  "
-              f"Closed: {self.gripper.is_closed(): <2}  ")
+        snapshot = self.latestSnapshot()
+        print(f"Pos: {str(snapshot['gripper_pos']): >3}  "
+              f"Open: {snapshot['gripper_open']: <2}  "
+              f"Closed: {snapshot['gripper_closed']: <2}  ")
 
 
-    def getTcpPoseSlot(self):
-        print('Get Actual TcpPose from Robot')
-        self.pose = self.rtde_r.getActualTCPPose()
-        # get actual Cartesian coordinates of the tool: (x,y,z,rx,ry,rz),
-        # where rx, ry and rz is a rotation vector representation of the tool orientation """
-        print(self.pose)
-        
-        print('Get Actual Joint Angles from Robot in radian')
-        actual_q = self.rtde_r.getActualQ()  # in radian
-        print(actual_q)
-        
-       # ui.lblStatus.setText( str(ui.spielZugNr)+'.Zug ')
+    def showTelemetry(self, snapshot):
+        # wird per Signal aus dem Telemetrie-Thread im GUI-Thread aufgerufen
+        self.pose = snapshot["pose"]
         x = round(self.pose[0]*1000, 3) #  m => mm
         self.lbl_pose_x.setText('x: '+ str(x) + ' mm' )
         y = round(self.pose[1]*1000, 3)
@@ -151,119 +280,104 @@ class MainWindow(QMainWindow):
                                        + str(round(self.pose[4], 3)) + ' ' 
                                        + str(round(self.pose[5], 3)) + ' ' )
 
-        self.log_info()
-        grpr_pos = self.gripper.get_current_position()
-        # self.lbl_gripper.setText('Gripper: ' + str(grpr_pos))
-        if grpr_pos < 10:
+        grpr_pos = snapshot["gripper_pos"]
+        grpr_status = snapshot["gripper_status"]
+        if grpr_status is None:
+            self.lbl_gripper.setText("kein Greifer")
+        elif grpr_status.fault:
+            self.lbl_gripper.setText('Gripper fault: ' + str(grpr_status.fault))
+        elif grpr_status.object_status in (robotiq_gripper.RobotiqGripper.ObjectStatus.STOPPED_INNER_OBJECT,
+                                           robotiq_gripper.RobotiqGripper.ObjectStatus.STOPPED_OUTER_OBJECT):
+            self.lbl_gripper.setText('Gripper holds object: ' + str(grpr_pos))
+        elif grpr_pos < 10:
             self.lbl_gripper.setText('Gripper is open: ' + str(grpr_pos))
         else:
             self.lbl_gripper.setText('Gripper is closed: ' + str(grpr_pos))
+
+    def gripperEventSlot(self, event, status):
+        if event == robotiq_gripper.RobotiqGripper.EVENT_STATUS:
+            return  # Anzeige übernimmt showTelemetry
+        print(f"Gripper: {event}  Pos: {status.position}  Obj: {status.object_status.name}  Fault: {status.fault}")
+
+    def getTcpPoseSlot(self):
+        snapshot = self.latestSnapshot()
+        print('Actual TcpPose from Robot')
+        # actual Cartesian coordinates of the tool: (x,y,z,rx,ry,rz),
+        # where rx, ry and rz is a rotation vector representation of the tool orientation """
+        print(snapshot["pose"])
         
+        print('Actual Joint Angles from Robot in radian')
+        print(snapshot["q"])
+
+        self.showTelemetry(snapshot)
+        self.log_info()
+
+    def jog(self, dx=0.0, dy=0.0, dz=0.0):
+        # kehrt sofort zurück; Klicks während der Fahrt werden zu einem Ziel zusammengefasst
+        # (Inverse Kinematic im Roboter, Anzeige wird vom Telemetrie-Thread aktualisiert)
+        self.motion.jog(dx, dy, dz)
+
+    def stopMoveSlot(self):
+        print('Stop Move')
+        self.motion.cancel()
+
+    def moveStartedSlot(self, target):
+        self.lbl_move.setText('fahre nach z: ' + str(round(target[2]*1000, 1)) + ' mm')
+
+    def moveFinishedSlot(self, reached, message):
+        print(message)
+        self.lbl_move.setText(message)
+
     def goSlot_zm(self):
         print('Move Robot down -z 0.005m')
-        # get actual pose
-        self.pose = self.rtde_r.getActualTCPPose() 
-        # Inverse Kinematic im Roboter
-        self.rtde_c.moveL([self.pose[0], 
-                           self.pose[1],
-                           self.pose[2] - 0.005,
-                           self.pose[3],
-                           self.pose[4], 
-                           self.pose[5]], 0.3, 0.1)
-        # update screen 
-        self.getTcpPoseSlot()
+        self.jog(dz=-JOG_STEP)
     
     def goSlot_zp(self):
         print('Move Robot up +z 0.005m')
-        # get actual pose
-        self.pose = self.rtde_r.getActualTCPPose() 
-        # Inverse Kinematic im Roboter
-        self.rtde_c.moveL([self.pose[0],
-                           self.pose[1],
-                           self.pose[2]+ 0.005 ,
-                           self.pose[3], 
-                           self.pose[4], 
-                           self.pose[5]], 0.3, 0.1)
-        # update screen 
-        self.getTcpPoseSlot()
+        self.jog(dz=JOG_STEP)
 
     def goSlot_xp(self):
         print('Move Robot +x 0.005m')
-        # get actual pose
-        self.pose = self.rtde_r.getActualTCPPose() 
-        # Inverse Kinematic im Roboter
-        self.rtde_c.moveL([self.pose[0]+ 0.005,
-                           self.pose[1],
-                           self.pose[2],
-                           self.pose[3], 
-                           self.pose[4], 
-                           self.pose[5]], 0.3, 0.1)
-        # update screen 
-        self.getTcpPoseSlot()  
+        self.jog(dx=JOG_STEP)
 
     def goSlot_xm(self):
         print('Move Robot -x 0.005m')
-        # get actual pose
-        self.pose = self.rtde_r.getActualTCPPose() 
-        # Inverse Kinematic im Roboter
-        self.rtde_c.moveL([self.pose[0]- 0.005,
-                           self.pose[1],
-                           self.pose[2],
-                           self.pose[3], 
-                           self.pose[4], 
-                           self.pose[5]], 0.3, 0.1)
-        # update screen 
-        self.getTcpPoseSlot()  
+        self.jog(dx=-JOG_STEP)
           
     def goSlot_yp(self):
         print('Move Robot +y 0.005m')
-        # get actual pose
-        self.pose = self.rtde_r.getActualTCPPose() 
-        # Inverse Kinematic im Roboter
-        self.rtde_c.moveL([self.pose[0],
-                           self.pose[1]+ 0.005,
-                           self.pose[2],
-                           self.pose[3], 
-                           self.pose[4], 
-                           self.pose[5]], 0.3, 0.1)
-        # update screen 
-        self.getTcpPoseSlot()  
+        self.jog(dy=JOG_STEP)
 
     def goSlot_ym(self):
         print('Move Robot -y 0.005m')
-        # get actual pose
-        self.pose = self.rtde_r.getActualTCPPose() 
-        # Inverse Kinematic im Roboter
-        self.rtde_c.moveL([self.pose[0],
-                           self.pose[1]- 0.005,
-                           self.pose[2],
-                           self.pose[3], 
-                           self.pose[4], 
-                           self.pose[5]], 0.3, 0.1)
-        # update screen 
-        self.getTcpPoseSlot()  
+        self.jog(dy=-JOG_STEP)
 
     def grpInfo(self):
-        grp_position = self.gripper.get_current_position()
+        grp_position = self.latestSnapshot()["gripper_pos"]
         print("Actual Gripper Position is ")
         print (grp_position)    
 
     def grpOpenSlot(self):
         print('Open Gripper')
+        if self.gripper is None:
+            return
         self.grpInfo()
         # öffnet den Greifer
-        grp_pos = self.gripper.get_current_position()
+        grp_pos = self.latestSnapshot()["gripper_pos"]
         self.gripper.move_and_wait_for_pos(grp_pos-10, 255, 255)
         
 
     def grpCloseSlot(self):
         print('Close Gripper')
+        if self.gripper is None:
+            return
         self.grpInfo()
-        grp_pos = self.gripper.get_current_position()
+        grp_pos = self.latestSnapshot()["gripper_pos"]
         self.gripper.move_and_wait_for_pos(grp_pos+10, 255, 255)
 
     def teachOnSlot(self):
         print('Teachmode ON')
+        self.motion.cancel()
         self.rtde_c.teachMode()
         # changing color of button 
         self.btn_teachOn.setStyleSheet("background-color : red") 
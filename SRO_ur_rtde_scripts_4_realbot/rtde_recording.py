@@ -0,0 +1,317 @@
+# rtde_recording.py
+# Spaltenweises Binärformat für Roboter-Trajektorien (statt print(self.pose) / print(actual_q)).
+#
+# Eine Aufzeichnung ist ein Verzeichnis, z.B. "aufnahme_20241127_101500.rtrec/":
+#   meta.json        Spalten, Datentyp, Breite, Abtastrate, Startzeit, Roboter-IP
+#   timestamp.bin    float64, N          (Roboterzeit aus getTimestamp(), s)
+#   q.bin            float64, N x 6      (Gelenkwinkel, rad)
+#   qd.bin           float64, N x 6      (Gelenkgeschwindigkeiten, rad/s)
+#   tcp_pose.bin     float64, N x 6      (x, y, z, rx, ry, rz)
+#   tcp_force.bin    float64, N x 6      (Fx, Fy, Fz, Tx, Ty, Tz)
+#
+# Der Recorder sammelt Abtastungen in einem vorbelegten NumPy-Block (CHUNK_SIZE Zeilen) und hängt
+# jeden vollen Block spaltenweise an die Dateien an. Die Dateien sind reine Rohdaten ohne Kopf,
+# die Anzahl der Zeilen ergibt sich aus der Dateigröße - nach einem Absturz ist alles bis zum
+# letzten geschriebenen Block lesbar.
+# Der Reader legt die Dateien per np.memmap ein: Öffnen dauert unabhängig von der Länge nur
+# Millisekunden, gelesen wird erst beim Zugriff und nur der benötigte Ausschnitt.
+#
+# Aufzeichnen:  python rtde_recording.py record --ip 192.168.0.17 --duration 60 [--backend webots|mock]
+# Anzeigen:     python rtde_recording.py info aufnahme_20241127_101500.rtrec
+# Benchmark:    python rtde_recording.py benchmark --hours 1 --rate 500
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import robot_backend
+
+SAMPLE_RATE = 125
+CHUNK_SIZE = 4096
+DTYPE = "float64"
+# Spaltenname -> Breite (1 = Vektor, sonst Matrix N x Breite)
+COLUMNS = {"timestamp": 1, "q": 6, "qd": 6, "tcp_pose": 6, "tcp_force": 6}
+SUFFIX = ".rtrec"
+
+
+class TrajectoryRecorder:
+    """Schreibt Abtastungen blockweise in eine spaltenweise Aufzeichnung."""
+
+    def __init__(self, path, rate=SAMPLE_RATE, chunk_size=CHUNK_SIZE, **meta):
+        if not path.endswith(SUFFIX):
+            path += SUFFIX
+        os.makedirs(path, exist_ok=False)  # niemals eine vorhandene Aufzeichnung überschreiben
+        self.path = path
+        self.chunk_size = chunk_size
+        self.samples = 0
+        self._fill = 0
+        self._lock = threading.Lock()
+        self._buffers = {name: np.empty((chunk_size, width) if width > 1 else chunk_size, dtype=DTYPE)
+                         for name, width in COLUMNS.items()}
+        self._files = {name: open(os.path.join(path, name + ".bin"), "ab") for name in COLUMNS}
+        info = {"columns": COLUMNS, "dtype": DTYPE, "rate": rate, "start_time": time.time()}
+        info.update(meta)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=2)
+
+    def append(self, timestamp, q, qd, tcp_pose, tcp_force):
+        """Eine Abtastung anhängen (Listen wie von rtde_receive geliefert)."""
+        with self._lock:
+            i = self._fill
+            b = self._buffers
+            b["timestamp"][i] = timestamp
+            b["q"][i] = q
+            b["qd"][i] = qd
+            b["tcp_pose"][i] = tcp_pose
+            b["tcp_force"][i] = tcp_force
+            self._fill += 1
+            self.samples += 1
+            if self._fill == self.chunk_size:
+                self._write_chunk()
+
+    def append_block(self, **columns):
+        """Viele Abtastungen auf einmal anhängen, z.B. append_block(timestamp=t, q=Q, ...)."""
+        with self._lock:
+            self._write_chunk()
+            lengths = {len(columns[name]) for name in COLUMNS}
+            if len(lengths) != 1:
+                raise ValueError(f"Spalten unterschiedlich lang: {lengths}")
+            for name in COLUMNS:
+                self._files[name].write(np.ascontiguousarray(columns[name], dtype=DTYPE).tobytes())
+            self.samples += lengths.pop()
+
+    def _write_chunk(self):
+        if self._fill == 0:
+            return
+        for name, buffer in self._buffers.items():
+            self._files[name].write(buffer[:self._fill].tobytes())
+        self._fill = 0
+
+    def flush(self):
+        with self._lock:
+            self._write_chunk()
+            for f in self._files.values():
+                f.flush()
+
+    def close(self):
+        self.flush()
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryRecording:
+    """Liest eine Aufzeichnung speicherabgebildet (np.memmap), ohne die Daten zu kopieren.
+
+    Spalten als Attribute: rec.timestamp (N,), rec.q, rec.qd, rec.tcp_pose, rec.tcp_force (N, 6)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        dtype = np.dtype(self.meta["dtype"])
+        columns = self.meta["columns"]
+        # Zeilenzahl aus der Dateigröße; bei einem Abbruch mitten im Block zählt die kürzeste Spalte
+        sizes = {name: os.path.getsize(os.path.join(path, name + ".bin")) // (width * dtype.itemsize)
+                 for name, width in columns.items()}
+        self.samples = min(sizes.values())
+        self.columns = {}
+        for name, width in columns.items():
+            shape = (self.samples, width) if width > 1 else (self.samples,)
+            if self.samples == 0:
+                column = np.empty(shape, dtype=dtype)  # memmap einer leeren Datei ist nicht möglich
+            else:
+                column = np.memmap(os.path.join(path, name + ".bin"), dtype=dtype, mode="r", shape=shape)
+            self.columns[name] = column
+            setattr(self, name, column)
+
+    def __len__(self):
+        return self.samples
+
+    @property
+    def duration(self):
+        return float(self.timestamp[-1] - self.timestamp[0]) if self.samples > 1 else 0.0
+
+    @property
+    def rate(self):
+        return (self.samples - 1) / self.duration if self.duration else float(self.meta.get("rate", 0))
+
+    def index_at(self, t):
+        """Index der ersten Abtastung mit Zeitstempel >= t (binäre Suche, Zeit relativ zum Start)."""
+        return int(np.searchsorted(self.timestamp, self.timestamp[0] + t))
+
+    def between(self, t_from, t_to):
+        """Ausschnitt [t_from, t_to) in s ab Aufzeichnungsbeginn als dict Spalte -> Ansicht."""
+        i0, i1 = self.index_at(t_from), self.index_at(t_to)
+        return {name: column[i0:i1] for name, column in self.columns.items()}
+
+    def sample(self, index):
+        """Eine Abtastung als dict mit Listen (z.B. für servoJ bei der Wiedergabe)."""
+        return {name: column[index].tolist() for name, column in self.columns.items()}
+
+
+class RTDERecorder(threading.Thread):
+    """Liest q, qd, TCP-Pose und TCP-Kraft im festen Takt und schreibt sie in den Recorder.
+
+    Werte, die ein Backend nicht liefert (z.B. Kräfte im Simulator), werden als Nullen
+    aufgezeichnet; ohne getTimestamp zählt die monotone Uhr ab Start.
+    """
+
+    def __init__(self, rtde_r, recorder, rate=SAMPLE_RATE):
+        super().__init__(daemon=True)
+        self.rtde_r = rtde_r
+        t_start = time.monotonic()
+        self._timestamp = getattr(rtde_r, "getTimestamp", None) or (lambda: time.monotonic() - t_start)
+        self._qd = getattr(rtde_r, "getActualQd", None) or (lambda: [0.0] * 6)
+        self._force = getattr(rtde_r, "getActualTCPForce", None) or (lambda: [0.0] * 6)
+        self.recorder = recorder
+        self.period = 1.0 / rate
+        self.running = True
+        self.overruns = 0
+
+    def run(self):
+        r = self.rtde_r
+        next_time = time.monotonic()
+        while self.running:
+            self.recorder.append(self._timestamp(), r.getActualQ(), self._qd(),
+                                 r.getActualTCPPose(), self._force())
+            # fester Takt über eine monotone Deadline
+            next_time += self.period
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                self.overruns += 1
+                next_time = time.monotonic()
+
+    def stop(self):
+        self.running = False
+        self.join()
+
+
+def record(backend, ip, path, duration, rate):
+    robot = robot_backend.connect(backend, address=ip, receive_only=True)
+    path = path or time.strftime("aufnahme_%Y%m%d_%H%M%S")
+    with TrajectoryRecorder(path, rate, backend=robot.name, robot_ip=robot.ip) as recorder:
+        sampler = RTDERecorder(robot.rtde_r, recorder, rate)
+        print(f"📝 Aufzeichnung {recorder.path}: {rate} Hz (Strg+C beendet)")
+        sampler.start()
+        try:
+            t_end = time.monotonic() + duration if duration else None
+            while t_end is None or time.monotonic() < t_end:
+                time.sleep(1.0)
+                print(f"{recorder.samples} Abtastungen, {sampler.overruns} Taktüberschreitungen")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sampler.stop()
+            robot.disconnect()
+    print(f"✅ {recorder.samples} Abtastungen in {recorder.path}")
+
+
+def info(path):
+    t0 = time.perf_counter()
+    rec = TrajectoryRecording(path)
+    t_open = time.perf_counter() - t0
+    print(f"{path}: {len(rec)} Abtastungen, {rec.duration:.1f} s, {rec.rate:.1f} Hz "
+          f"(geöffnet in {1000 * t_open:.2f} ms)")
+    if len(rec):
+        q = rec.q
+        print(f"q min  [rad]: {np.round(q.min(axis=0), 4).tolist()}")
+        print(f"q max  [rad]: {np.round(q.max(axis=0), 4).tolist()}")
+        print(f"|F| max  [N]: {np.linalg.norm(rec.tcp_force[:, :3], axis=1).max():.2f}")
+
+
+def benchmark(hours, rate, path, keep=False):
+    """Synthetische Aufzeichnung schreiben, dann Öffnen, Ausschnitt und Auswertung messen.
+
+    Ohne path wird in ein eigenes temporäres Verzeichnis geschrieben und es danach gelöscht
+    (außer mit keep=True); eine ausdrücklich angegebene path bleibt immer erhalten.
+    """
+    tmpdir = None
+    if not path:
+        tmpdir = tempfile.mkdtemp(prefix="rtde_benchmark_")
+        path = os.path.join(tmpdir, "benchmark")
+    try:
+        # eigene Funktion: deren memmaps sind beim Löschen schon geschlossen (nötig unter Windows)
+        return _run_benchmark(hours, rate, path)
+    finally:
+        if tmpdir is not None and not keep:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            print(f"Benchmark-Daten gelöscht ({tmpdir})")
+        elif tmpdir is not None:
+            print(f"Benchmark-Daten behalten in {tmpdir}")
+
+
+def _run_benchmark(hours, rate, path):
+    samples = int(hours * 3600 * rate)
+    t = np.arange(samples) / rate
+    print(f"Schreibe {samples} Abtastungen ({hours} h bei {rate} Hz) ...")
+    t0 = time.perf_counter()
+    with TrajectoryRecorder(path, rate) as recorder:
+        for first in range(0, samples, 100000):
+            block = t[first:first + 100000]
+            q = np.sin(block[:, None] * 0.1 + np.arange(6))
+            recorder.append_block(timestamp=block, q=q, qd=np.cos(block[:, None] * 0.1 + np.arange(6)) * 0.1,
+                                  tcp_pose=q * 0.5, tcp_force=q * 10.0)
+        # einzelne Abtastungen wie im RTDE-Takt
+        t_single = time.perf_counter()
+        for i in range(10000):
+            recorder.append(t[-1] + (i + 1) / rate, [0.0] * 6, [0.0] * 6, [0.0] * 6, [0.0] * 6)
+        t_single = time.perf_counter() - t_single
+    print(f"Schreiben: {time.perf_counter() - t0:.2f} s, append() je Abtastung {1e6 * t_single / 10000:.1f} µs")
+    size = sum(os.path.getsize(os.path.join(recorder.path, name + ".bin")) for name in COLUMNS)
+    print(f"Dateigröße: {size / 2 ** 20:.0f} MiB "
+          f"(als Python-Listen von floats ca. {samples * 25 * 32 / 2 ** 20:.0f} MiB)")
+
+    t0 = time.perf_counter()
+    rec = TrajectoryRecording(recorder.path)
+    print(f"Öffnen:                  {1000 * (time.perf_counter() - t0):8.2f} ms  ({len(rec)} Abtastungen)")
+    t0 = time.perf_counter()
+    part = rec.between(1800.0, 1860.0)
+    mean = part["q"].mean(axis=0)
+    print(f"1 min Ausschnitt Mittel: {1000 * (time.perf_counter() - t0):8.2f} ms  ({len(part['q'])} Zeilen)")
+    t0 = time.perf_counter()
+    peak = np.abs(rec.qd).max()
+    print(f"max |qd| gesamt:         {1000 * (time.perf_counter() - t0):8.2f} ms  ({peak:.3f} rad/s)")
+    return mean
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RTDE-Trajektorien spaltenweise aufzeichnen und lesen")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("record", help="vom Roboter aufzeichnen")
+    robot_backend.add_arguments(p)
+    p.add_argument("--path", default=None, help="Zielverzeichnis (Standard: aufnahme_<Zeit>.rtrec)")
+    p.add_argument("--duration", type=float, default=0.0, help="Dauer in s (0 = bis Strg+C)")
+    p.add_argument("--rate", type=float, default=SAMPLE_RATE, help="Abtastrate in Hz")
+    p = sub.add_parser("info", help="Aufzeichnung öffnen und zusammenfassen")
+    p.add_argument("path")
+    p = sub.add_parser("benchmark", help="synthetische Aufzeichnung schreiben und lesen")
+    p.add_argument("--hours", type=float, default=1.0)
+    p.add_argument("--rate", type=float, default=500.0)
+    p.add_argument("--path", default=None, help="Zielverzeichnis (Standard: temporär, wird danach gelöscht)")
+    p.add_argument("--keep", action="store_true", help="temporäre Benchmark-Daten nicht löschen")
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.backend, args.ip, args.path, args.duration, args.rate)
+    elif args.command == "info":
+        info(args.path)
+    else:
+        benchmark(args.hours, args.rate, args.path, args.keep)
+
+
+if __name__ == "__main__":
+    main()
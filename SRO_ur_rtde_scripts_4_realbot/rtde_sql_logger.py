@@ -0,0 +1,338 @@
+# rtde_sql_logger.py
+# Roboterdaten (Gelenkwinkel, TCP-Pose, TCP-Kraft) über ur_rtde aufzeichnen und in eine
+# SQL-Datenbank schreiben - MySQL/MariaDB (XAMPP, wie in Python2SQL.py) oder lokal SQLite.
+#
+# Warum nicht wie in Python2SQL.py je Datensatz execute() + commit()?
+# Bei 125 Hz wären das 125 Transaktionen pro Sekunde; jede wartet auf die Datenbank
+# (bei SQLite sogar auf die Festplatte). Deshalb:
+#   - Abtast-Thread: liest im festen Takt und hängt nur ein Tupel an einen Puffer im Speicher an
+#   - Schreib-Thread(s): übernehmen volle Puffer (Standard 1000 Zeilen) und schreiben sie mit
+#     EINEM executemany() und EINEM commit()
+#   - die INSERT-Anweisung wird einmal mit Platzhaltern erzeugt und für jeden Block wiederverwendet
+#     (mysql.connector fasst executemany zu einem mehrzeiligen INSERT zusammen)
+#   - Verbindungen kommen aus einem Pool (MySQLConnectionPool bzw. ein einfacher Pool für SQLite)
+# Kommt die Datenbank nicht nach, werden ganze Blöcke verworfen und gezählt, die Abtastung
+# wird nie aufgehalten.
+#
+# Aufruf z.B.:
+#   python rtde_sql_logger.py --ip 192.168.0.17 --backend sqlite --database rtde_log.sqlite --duration 60
+#   python rtde_sql_logger.py --ip 192.168.0.17 --backend mysql --database sro_db
+#   python rtde_sql_logger.py --robot mock --duration 10       (ohne Roboter, kinematischer Mock)
+#   python rtde_sql_logger.py --benchmark 20000      (ohne Roboter: Einzel-Commits vs. Blöcke,
+#                                                     ohne --database in einer temporären SQLite-Datei)
+
+import argparse
+import os
+import queue
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+import robot_backend
+
+TABLE = "rtde_samples"
+COLUMNS = (["session", "robot_time", "wall_time"]
+           + [f"q{i}" for i in range(6)]
+           + ["tcp_x", "tcp_y", "tcp_z", "tcp_rx", "tcp_ry", "tcp_rz"]
+           + ["force_x", "force_y", "force_z", "torque_x", "torque_y", "torque_z"])
+
+SAMPLE_RATE = 125     # Hz
+BATCH_SIZE = 1000     # Zeilen je INSERT-Block
+FLUSH_INTERVAL = 2.0  # s, spätestens dann wird auch ein nicht voller Puffer geschrieben
+
+# Zugangsdaten wie in Python2SQL.py (XAMPP)
+MYSQL_CONFIG = {"host": "localhost", "user": "SRO", "password": "youbot", "database": "sro_db"}
+
+
+class SQLitePool:
+    """Minimaler Verbindungspool für SQLite mit derselben Schnittstelle wie MySQLConnectionPool."""
+
+    def __init__(self, database, pool_size=2):
+        self._connections = queue.Queue()
+        for _ in range(pool_size):
+            connection = sqlite3.connect(database, check_same_thread=False)
+            # WAL: Leser blockieren den Schreiber nicht, weniger fsync je Commit
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._connections.put(connection)
+
+    def get_connection(self):
+        return _PooledSQLiteConnection(self, self._connections.get())
+
+    def _release(self, connection):
+        self._connections.put(connection)
+
+
+class _PooledSQLiteConnection:
+    """Gibt die Verbindung bei close() an den Pool zurück, wie bei mysql.connector.pooling."""
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    def cursor(self):
+        return self._connection.cursor()
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def close(self):
+        if self._connection is not None:
+            self._pool._release(self._connection)
+            self._connection = None
+
+
+def create_pool(backend="sqlite", database="rtde_log.sqlite", pool_size=2, **mysql_config):
+    """Liefert (Pool, Platzhalter) für "sqlite" oder "mysql"."""
+    if backend == "sqlite":
+        return SQLitePool(database, pool_size), "?"
+    if backend == "mysql":
+        from mysql.connector import pooling  # > python -m pip install mysql-connector-python
+        config = dict(MYSQL_CONFIG, **mysql_config)
+        config["database"] = database
+        return pooling.MySQLConnectionPool(pool_name="rtde_logger", pool_size=pool_size, **config), "%s"
+    raise ValueError(f"Unbekanntes Backend {backend}, erlaubt: 'sqlite', 'mysql'")
+
+
+def create_table(pool, backend):
+    """Legt die Tabelle an, falls sie noch nicht existiert."""
+    key = "INTEGER PRIMARY KEY AUTOINCREMENT" if backend == "sqlite" else "BIGINT AUTO_INCREMENT PRIMARY KEY"
+    session = "TEXT" if backend == "sqlite" else "VARCHAR(64)"
+    values = ", ".join(f"{name} DOUBLE" for name in COLUMNS[1:])
+    connection = pool.get_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} (id {key}, session {session}, {values})")
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def insert_statement(placeholder):
+    """Parametrisierte INSERT-Anweisung, wird einmal erzeugt und für alle Blöcke verwendet."""
+    return f"INSERT INTO {TABLE} ({', '.join(COLUMNS)}) VALUES ({', '.join([placeholder] * len(COLUMNS))})"
+
+
+class SQLTelemetryLogger:
+    """Puffert Datensätze im Speicher und schreibt sie blockweise aus einem Verbindungspool."""
+
+    def __init__(self, pool, placeholder, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 writers=1, max_pending_batches=50):
+        self.pool = pool
+        self.sql = insert_statement(placeholder)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._batches = queue.Queue(maxsize=max_pending_batches)
+        self._last_flush = time.monotonic()
+        self._stats_lock = threading.Lock()
+        self.rows_written = 0
+        self.batches_written = 0
+        self.rows_dropped = 0
+        self._writers = [threading.Thread(target=self._write_loop, daemon=True) for _ in range(writers)]
+        for writer in self._writers:
+            writer.start()
+
+    def log(self, row):
+        """Datensatz (Tupel in der Reihenfolge von COLUMNS) übernehmen; blockiert nie."""
+        with self._buffer_lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+        if full or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Aktuellen Puffer als Block an die Schreib-Threads übergeben."""
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, []
+        self._last_flush = time.monotonic()
+        if not batch:
+            return
+        try:
+            self._batches.put_nowait(batch)
+        except queue.Full:
+            with self._stats_lock:
+                self.rows_dropped += len(batch)
+
+    def _write_loop(self):
+        while True:
+            batch = self._batches.get()
+            if batch is None:
+                break
+            connection = None
+            try:
+                connection = self.pool.get_connection()
+                cursor = connection.cursor()
+                cursor.executemany(self.sql, batch)
+                connection.commit()  # ein Commit je Block statt je Datensatz
+                with self._stats_lock:
+                    self.rows_written += len(batch)
+                    self.batches_written += 1
+            except Exception as e:
+                with self._stats_lock:
+                    self.rows_dropped += len(batch)
+                print(f"❌ Schreibfehler ({len(batch)} Zeilen verworfen): {e}")
+                # Rollback/Close können bei abgerissener Verbindung selbst fehlschlagen,
+                # der Schreib-Thread muss trotzdem weiterlaufen
+                if connection is not None:
+                    try:
+                        connection.rollback()
+                    except Exception as rollback_error:
+                        print(f"⚠️ Rollback fehlgeschlagen: {rollback_error}")
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def close(self):
+        """Restpuffer schreiben und Schreib-Threads beenden."""
+        self.flush()
+        for _ in self._writers:
+            self._batches.put(None)
+        for writer in self._writers:
+            writer.join()
+
+
+class RTDESampler(threading.Thread):
+    """Liest Gelenkwinkel, TCP-Pose und TCP-Kraft im festen Takt und übergibt sie dem Logger."""
+
+    def __init__(self, rtde_r, logger, session, rate=SAMPLE_RATE):
+        super().__init__(daemon=True)
+        self.rtde_r = rtde_r
+        self.logger = logger
+        self.session = session
+        self.period = 1.0 / rate
+        self.running = True
+        self.samples = 0
+        self.overruns = 0
+        self.error = None  # Ausnahme, an der die Abtastung abgebrochen ist (z.B. Verbindung weg)
+
+    def run(self):
+        next_time = time.monotonic()
+        try:
+            while self.running:
+                row = (self.session, self.rtde_r.getTimestamp(), time.time(),
+                       *self.rtde_r.getActualQ(), *self.rtde_r.getActualTCPPose(),
+                       *self.rtde_r.getActualTCPForce())
+                self.logger.log(row)
+                self.samples += 1
+                # fester Takt über eine monotone Deadline
+                next_time += self.period
+                delay = next_time - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    self.overruns += 1
+                    next_time = time.monotonic()
+        except Exception as e:
+            # nicht still sterben: record() prüft error und beendet die Aufzeichnung
+            self.error = e
+            self.running = False
+
+    def stop(self):
+        self.running = False
+        self.join()
+
+
+def record(robot_name, ip, backend, database, duration, rate, batch_size):
+    robot = robot_backend.connect(robot_name, address=ip, receive_only=True)
+    robot.require("timestamp", "q", "tcp_pose", "tcp_force")
+    rtde_r = robot.rtde_r
+    pool, placeholder = create_pool(backend, database)
+    create_table(pool, backend)
+    logger = SQLTelemetryLogger(pool, placeholder, batch_size)
+    session = time.strftime("%Y%m%d_%H%M%S")
+    sampler = RTDESampler(rtde_r, logger, session, rate)
+    print(f"📝 Aufzeichnung {session}: {rate} Hz nach {backend}:{database} (Strg+C beendet)")
+    sampler.start()
+    try:
+        t_end = time.monotonic() + duration if duration else None
+        while t_end is None or time.monotonic() < t_end:
+            time.sleep(1.0)
+            if sampler.error is not None:
+                break
+            print(f"{sampler.samples} Abtastungen, {logger.rows_written} Zeilen geschrieben, "
+                  f"{logger.rows_dropped} verworfen, {sampler.overruns} Taktüberschreitungen")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sampler.stop()
+        logger.close()
+        robot.disconnect()
+    if sampler.error is not None:
+        raise SystemExit(f"❌ Abtastung abgebrochen nach {sampler.samples} Abtastungen "
+                         f"({logger.rows_written} Zeilen geschrieben): {sampler.error!r}")
+    print(f"✅ {logger.rows_written} Zeilen in {logger.batches_written} Blöcken geschrieben")
+
+
+def benchmark(rows, backend, database, batch_size):
+    """Vergleich ohne Roboter: ein Commit je Datensatz gegen blockweises Schreiben."""
+    pool, placeholder = create_pool(backend, database)
+    create_table(pool, backend)
+    data = [("benchmark", i / SAMPLE_RATE, time.time()) + tuple(float(i % 100) for _ in COLUMNS[3:])
+            for i in range(rows)]
+
+    connection = pool.get_connection()
+    cursor = connection.cursor()
+    sql = insert_statement(placeholder)
+    single = min(rows, 2000)  # Einzel-Commits sind langsam, daher nur ein Ausschnitt
+    t0 = time.perf_counter()
+    for row in data[:single]:
+        cursor.execute(sql, row)
+        connection.commit()
+    t_single = time.perf_counter() - t0
+    connection.close()
+    print(f"Einzel-Commits: {single / t_single:10.0f} Zeilen/s")
+
+    logger = SQLTelemetryLogger(pool, placeholder, batch_size, max_pending_batches=rows // batch_size + 2)
+    t0 = time.perf_counter()
+    for row in data:
+        logger.log(row)
+    logger.close()
+    t_batch = time.perf_counter() - t0
+    print(f"Blöcke à {batch_size}: {logger.rows_written / t_batch:10.0f} Zeilen/s "
+          f"({logger.batches_written} Blöcke, {logger.rows_dropped} verworfen)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RTDE-Daten gepuffert in SQL aufzeichnen")
+    robot_backend.add_arguments(parser, "--robot")  # --backend wählt hier die Datenbank
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--database", default=None, help="SQLite-Datei bzw. MySQL-Datenbank")
+    parser.add_argument("--duration", type=float, default=0.0, help="Dauer in s (0 = bis Strg+C)")
+    parser.add_argument("--rate", type=float, default=SAMPLE_RATE, help="Abtastrate in Hz")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--benchmark", type=int, default=0, help="nur Schreibleistung mit N Zeilen messen")
+    parser.add_argument("--keep", action="store_true", help="temporäre Benchmark-Datenbank nicht löschen")
+    args = parser.parse_args()
+    if args.benchmark:
+        # nie in die Datei der echten Aufzeichnungen schreiben: ohne --database eine temporäre Datei
+        if args.database:
+            benchmark(args.benchmark, args.backend, args.database, args.batch_size)
+            return
+        if args.backend != "sqlite":
+            parser.error("Benchmark mit MySQL nur mit ausdrücklicher --database (eigene Test-Datenbank)")
+        tmpdir = tempfile.mkdtemp(prefix="rtde_sql_benchmark_")
+        try:
+            benchmark(args.benchmark, args.backend, os.path.join(tmpdir, "rtde_bench.sqlite"), args.batch_size)
+        finally:
+            if args.keep:
+                print(f"Benchmark-Datenbank behalten in {tmpdir}")
+            else:
+                shutil.rmtree(tmpdir, ignore_errors=True)
+                print(f"Benchmark-Datenbank gelöscht ({tmpdir})")
+    else:
+        database = args.database or ("rtde_log.sqlite" if args.backend == "sqlite" else MYSQL_CONFIG["database"])
+        record(args.robot, args.ip, args.backend, database, args.duration, args.rate, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# trajectory_replay.py
+# Gibt eine mit rtde_recording.py aufgezeichnete Trajektorie per servoJ wieder -
+# am echten UR (ur_rtde), im Webots-Simulator (ur_rtde_webot_control_lib) oder gegen den
+# Mock, alle über robot_backend.py und dieselbe Schnittstelle rtde_c.moveJ / servoJ / servoStop.
+#
+# Ablauf:
+#   1. Sollwerte auf ein gleichmäßiges Sende-Raster umrechnen: Sendefrequenz --rate, Zeit
+#      mit --scale gestreckt (0.5 = halbe Geschwindigkeit); Gelenkwinkel linear interpoliert
+#   2. moveJ langsam zum ersten Punkt
+#   3. servoJ-Schleife mit fester Deadline (monotone Uhr, kurz vor der Deadline aktiv warten,
+#      da time.sleep unter Windows nur auf einige ms genau ist)
+#   4. servoStop, Auswertung: Periodendauer, Jitter (Abweichung vom Sendezeitpunkt),
+#      Überläufe, Zykluszeit gegenüber der Sollzeit
+#
+# Mit --save werden die Kennzahlen als JSON gespeichert, mit --compare gegen eine frühere
+# Messung (z.B. Simulator gegen Hardware) verglichen; der Exit-Code ist 1, wenn die
+# Zykluszeit mehr als --tolerance abweicht -> für Regressionstests geeignet.
+#
+# Start:  python trajectory_replay.py aufnahme.rtrec --backend webots --scale 0.5
+#         python trajectory_replay.py aufnahme.rtrec --backend mock
+#         python trajectory_replay.py aufnahme.rtrec --backend ur --ip 192.168.0.17 --save ur.json
+#         python trajectory_replay.py aufnahme.rtrec --backend webots --compare ur.json
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+import robot_backend
+from rtde_recording import TrajectoryRecording
+
+REPLAY_RATE = 125.0       # Hz, Sendefrequenz von servoJ
+LOOKAHEAD_TIME = 0.1      # s, servoJ-Glättung (0.03 .. 0.2)
+GAIN = 300                # servoJ-Proportionalverstärkung (100 .. 2000)
+APPROACH_SPEED = 0.3      # rad/s für moveJ zum Startpunkt
+APPROACH_ACCELERATION = 0.5
+SPIN_TIME = 0.002         # s vor der Deadline aktiv warten statt schlafen
+
+
+def resample(recording, rate=REPLAY_RATE, scale=1.0, t_from=0.0, t_to=None):
+    """Gelenk-Sollwerte auf ein gleichmäßiges Raster mit rate Hz; scale < 1 verlangsamt.
+
+    :return: (Sendezeitpunkte ab Start in s, Sollwerte N x 6)
+    """
+    t_rec = np.asarray(recording.timestamp, dtype=float)
+    t_rec = t_rec - t_rec[0]
+    t_to = t_rec[-1] if t_to is None else min(t_to, t_rec[-1])
+    if t_to <= t_from:
+        raise ValueError("Leerer Zeitbereich für die Wiedergabe")
+    count = int((t_to - t_from) / scale * rate) + 1
+    t_play = np.arange(count) / rate
+    t_source = t_from + t_play * scale
+    q = np.asarray(recording.q)
+    targets = np.column_stack([np.interp(t_source, t_rec, q[:, j]) for j in range(q.shape[1])])
+    return t_play, targets
+
+
+def wait_until(deadline):
+    """Schlafen bis kurz vor der Deadline, den Rest aktiv warten."""
+    remaining = deadline - time.perf_counter()
+    if remaining > SPIN_TIME:
+        time.sleep(remaining - SPIN_TIME)
+    while time.perf_counter() < deadline:
+        pass
+
+
+def jitter_stats(send_times, nominal_times, rate):
+    """Kennzahlen des Sendetakts in ms (Jitter = tatsächlicher minus geplanter Sendezeitpunkt)."""
+    send_times = np.asarray(send_times)
+    nominal_times = np.asarray(nominal_times)
+    lateness = (send_times - send_times[0]) - (nominal_times - nominal_times[0])
+    periods = np.diff(send_times)
+    period = 1.0 / rate
+    return {
+        "samples": int(len(send_times)),
+        "rate": rate,
+        "nominal_cycle_time": float(nominal_times[-1] - nominal_times[0]),
+        "cycle_time": float(send_times[-1] - send_times[0]),
+        "period_mean_ms": 1000.0 * float(periods.mean()) if len(periods) else 0.0,
+        "period_std_ms": 1000.0 * float(periods.std()) if len(periods) else 0.0,
+        "jitter_p50_ms": 1000.0 * float(np.percentile(np.abs(lateness), 50)),
+        "jitter_p99_ms": 1000.0 * float(np.percentile(np.abs(lateness), 99)),
+        "jitter_max_ms": 1000.0 * float(np.abs(lateness).max()),
+        "overruns": int((periods > 1.5 * period).sum()),
+    }
+
+
+class TrajectoryReplay:
+    """Streamt Gelenk-Sollwerte per servoJ mit festem Takt an ein RTDEControlInterface."""
+
+    def __init__(self, rtde_c, rate=REPLAY_RATE, lookahead_time=LOOKAHEAD_TIME, gain=GAIN):
+        self.rtde_c = rtde_c
+        self.rate = rate
+        self.lookahead_time = lookahead_time
+        self.gain = gain
+        self.running = False
+        self.index = 0
+
+    def run(self, t_play, targets, approach=True):
+        """Gibt die Sollwerte wieder und liefert die Jitter-Kennzahlen (siehe jitter_stats)."""
+        if approach:
+            self.rtde_c.moveJ(targets[0].tolist(), APPROACH_SPEED, APPROACH_ACCELERATION)
+        dt = 1.0 / self.rate
+        send_times = np.empty(len(targets))
+        self.running = True
+        t_start = time.perf_counter()
+        try:
+            for self.index in range(len(targets)):
+                if not self.running:
+                    break
+                wait_until(t_start + t_play[self.index])
+                send_times[self.index] = time.perf_counter()
+                self.rtde_c.servoJ(targets[self.index].tolist(), 0.0, 0.0, dt, self.lookahead_time, self.gain)
+            else:
+                self.index = len(targets)
+        finally:
+            self.rtde_c.servoStop()
+            self.running = False
+        sent = self.index
+        if sent < 2:
+            raise RuntimeError("Wiedergabe abgebrochen, bevor Sollwerte gesendet wurden")
+        return jitter_stats(send_times[:sent], t_play[:sent], self.rate)
+
+    def stop(self):
+        """Bricht die Wiedergabe nach dem aktuellen Sollwert ab (z.B. aus einem anderen Thread)."""
+        self.running = False
+
+
+def compare(stats, baseline, tolerance):
+    """Vergleicht Zykluszeit und Jitter mit einer gespeicherten Messung, liefert True wenn ok."""
+    ok = True
+    for key in ("cycle_time", "period_mean_ms", "jitter_p99_ms", "jitter_max_ms", "overruns"):
+        print(f"{key:<20} {baseline.get(key, float('nan')):>10.3f}  ->  {stats[key]:>10.3f}")
+    deviation = abs(stats["cycle_time"] - baseline["cycle_time"]) / baseline["cycle_time"]
+    if deviation > tolerance:
+        print(f"❌ Zykluszeit weicht um {100 * deviation:.2f} % ab (erlaubt {100 * tolerance:.2f} %)")
+        ok = False
+    else:
+        print(f"✅ Zykluszeit innerhalb {100 * tolerance:.2f} % ({100 * deviation:.2f} %)")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aufgezeichnete Trajektorie per servoJ wiedergeben")
+    parser.add_argument("recording", help="Verzeichnis *.rtrec aus rtde_recording.py")
+    robot_backend.add_arguments(parser)
+    parser.add_argument("--rate", type=float, default=REPLAY_RATE, help="Sendefrequenz in Hz")
+    parser.add_argument("--scale", type=float, default=1.0, help="Zeitfaktor, 0.5 = halbe Geschwindigkeit")
+    parser.add_argument("--from", dest="t_from", type=float, default=0.0, help="Start in s der Aufzeichnung")
+    parser.add_argument("--to", dest="t_to", type=float, default=None, help="Ende in s der Aufzeichnung")
+    parser.add_argument("--lookahead", type=float, default=LOOKAHEAD_TIME)
+    parser.add_argument("--gain", type=float, default=GAIN)
+    parser.add_argument("--save", default=None, help="Kennzahlen als JSON speichern")
+    parser.add_argument("--compare", default=None, help="mit gespeicherten Kennzahlen vergleichen")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="erlaubte Abweichung der Zykluszeit")
+    args = parser.parse_args()
+
+    recording = TrajectoryRecording(args.recording)
+    t_play, targets = resample(recording, args.rate, args.scale, args.t_from, args.t_to)
+    print(f"▶️ {len(targets)} Sollwerte, {t_play[-1]:.1f} s bei {args.rate:.0f} Hz (Faktor {args.scale})")
+
+    robot = robot_backend.connect(args.backend, address=args.ip)
+    robot.require("moveJ", "servo")
+    replay = TrajectoryReplay(robot.rtde_c, args.rate, args.lookahead, args.gain)
+    try:
+        stats = replay.run(t_play, targets)
+    except KeyboardInterrupt:
+        replay.stop()
+        print("⏹️ Wiedergabe abgebrochen")
+        return
+    finally:
+        robot.disconnect()
+
+    stats["backend"] = args.backend
+    stats["scale"] = args.scale
+    print(f"Zykluszeit {stats['cycle_time']:.3f} s (Soll {stats['nominal_cycle_time']:.3f} s), "
+          f"Periode {stats['period_mean_ms']:.3f} ± {stats['period_std_ms']:.3f} ms, "
+          f"Jitter p50 {stats['jitter_p50_ms']:.3f} / p99 {stats['jitter_p99_ms']:.3f} / "
+          f"max {stats['jitter_max_ms']:.3f} ms, {stats['overruns']} Überläufe")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare(stats, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
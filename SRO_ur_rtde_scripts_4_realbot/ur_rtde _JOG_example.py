@@ -9,12 +9,19 @@ pygame.mixer.init()
 sound = pygame.mixer.Sound('owin31.wav')
 sound.play()
 
-import rtde_control
+import os
+import sys
 import msvcrt
 import time
 
+sys.path.insert(1, os.path.dirname(os.path.abspath(__file__)))
+import robot_backend
+
 ROBOT_IP = "192.168.0.3"
-rtde_c = rtde_control.RTDEControlInterface("ROBOT_IP")
+robot = robot_backend.connect(ip=ROBOT_IP)
+robot.require("jog")
+rtde_c = robot.rtde_c
+FEATURE_TOOL = getattr(rtde_c, "FEATURE_TOOL", 1)  # ur_rtde-Konstante, der Mock kennt nur die Zahl
 speed_magnitude = 0.15
 speed_vector = [0, 0, 0, 0, 0, 0]
 
@@ -34,7 +41,7 @@ try:
                 break
             else:
                 speed_vector = [0, 0, 0, 0, 0, 0]
-            rtde_c.jogStart(speed_vector, rtde_control.RTDEControlInterface.FEATURE_TOOL)
+            rtde_c.jogStart(speed_vector, FEATURE_TOOL)
         time.sleep(0.02)
 finally:
     rtde_c.jogStop()
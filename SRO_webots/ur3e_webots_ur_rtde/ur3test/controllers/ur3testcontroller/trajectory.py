@@ -0,0 +1,112 @@
+# trajectory.py
+# Bahnplanung für den simulierten UR3e-Controller (ur3testcontroller.py)
+#
+# Geschwindigkeitsprofile entlang einer Strecke:
+#   "trapezoid": konstante Beschleunigung, konstante Geschwindigkeit, konstante Verzögerung
+#   "scurve":    ruckbegrenzte Variante mit sin²-förmigem Beschleunigungsverlauf,
+#                gleiche Maximalbeschleunigung, aber stetige Beschleunigung (kein Ruck-Sprung)
+# Reicht die Strecke nicht, um die Sollgeschwindigkeit zu erreichen, wird das Profil dreieckig.
+#
+# Die Trajektorien werden nicht vorab als Liste berechnet, sondern in jedem Simulationsschritt
+# über sample(t) ausgewertet (Aufwand pro Schritt konstant, Start ohne Verzögerung).
+
+import math
+import os
+import sys
+
+import numpy as np
+
+# Drehvektor-Umrechnung aus der gemeinsamen UR-Kinematik in SRO_Kinematik
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), *[".."] * 5, "SRO_Kinematik"))
+from ur_kinematics import matrix_to_rotvec, rotvec_to_matrix
+
+PROFILE_SHAPES = ("trapezoid", "scurve")
+
+
+class MotionProfile:
+    """Zeitlicher Verlauf s(t) über eine Strecke distance (>= 0) mit Geschwindigkeits- und Beschleunigungsgrenze."""
+
+    def __init__(self, distance, speed, acceleration, shape="trapezoid"):
+        if shape not in PROFILE_SHAPES:
+            raise ValueError(f"Unbekanntes Profil: {shape}")
+        if speed <= 0 or acceleration <= 0:
+            raise ValueError("speed und acceleration müssen positiv sein")
+        self.distance = abs(float(distance))
+        self.shape = shape
+        # Mittlere Beschleunigung der Anfahrphase; beim S-Profil ist sie halb so groß wie die Spitze
+        a_mean = acceleration if shape == "trapezoid" else acceleration / 2.0
+        self.acceleration = acceleration
+        self.v_peak = min(speed, math.sqrt(self.distance * a_mean))
+        self.t_acc = self.v_peak / a_mean if self.v_peak > 0 else 0.0
+        d_acc = self.v_peak * self.t_acc / 2.0
+        self.t_const = (self.distance - 2.0 * d_acc) / self.v_peak if self.v_peak > 0 else 0.0
+        self.duration = 2.0 * self.t_acc + self.t_const
+        self._d_acc = d_acc
+
+    def _ramp(self, t):
+        """Zurückgelegter Weg in der Anfahrphase nach der Zeit t (0 <= t <= t_acc)."""
+        if self.shape == "trapezoid":
+            return 0.5 * self.v_peak / self.t_acc * t * t
+        k = self.t_acc / (2.0 * math.pi)
+        return 0.5 * self.acceleration * (0.5 * t * t + k * k * (math.cos(t / k) - 1.0))
+
+    def position(self, t):
+        """Weg s(t) im Bereich [0, distance]."""
+        if self.duration <= 0 or t >= self.duration:
+            return self.distance
+        if t <= 0:
+            return 0.0
+        if t < self.t_acc:
+            return self._ramp(t)
+        if t <= self.t_acc + self.t_const:
+            return self._d_acc + self.v_peak * (t - self.t_acc)
+        # Bremsphase spiegelbildlich zur Anfahrphase
+        return self.distance - self._ramp(self.duration - t)
+
+    def fraction(self, t):
+        """Normierter Fortschritt s(t)/distance im Bereich [0, 1]."""
+        if self.distance == 0:
+            return 1.0
+        return self.position(t) / self.distance
+
+
+class JointTrajectory:
+    """Synchrone Gelenkbewegung (moveJ): die Achse mit dem größten Weg bestimmt das Profil,
+    alle anderen Achsen laufen anteilig mit und erreichen das Ziel gleichzeitig."""
+
+    def __init__(self, q_start, q_target, speed, acceleration, shape="trapezoid"):
+        self.q_start = np.asarray(q_start, dtype=float)
+        self.q_target = np.asarray(q_target, dtype=float)
+        self.delta = self.q_target - self.q_start
+        self.profile = MotionProfile(np.max(np.abs(self.delta)), speed, acceleration, shape)
+        self.duration = self.profile.duration
+
+    def sample(self, t):
+        return (self.q_start + self.profile.fraction(t) * self.delta).tolist()
+
+
+class CartesianTrajectory:
+    """Geradlinige TCP-Bewegung (moveL): Position linear, Orientierung per Drehung um eine feste Achse.
+
+    Für Positionsweg (m) und Drehwinkel (rad) wird je ein Profil mit speed/acceleration gerechnet
+    (für die Drehung als rad/s bzw. rad/s²); das längere bestimmt die Dauer, beide Anteile laufen
+    synchron. So bleibt auch bei kleinem Weg und großer Umorientierung die Drehrate begrenzt.
+    """
+
+    def __init__(self, pose_start, pose_target, speed, acceleration, shape="trapezoid"):
+        pose_start = np.asarray(pose_start, dtype=float)
+        pose_target = np.asarray(pose_target, dtype=float)
+        self.p_start = pose_start[:3]
+        self.p_delta = pose_target[:3] - self.p_start
+        self.R_start = rotvec_to_matrix(pose_start[3:])
+        self.rot_delta = matrix_to_rotvec(self.R_start.T @ rotvec_to_matrix(pose_target[3:]))
+        translation = MotionProfile(np.linalg.norm(self.p_delta), speed, acceleration, shape)
+        rotation = MotionProfile(np.linalg.norm(self.rot_delta), speed, acceleration, shape)
+        self.profile = max(translation, rotation, key=lambda profile: profile.duration)
+        self.duration = self.profile.duration
+
+    def sample(self, t):
+        s = self.profile.fraction(t)
+        position = self.p_start + s * self.p_delta
+        rotation = self.R_start @ rotvec_to_matrix(s * self.rot_delta)
+        return np.concatenate((position, matrix_to_rotvec(rotation))).tolist()
@@ -1,11 +1,29 @@
 from controller import Robot
-import socket
+import asyncio
+import os
+import sys
 import threading
-import json
+from collections import deque
+
+from rtde_protocol import FrameDecoder, ProtocolError, encode_message
+from trajectory import CartesianTrajectory, JointTrajectory
+
+# Analytische UR-Kinematik aus SRO_Kinematik im Repository einbinden
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), *[".."] * 5, "SRO_Kinematik"))
+import ur_kinematics
 
 # RTDE-Schnittstellenparameter
 SERVER_HOST = "0.0.0.0"  # Nicht die Adresse des  Clients 127.0.0.1
 SERVER_PORT = 30010
+ROBOT_TYPE = "UR3e"  # DH-Parameter für die Kinematik
+MAX_STREAM_BACKLOG = 64 * 1024  # Bytes im Sendepuffer, ab denen Stream-Frames verworfen werden
+
+# Bahnplanung: Geschwindigkeitsprofil und Standardwerte wie bei ur_rtde
+TRAJECTORY_PROFILE = "trapezoid"  # oder "scurve" (ruckbegrenzt)
+MOVEJ_SPEED = 1.05         # rad/s
+MOVEJ_ACCELERATION = 1.4   # rad/s^2
+MOVEL_SPEED = 0.25         # m/s
+MOVEL_ACCELERATION = 1.2   # m/s^2
 
 # Initialisiere den Webots-Roboter
 robot = Robot()
@@ -33,110 +51,265 @@ for name in joint_names:
         sensor.enable(timestep)
         sensors[name] = sensor
 
-# Globale Variablen
-current_joint_angles = [0.0] * len(joint_names)
-target_joint_angles = None
-lock = threading.Lock()
+# Übergabe zwischen Netzwerk-Thread und Webots-Hauptschleife ohne gemeinsames Lock:
+# - command_queue: deque.append/popleft sind atomar, der Server legt Befehle ab,
+#   die Hauptschleife holt sie in jedem Schritt ab
+# - latest_state: wird von der Hauptschleife als neues Tupel ersetzt (atomare Zuweisung),
+#   der Server liest immer einen konsistenten Stand
+command_queue = deque()
+latest_state = (0, 0.0, [0.0] * len(joint_names))  # (Schritt, Simulationszeit, Gelenkwinkel)
+# Jede Bewegung bekommt eine fortlaufende Nummer; die Hauptschleife meldet die zuletzt beendete
+motion_counter = 0
+finished_motion_id = 0
 
-# Dummy-Inverse-Kinematik (hier: kartesische Pose direkt als Gelenkwinkel)
-def inverse_kinematics(cartesian_pose):
+# Netzwerkseite (nur im Server-Thread verwendet)
+server_loop = None
+subscribers = {}  # writer -> (period_steps, legacy)
+
+# Inverse Kinematik: von den bis zu 8 Lösungen die nächstgelegene zu q_seed wählen
+def inverse_kinematics(cartesian_pose, q_seed=None):
     if len(cartesian_pose) != 6:
         return None
-    return cartesian_pose  # dummy: einfach zurückgeben
+    solutions, valid = ur_kinematics.inverse_kinematics(cartesian_pose, ROBOT_TYPE)
+    if not valid.any():
+        return None
+    if q_seed is None:
+        q_seed = latest_state[2]
+    q, _ = ur_kinematics.nearest_solution(solutions, valid, q_seed)
+    return q[0].tolist()
+
+# Vorwärtskinematik (Startpose für moveL, getActualTCPPose)
+def forward_kinematics(joint_angles):
+    return ur_kinematics.forward_kinematics(joint_angles, ROBOT_TYPE).tolist()
+
+def _positive_number(value, default):
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        return float(value)
+    return default
+
+def queue_motion(kind, target, speed, acceleration):
+    """Übergibt eine Bewegung an die Hauptschleife und liefert ihre Nummer."""
+    global motion_counter
+    motion_counter += 1
+    command_queue.append((kind, target, speed, acceleration, motion_counter))
+    return motion_counter
 
 # Netzwerkkommunikation
-def handle_client(conn, addr):
+def process_request(request):
+    """Bearbeitet eine dekodierte Anfrage und liefert (Antwort, Verbindung_beenden)."""
+    command = request.get("command")
+    response = {}
+
+    if command == "getActualQ":
+        response = {"data": list(latest_state[2])}
+
+    elif command == "getActualTCPPose":
+        response = {"data": forward_kinematics(latest_state[2])}
+
+    elif command == "moveJ":
+        joint_targets = request.get("data")
+        if isinstance(joint_targets, list) and len(joint_targets) == 6:
+            speed = _positive_number(request.get("speed"), MOVEJ_SPEED)
+            acceleration = _positive_number(request.get("acceleration"), MOVEJ_ACCELERATION)
+            motion_id = queue_motion("moveJ", list(joint_targets), speed, acceleration)
+            response = {"info": "moveJ akzeptiert", "target_q": joint_targets, "motion_id": motion_id}
+        else:
+            response = {"error": "Ungültige Gelenkwinkel für moveJ"}
+
+    elif command == "moveL":
+        data = request.get("data", {})
+        pose = data.get("pose")
+        speed = _positive_number(data.get("speed"), MOVEL_SPEED)
+        acceleration = _positive_number(data.get("acceleration"), MOVEL_ACCELERATION)
+        if isinstance(pose, list) and len(pose) == 6:
+            ik_solution = inverse_kinematics(pose)
+            if ik_solution:
+                motion_id = queue_motion("moveL", list(pose), speed, acceleration)
+                response = {
+                    "info": "moveL akzeptiert",
+                    "target_q": ik_solution,
+                    "speed": speed,
+                    "acceleration": acceleration,
+                    "motion_id": motion_id
+                }
+            else:
+                response = {"error": "IK konnte keine Lösung finden"}
+        else:
+            response = {"error": "Ungültige Pose für moveL"}
+
+    elif command == "servoJ":
+        # Sollwert direkt im nächsten Schritt übernehmen (ohne Bahnplanung), ersetzt laufende Bahnen
+        joint_targets = request.get("data")
+        if isinstance(joint_targets, list) and len(joint_targets) == 6:
+            command_queue.append(("servoJ", list(joint_targets), None, None, None))
+            response = {"info": "servoJ akzeptiert", "time": latest_state[1]}
+        else:
+            response = {"error": "Ungültige Gelenkwinkel für servoJ"}
+
+    elif command == "servoStop":
+        command_queue.append(("servoStop", None, None, None, None))
+        response = {"info": "servoStop akzeptiert"}
+
+    elif command == "isSteady":
+        finished = finished_motion_id
+        response = {"steady": finished >= motion_counter, "finished_motion_id": finished}
+
+    elif command == "disconnect":
+        return {"info": "Verbindung getrennt"}, True
+
+    else:
+        response = {"error": f"Unbekannter Befehl: {command}"}
+
+    return response, False
+
+def subscribe(writer, request, legacy):
+    """Meldet einen Client für den Zustands-Stream an."""
+    data = request.get("data") or {}
+    frequency = data.get("frequency", 1000.0 / timestep) if isinstance(data, dict) else None
+    if not isinstance(frequency, (int, float)) or frequency <= 0:
+        return {"error": "Ungültige Frequenz für subscribe"}
+    # Schneller als der Simulationstakt kann nicht gestreamt werden
+    period_steps = max(1, round(1000.0 / (frequency * timestep)))
+    subscribers[writer] = (period_steps, legacy)
+    return {
+        "info": "subscribe akzeptiert",
+        "frequency": 1000.0 / (period_steps * timestep),
+        "period_steps": period_steps,
+    }
+
+def publish_state(state):
+    """Verteilt einen neuen Zustand an alle Abonnenten (läuft im Server-Thread)."""
+    step, sim_time, q = state
+    frames = {}
+    for writer, (period_steps, legacy) in list(subscribers.items()):
+        if step % period_steps:
+            continue
+        if writer.is_closing():
+            subscribers.pop(writer, None)
+            continue
+        # Langsame Clients bekommen Frames nicht gepuffert, sondern verpassen sie
+        if writer.transport.get_write_buffer_size() > MAX_STREAM_BACKLOG:
+            continue
+        if legacy not in frames:
+            frames[legacy] = encode_message({"state": "actualQ", "time": sim_time, "data": q}, legacy=legacy)
+        writer.write(frames[legacy])
+
+async def handle_client(reader, writer):
+    addr = writer.get_extra_info("peername")
     print(f"🔗 Neue RTDE-Verbindung von {addr}")
+    decoder = FrameDecoder()
     try:
         while True:
-            data = conn.recv(4096)
+            data = await reader.read(65536)
             if not data:
                 break
             try:
-                request = json.loads(data.decode("utf-8"))
-            except json.JSONDecodeError:
-                response = {"error": "Ungültiges JSON"}
-                conn.sendall(json.dumps(response).encode("utf-8"))
-                continue
-
-            command = request.get("command")
-            response = {}
-
-            if command == "getActualQ":
-                with lock:
-                    response = {"data": current_joint_angles.copy()}
-
-            elif command == "moveJ":
-                joint_targets = request.get("data")
-                if isinstance(joint_targets, list) and len(joint_targets) == 6:
-                    with lock:
-                        global target_joint_angles
-                        target_joint_angles = joint_targets.copy()
-                    response = {"info": "moveJ akzeptiert", "target_q": joint_targets}
-                else:
-                    response = {"error": "Ungültige Gelenkwinkel für moveJ"}
-
-            elif command == "moveL":
-                data = request.get("data", {})
-                pose = data.get("pose")
-                speed = data.get("speed", 0.5)
-                acceleration = data.get("acceleration", 0.3)
-                if isinstance(pose, list) and len(pose) == 6:
-                    ik_solution = inverse_kinematics(pose)
-                    if ik_solution:
-                        with lock:
-                            target_joint_angles = ik_solution.copy()
-                        response = {
-                            "info": "moveL akzeptiert (dummy IK)",
-                            "target_q": ik_solution,
-                            "speed": speed,
-                            "acceleration": acceleration
-                        }
-                    else:
-                        response = {"error": "IK konnte keine Lösung finden"}
-                else:
-                    response = {"error": "Ungültige Pose für moveL"}
-
-            elif command == "disconnect":
-                response = {"info": "Verbindung getrennt"}
-                conn.sendall(json.dumps(response).encode("utf-8"))
+                requests = decoder.feed(data)
+            except (ProtocolError, ValueError):
+                writer.write(encode_message({"error": "Ungültige Nachricht"}, legacy=decoder.legacy))
+                await writer.drain()
                 break
 
-            else:
-                response = {"error": f"Unbekannter Befehl: {command}"}
-
-            conn.sendall(json.dumps(response).encode("utf-8"))
+            # Alle vollständig empfangenen Anfragen beantworten, Antworten gesammelt senden
+            replies = []
+            close = False
+            for request in requests:
+                command = request.get("command")
+                if command == "subscribe":
+                    response = subscribe(writer, request, decoder.legacy)
+                elif command == "unsubscribe":
+                    subscribers.pop(writer, None)
+                    response = {"info": "unsubscribe akzeptiert"}
+                else:
+                    response, close = process_request(request)
+                replies.append(encode_message(response, legacy=decoder.legacy))
+                if close:
+                    break
+            if replies:
+                writer.write(b"".join(replies))
+                await writer.drain()  # blockiert nur diesen Client, nicht die Simulation
+            if close:
+                break
 
     except Exception as e:
         print(f"❌ Fehler mit {addr}: {e}")
     finally:
-        conn.close()
+        subscribers.pop(writer, None)
+        writer.close()
         print(f"❌ Verbindung zu {addr} geschlossen")
 
-def server_thread():
-    server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server_sock.bind((SERVER_HOST, SERVER_PORT))
-    server_sock.listen()
+async def serve():
+    global server_loop
+    server_loop = asyncio.get_running_loop()
+    server = await asyncio.start_server(handle_client, SERVER_HOST, SERVER_PORT, reuse_address=True)
     print(f"🚀 RTDE-Server aktiv auf {SERVER_HOST}:{SERVER_PORT}")
-    while True:
-        conn, addr = server_sock.accept()
-        threading.Thread(target=handle_client, args=(conn, addr), daemon=True).start()
+    async with server:
+        await server.serve_forever()
+
+def server_thread():
+    # Ein einziger Thread mit Event-Loop bedient alle Clients (GUIs, Logger, Test-Clients)
+    asyncio.run(serve())
 
 # Starte TCP-Server-Thread
 threading.Thread(target=server_thread, daemon=True).start()
 
+def start_trajectory(kind, target, speed, acceleration, q_start):
+    if kind == "moveJ":
+        return JointTrajectory(q_start, target, speed, acceleration, TRAJECTORY_PROFILE)
+    return CartesianTrajectory(forward_kinematics(q_start), target, speed, acceleration, TRAJECTORY_PROFILE)
+
 # Webots-Hauptschleife
+step = 0
+commanded_q = None      # zuletzt vorgegebener Sollwert (Start für neue Bahnen)
+trajectory = None       # aktive Bahn, wird pro Schritt über sample(t) abgetastet
+trajectory_kind = None
+trajectory_start = 0.0
+trajectory_id = 0
 while robot.step(timestep) != -1:
-    # Gelenkwinkel auslesen
-    with lock:
-        current_joint_angles = [
-            sensors[name].getValue() if name in sensors else 0.0
-            for name in joint_names
-        ]
-
-        # Zielgelenkwinkel setzen
-        if target_joint_angles:
-            for name, angle in zip(joint_names, target_joint_angles):
+    step += 1
+    current_joint_angles = [
+        sensors[name].getValue() if name in sensors else 0.0
+        for name in joint_names
+    ]
+    if commanded_q is None:
+        commanded_q = current_joint_angles
+
+    # Neue Befehle übernehmen; eine neue Bahn ersetzt die laufende (diese gilt als beendet)
+    while command_queue:
+        kind, target, speed, acceleration, motion_id = command_queue.popleft()
+        finished_motion_id = trajectory_id
+        if kind in ("servoJ", "servoStop"):
+            # servoJ: mehrere Sollwerte innerhalb eines Schritts -> der letzte gilt
+            trajectory = None
+            if kind == "servoJ":
+                for name, angle in zip(joint_names, target):
+                    if name in motors:
+                        motors[name].setPosition(angle)
+                commanded_q = target
+            continue
+        trajectory = start_trajectory(kind, target, speed, acceleration, commanded_q)
+        trajectory_kind = kind
+        trajectory_start = robot.getTime()
+        trajectory_id = motion_id
+
+    # Sollwert für das Ende des nächsten Schritts aus der Bahn abtasten
+    if trajectory is not None:
+        t = robot.getTime() - trajectory_start + timestep / 1000.0
+        sample = trajectory.sample(t)
+        q = sample if trajectory_kind == "moveJ" else inverse_kinematics(sample, commanded_q)
+        if q is None:
+            print(f"⚠️ moveL abgebrochen: keine IK-Lösung für {sample}")
+            t = trajectory.duration
+        else:
+            for name, angle in zip(joint_names, q):
                 if name in motors:
                     motors[name].setPosition(angle)
-            target_joint_angles = None
+            commanded_q = list(q)
+        if t >= trajectory.duration:
+            trajectory = None
+            finished_motion_id = trajectory_id
+
+    # Gelenkwinkel für Server und Abonnenten bereitstellen
+    latest_state = (step, robot.getTime(), current_joint_angles)
+    if subscribers and server_loop is not None:
+        server_loop.call_soon_threadsafe(publish_state, latest_state)
@@ -1,21 +1,26 @@
 import socket
-import json
+import os
+import sys
+
+# Das Protokollmodul liegt beim Webots-Controller, der auch den Server stellt
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "controllers", "ur3testcontroller"))
+from rtde_protocol import FramedConnection
 
 class RTDEControlInterface:
-    def __init__(self, ip, port=30010):
+    def __init__(self, ip, port=30010, binary=True):
         self.ip = ip
         self.port = port
         self.sock = socket.create_connection((ip, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.conn = FramedConnection(self.sock, binary=binary)
         print(f"📡 Verbindung zu RTDE-Control-Schnittstelle unter {ip}:{port} hergestellt")
 
-    def moveJ(self, joint_angles):
-        message = json.dumps({"command": "moveJ", "data": joint_angles})
-        self.sock.sendall(message.encode("utf-8"))
-        response = self.sock.recv(4096).decode("utf-8")
-        return json.loads(response)
+    def moveJ(self, joint_angles, speed=1.05, acceleration=1.4):
+        return self.conn.request({"command": "moveJ", "data": joint_angles,
+                                  "speed": speed, "acceleration": acceleration})
 
     def moveL(self, cartesian_pose, speed=0.5, acceleration=0.3):
-        message = json.dumps({
+        return self.conn.request({
             "command": "moveL",
             "data": {
                 "pose": cartesian_pose,
@@ -23,12 +28,15 @@ class RTDEControlInterface:
                 "acceleration": acceleration
             }
         })
-        self.sock.sendall(message.encode("utf-8"))
-        response = self.sock.recv(4096).decode("utf-8")
-        return json.loads(response)
+
+    def servoJ(self, joint_angles, speed=0.0, acceleration=0.0, time=0.008, lookahead_time=0.1, gain=300):
+        # Signatur wie ur_rtde; der Simulator übernimmt den Sollwert direkt im nächsten Schritt
+        return self.conn.request({"command": "servoJ", "data": list(joint_angles)})
+
+    def servoStop(self, a=10.0):
+        return self.conn.request({"command": "servoStop"})
 
     def disconnect(self):
-        message = json.dumps({"command": "disconnect"})
-        self.sock.sendall(message.encode("utf-8"))
+        self.conn.request({"command": "disconnect"})
         self.sock.close()
         print("🔌 Verbindung zur RTDE-Control-Schnittstelle getrennt")
@@ -1,13 +1,20 @@
 # sim_rtde_receive.py
 
 import socket
-import json
+import os
+import sys
+
+# Das Protokollmodul liegt beim Webots-Controller, der auch den Server stellt
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "controllers", "ur3testcontroller"))
+from rtde_protocol import FramedConnection
 
 class RTDEReceiveInterface:
-    def __init__(self, ip, port=30010):
+    def __init__(self, ip, port=30010, binary=True):
         self.ip = ip
         self.port = port
         self.sock = socket.create_connection((ip, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.conn = FramedConnection(self.sock, binary=binary)
         print(f"📡 Verbindung zu Sim-RTDE-Server unter {ip}:{port} hergestellt")
 
     def getActualQ(self):
@@ -16,13 +23,12 @@ class RTDEReceiveInterface:
 
     def disconnect(self):
         self._send_command("disconnect")
+        self._receive_response()
         self.sock.close()
         print("🔌 Verbindung zum Sim-RTDE-Server getrennt")
 
     def _send_command(self, command):
-        message = json.dumps({"command": command})
-        self.sock.sendall(message.encode("utf-8"))
+        self.conn.send({"command": command})
 
     def _receive_response(self):
-        data = self.sock.recv(4096).decode("utf-8")
-        return json.loads(data).get("data", [])
\ No newline at end of file
+        return self.conn.receive().get("data", [])
\ No newline at end of file
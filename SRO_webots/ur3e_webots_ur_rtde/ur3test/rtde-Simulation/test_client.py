@@ -12,13 +12,13 @@ rtde_c = rtde_control.RTDEControlInterface(UR3_IP)
 actual_q = rtde_r.getActualQ()
 print(f"📍 Aktuelle Gelenkposition: {actual_q}\n")
 
-# Liste von kartesischen Zielposen (Dummy → direkt als joint angles interpretiert)
+# Liste von kartesischen Zielposen [x, y, z, rx, ry, rz] in m / rad, Werkzeug zeigt nach unten
 moveL_ziele = [
-    [-0.5, -1.0, 0.50, 0.0, 3.1, 0.0],   # weiter hinten, höher
-    [-0.2, -0.8, 0.55, 0.0, 3.1, 0.2],   # leicht gedreht
-    [ 0.0, -0.6, 0.45, 0.0, 3.1, -0.1],  # zentral
-    [ 0.3, -1.1, 0.50, 0.0, 3.0, 0.3],   # deutlich rechts
-    [-0.3, -0.7, 0.40, 0.0, 3.2, 0.1],   # links vorne unten
+    [-0.30, -0.20, 0.30, 0.0, 3.14, 0.0],   # links hinten, höher
+    [-0.25, -0.30, 0.25, 0.0, 3.14, 0.0],   # weiter vorne
+    [ 0.00, -0.35, 0.20, 0.0, 3.14, 0.0],   # zentral
+    [ 0.20, -0.30, 0.25, 0.0, 3.14, 0.0],   # deutlich rechts
+    [-0.15, -0.25, 0.15, 0.0, 3.14, 0.0],   # links vorne unten
 ]
 
 # Bewegungen ausführen
@@ -2,16 +2,23 @@
 
 
 import sys
-import json
-import socket
+import os
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import Qt, QTimer
 import math as m
 
+# Roboterzugang über robot_backend (Standard hier: Webots, mit SRO_ROBOT_BACKEND auch mock oder ur)
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SRO_ur_rtde_scripts_4_realbot"))
+import robot_backend
+
+STREAM_FREQUENCY = 125  # Hz, Zustand wird vom Server gepusht
+
 class RobotControlGUI(QWidget):
     def __init__(self):
         super().__init__()
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.robot = None
+        self.gripper = None
+        self.update_timer = None
         self.current_angles = [0.0] * 6
         self.initUI()
         self.connect_to_robot()
@@ -85,43 +92,57 @@ class RobotControlGUI(QWidget):
 
     def connect_to_robot(self):
         try:
-            self.sock.connect(('localhost', 30010))
-            self.status_label.setText("Verbunden mit Roboter")
+            robot = robot_backend.connect(os.environ.get("SRO_ROBOT_BACKEND", "webots"))
+            robot.require("moveJ", "q")
+            self.robot = robot
+            if self.robot.name != "webots":
+                # Webots steuert den Greifer über eigene Befehle, sonst Robotiq-Greifer (bzw. Emulator)
+                self.gripper = self.robot.connect_gripper()
+                if self.gripper is not None:
+                    self.gripper.activate()
+            self.status_label.setText(f"Verbunden mit Roboter ({self.robot.name})")
             self.status_label.setStyleSheet("color: green")
 
+            # Zustands-Stream, die Anzeige liest nur noch den Ringpuffer
+            if self.robot.has("streaming"):
+                self.robot.rtde_r.startStreaming(STREAM_FREQUENCY)
+
             self.request_current_angles()
             self.update_timer = QTimer()
             self.update_timer.timeout.connect(self.request_current_angles)
-            self.update_timer.start(500)
-        except socket.error as e:
+            self.update_timer.start(50)
+        except (OSError, RuntimeError) as e:
             self.status_label.setText(f"Verbindungsfehler: {str(e)}")
             self.status_label.setStyleSheet("color: red")
 
+    def gripper_command(self, command, position):
+        if self.robot is None:
+            return None
+        if self.robot.name == "webots":
+            return self.robot.rtde_c.conn.request({"command": command})
+        if self.gripper is None:
+            raise RuntimeError("kein Greifer verbunden")
+        return self.gripper.move(position, 255, 100)
+
     def open_gripper(self):
         try:
-            self.sock.sendall(json.dumps({"command": "openGripper"}).encode('utf-8'))
-            response = self.sock.recv(4096)
-            print("🟢 Greifer öffnen gesendet. Antwort:", response.decode())
+            response = self.gripper_command("openGripper", 0)
+            print("🟢 Greifer öffnen gesendet. Antwort:", response)
         except Exception as e:
             print("⚠️ Fehler beim Öffnen des Greifers:", e)
 
     def close_gripper(self):
         try:
-            self.sock.sendall(json.dumps({"command": "closeGripper"}).encode('utf-8'))
-            response = self.sock.recv(4096)
-            print("🔴 Greifer schließen gesendet. Antwort:", response.decode())
+            response = self.gripper_command("closeGripper", 255)
+            print("🔴 Greifer schließen gesendet. Antwort:", response)
         except Exception as e:
             print("⚠️ Fehler beim Schließen des Greifers:", e)
 
     def request_current_angles(self):
         try:
-            cmd = json.dumps({"command": "getActualQ"})
-            self.sock.sendall(cmd.encode('utf-8'))
-            response = self.sock.recv(4096)
-            data = json.loads(response.decode())
-            if 'data' in data:
-                self.current_angles = data['data']
-                self.update_sliders()
+            # kein Netzwerk-Roundtrip: neuester Eintrag aus dem Stream-Puffer
+            self.current_angles = list(self.robot.rtde_r.getActualQ())
+            self.update_sliders()
         except Exception as e:
             print("Abfragefehler:", str(e))
 
@@ -141,22 +162,23 @@ class RobotControlGUI(QWidget):
         self.send_joint_command()
 
     def send_joint_command(self):
+        if self.robot is None:
+            return
         speed_val = self.ur_speed_slider.value() / 100.0
-        command = {
-            "command": "moveJ",
-            "data": self.current_angles.copy(),
-            "speed": speed_val
-        }
         try:
-            self.sock.sendall(json.dumps(command).encode('utf-8'))
-            response = self.sock.recv(4096)
-            print("Serverantwort:", response.decode())
+            # asynchron, damit das GUI beim Ziehen der Slider nicht blockiert
+            response = self.robot.rtde_c.moveJ(self.current_angles.copy(), speed_val, 1.4, True)
+            print("Serverantwort:", response)
         except Exception as e:
             print("Kommunikationsfehler:", str(e))
 
     def closeEvent(self, event):
-        self.sock.close()
-        self.update_timer.stop()
+        if self.update_timer is not None:
+            self.update_timer.stop()
+        if self.robot:
+            if self.gripper is not None:
+                self.gripper.disconnect()
+            self.robot.disconnect()
         event.accept()
 
 if __name__ == '__main__':
@@ -5,13 +5,15 @@
 # https://github.com/githubuser0xFFFF/py_robotiq_gripper/tree/master
 # https://sdurobotics.gitlab.io/ur_rtde/examples/examples.html
 
-import rtde_control  # > pip install ur-rtde  ggf. pip iupdaten mit > python.exe -m pip install --upgrade pip
-import rtde_receive
 # import rtde_io
-import robotiq_gripper
 # import time
 
+import os
 import sys
+# Roboter-Backend: ur_rtde, Webots oder Mock (Auswahl über SRO_ROBOT_BACKEND)
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..",
+                                "SRO_ur_rtde_scripts_4_realbot"))
+import robot_backend
 from PyQt6 import QtWidgets, QtCore # ggf. pip install PyQt6
 from PyQt6.QtWidgets import QMainWindow
 from PyQt6.QtCore import QSize   
@@ -23,10 +25,10 @@ ROBOT_IP = "192.168.0.3"
 class MainWindow(QMainWindow):
     def __init__(self):
         QMainWindow.__init__(self)
-        self.rtde_c = rtde_control.RTDEControlInterface(ROBOT_IP)
-        self.rtde_r = rtde_receive.RTDEReceiveInterface(ROBOT_IP)
-        self.gripper = robotiq_gripper.RobotiqGripper()
-        self.gripper.connect(ROBOT_IP, 63352)
+        self.robot = robot_backend.connect(ip=ROBOT_IP)
+        self.rtde_c = self.robot.rtde_c
+        self.rtde_r = self.robot.rtde_r
+        self.gripper = self.robot.connect_gripper()  # None, wenn das Backend keinen Greifer hat (webots)
 
         self.setMinimumSize(QSize(400, 400))    
         self.setWindowTitle("SRO - Universal Robot GUI")
@@ -114,15 +116,30 @@ class MainWindow(QMainWindow):
         self.lbl_pose_complete.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
         self.lbl_pose_complete.move(5, 300)
 
+        # Bedienelemente sperren, die das gewählte Backend nicht unterstützt
+        if self.gripper is None:
+            self.btn_grp_open.setEnabled(False)
+            self.btn_grp_close.setEnabled(False)
+            self.lbl_gripper.setText("kein Greifer")
+        if not self.robot.has("teach_mode"):
+            self.btn_teachOn.setEnabled(False)
+
+    def stopScript(self):
+        # der Webots-Simulator hat kein Roboterprogramm, das beendet werden müsste
+        if hasattr(self.rtde_c, "stopScript"):
+            self.rtde_c.stopScript()
+
     def __del__(self):  # Destruktor
         print("Destruktor ")
-        self.rtde_c.stopScript()
+        self.stopScript()
     
     def closeEvent(self, event):
         print("Close Event ")
-        self.rtde_c.stopScript()
+        self.stopScript()
 
     def log_info(self ):
+        if self.gripper is None:
+            return
         print(f"Pos: {str(self.gripper.get_current_position()): >3}  "
               f"Open: {self.gripper.is_open(): <2}  "
               f"Closed: {self.gripper.is_closed(): <2}  ")
@@ -149,6 +166,8 @@ class MainWindow(QMainWindow):
                                        + str(round(self.pose[5], 3)) + ' ' )
 
         self.log_info()
+        if self.gripper is None:
+            return
         grpr_pos = self.gripper.get_current_position()
         # self.lbl_gripper.setText('Gripper: ' + str(grpr_pos))
         if grpr_pos < 10:
@@ -247,6 +266,8 @@ class MainWindow(QMainWindow):
 
     def grpOpenSlot(self):
         print('Open Gripper')
+        if self.gripper is None:
+            return
         self.grpInfo()
         # öffnet den Greifer
         grp_pos = self.gripper.get_current_position()
@@ -255,6 +276,8 @@ class MainWindow(QMainWindow):
 
     def grpCloseSlot(self):
         print('Close Gripper')
+        if self.gripper is None:
+            return
         self.grpInfo()
         grp_pos = self.gripper.get_current_position()
         self.gripper.move_and_wait_for_pos(grp_pos+10, 255, 255)
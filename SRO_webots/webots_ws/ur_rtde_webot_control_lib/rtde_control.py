@@ -1,27 +1,50 @@
-
 import socket
-import json
+import time
+
+from rtde_protocol import FramedConnection
 
 class RTDEControlInterface:
-    def __init__(self, ip, port=30010):
+    def __init__(self, ip, port=30010, binary=True):
         self.ip = ip
         self.port = port
         self.sock = socket.create_connection((ip, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.conn = FramedConnection(self.sock, binary=binary)
         print(f"📡 Verbindung zu RTDE-Control-Schnittstelle unter {ip}:{port} hergestellt")
 
     def _send_command(self, command, data=None):
         message = {"command": command}
         if data:
             message["data"] = data
-        self.sock.sendall(json.dumps(message).encode("utf-8"))
-        response = self.sock.recv(4096).decode("utf-8")
-        return json.loads(response)
+        return self.conn.request(message)
+
+    def _wait_for_motion(self, response, poll_interval=0.002):
+        # Wie bei ur_rtde: ohne asynchronous kehrt der Aufruf erst nach Bewegungsende zurück
+        motion_id = response.get("motion_id")
+        if motion_id is None:
+            return response
+        while self._send_command("isSteady").get("finished_motion_id", motion_id) < motion_id:
+            time.sleep(poll_interval)
+        return response
+
+    def moveJ(self, joint_angles, speed=1.05, acceleration=1.4, asynchronous=False):
+        response = self.conn.request({"command": "moveJ", "data": list(joint_angles),
+                                      "speed": speed, "acceleration": acceleration})
+        return response if asynchronous else self._wait_for_motion(response)
+
+    def moveL(self, cartesian_pose, speed=0.5, acceleration=0.3, asynchronous=False):
+        response = self._send_command("moveL", {"pose": cartesian_pose, "speed": speed, "acceleration": acceleration})
+        return response if asynchronous else self._wait_for_motion(response)
+
+    def servoJ(self, joint_angles, speed=0.0, acceleration=0.0, time=0.008, lookahead_time=0.1, gain=300):
+        # Signatur wie ur_rtde; der Simulator übernimmt den Sollwert direkt im nächsten Schritt
+        return self.conn.request({"command": "servoJ", "data": list(joint_angles)})
 
-    def moveJ(self, joint_angles):
-        return self._send_command("moveJ", joint_angles)
+    def servoStop(self, a=10.0):
+        return self.conn.request({"command": "servoStop"})
 
-    def moveL(self, cartesian_pose, speed=0.5, acceleration=0.3):
-        return self._send_command("moveL", {"pose": cartesian_pose, "speed": speed, "acceleration": acceleration})
+    def isSteady(self):
+        return self._send_command("isSteady").get("steady", False)
 
     def reset_to_home(self):
         return self._send_command("reset_to_home")
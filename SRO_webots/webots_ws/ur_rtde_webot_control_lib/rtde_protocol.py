@@ -0,0 +1,217 @@
+# rtde_protocol.py
+# Gemeinsames Übertragungsprotokoll zwischen dem Webots-RTDE-Server (ur3testcontroller.py)
+# und den Sim-Clients (rtde_control.py, rtde_receive.py).
+# Hinweis: identische Kopie in SRO_webots/ur3e_webots_ur_rtde/ur3test/controllers/ur3testcontroller/rtde_protocol.py
+#
+# Jede Nachricht wird als Frame übertragen:
+#   | Typ (1 Byte) | Befehlscode (1 Byte) | Länge der Nutzdaten (4 Byte, Network Byte Order) | Nutzdaten |
+#
+# Typ FRAME_BINARY: Nutzdaten sind kompakt gepackte doubles (little endian)
+# Typ FRAME_JSON:   Nutzdaten sind UTF-8-kodiertes JSON (Fallback für alle übrigen Nachrichten)
+#
+# Nach "subscribe" sendet der Server zusätzlich unaufgefordert Zustands-Frames
+# {"state": "actualQ", "time": t, "data": q} im Takt der Simulation.
+#
+# Durch das Längenfeld werden zusammengefasste oder zerstückelte TCP-Pakete korrekt getrennt,
+# anders als beim früheren einzelnen recv(4096).
+# Ältere Clients, die noch reines JSON ohne Frame senden, werden erkannt (erstes Byte '{')
+# und erhalten ihre Antwort ebenfalls als reines JSON.
+
+import json
+import struct
+
+FRAME_JSON = 0x01
+FRAME_BINARY = 0x02
+
+HEADER = struct.Struct("!BBI")
+MAX_PAYLOAD = 16 * 1024 * 1024  # Schutz vor fehlerhaften Längenangaben
+
+# Befehlscodes für die binäre Übertragung
+COMMAND_CODES = {
+    "getActualQ": 1,
+    "moveJ": 2,
+    "moveL": 3,
+    "data": 0x80,  # Antwort mit reinen Zahlenwerten, z.B. auf getActualQ
+    "state": 0x81,  # gestreamter Gelenkzustand (Simulationszeit + Gelenkwinkel)
+}
+COMMAND_NAMES = {code: name for name, code in COMMAND_CODES.items()}
+
+
+class ProtocolError(Exception):
+    """Fehlerhafter Frame im Datenstrom."""
+
+
+def _pack_doubles(values):
+    return struct.pack(f"<{len(values)}d", *values)
+
+
+def _unpack_doubles(payload):
+    if len(payload) % 8:
+        raise ProtocolError(f"Binäre Nutzdaten mit ungültiger Länge {len(payload)}")
+    return list(struct.unpack(f"<{len(payload) // 8}d", payload))
+
+
+def _is_number_list(values, length=None):
+    if not isinstance(values, (list, tuple)):
+        return False
+    if length is not None and len(values) != length:
+        return False
+    return all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values)
+
+
+def _to_binary(message):
+    """Liefert (Befehlscode, Zahlenliste) für binär übertragbare Nachrichten, sonst None."""
+    if "command" in message:
+        command = message["command"]
+        data = message.get("data")
+        if command not in COMMAND_CODES:
+            return None
+        if command == "moveJ" and _is_number_list(data, 6):
+            # optional mit speed und acceleration (dann 8 Werte)
+            extra = set(message) - {"command", "data"}
+            if not extra:
+                return COMMAND_CODES[command], list(data)
+            if extra == {"speed", "acceleration"}:
+                limits = [message["speed"], message["acceleration"]]
+                if _is_number_list(limits):
+                    return COMMAND_CODES[command], list(data) + limits
+            return None
+        if len(message) > 2:
+            return None
+        if command == "getActualQ" and data is None:
+            return COMMAND_CODES[command], []
+        if command == "moveL" and isinstance(data, dict) and set(data) <= {"pose", "speed", "acceleration"}:
+            pose = data.get("pose")
+            if _is_number_list(pose, 6):
+                speed = data.get("speed", 0.5)
+                acceleration = data.get("acceleration", 0.3)
+                if _is_number_list([speed, acceleration]):
+                    return COMMAND_CODES[command], list(pose) + [speed, acceleration]
+        return None
+    if set(message) == {"data"} and _is_number_list(message["data"]):
+        return COMMAND_CODES["data"], list(message["data"])
+    if set(message) == {"state", "time", "data"} and message["state"] == "actualQ" \
+            and _is_number_list([message["time"]]) and _is_number_list(message["data"]):
+        return COMMAND_CODES["state"], [message["time"]] + list(message["data"])
+    return None
+
+
+def _from_binary(code, values):
+    name = COMMAND_NAMES.get(code)
+    if name is None:
+        raise ProtocolError(f"Unbekannter Befehlscode {code}")
+    if name == "data":
+        return {"data": values}
+    if name == "state":
+        if not values:
+            raise ProtocolError("Zustands-Frame ohne Zeitstempel")
+        return {"state": "actualQ", "time": values[0], "data": values[1:]}
+    if name == "getActualQ":
+        return {"command": name}
+    if name == "moveJ":
+        if len(values) == 8:
+            return {"command": name, "data": values[:6], "speed": values[6], "acceleration": values[7]}
+        return {"command": name, "data": values}
+    if name == "moveL":
+        if len(values) != 8:
+            raise ProtocolError("moveL erwartet 8 Werte (Pose, speed, acceleration)")
+        return {"command": name, "data": {"pose": values[:6], "speed": values[6], "acceleration": values[7]}}
+    raise ProtocolError(f"Befehl {name} kann nicht binär dekodiert werden")
+
+
+def encode_message(message, binary=True, legacy=False):
+    """Kodiert ein Nachrichten-Dictionary als Frame (bytes).
+
+    binary=True  -> numerische Befehle/Antworten als gepackte doubles, Rest als JSON
+    legacy=True  -> reines JSON ohne Frame (für alte Clients)
+    """
+    if legacy:
+        return json.dumps(message).encode("utf-8")
+    packed = _to_binary(message) if binary else None
+    if packed is not None:
+        code, values = packed
+        payload = _pack_doubles(values)
+        return HEADER.pack(FRAME_BINARY, code, len(payload)) + payload
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(FRAME_JSON, 0, len(payload)) + payload
+
+
+class FrameDecoder:
+    """Zerlegt einen TCP-Bytestrom in einzelne Nachrichten.
+
+    feed() nimmt beliebig große Teilstücke entgegen und liefert alle darin vollständig
+    enthaltenen Nachrichten zurück; Reste werden für den nächsten Aufruf gepuffert.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.legacy = False  # True, sobald die Gegenseite reines JSON ohne Frame sendet
+        self._json = json.JSONDecoder()
+
+    def feed(self, data):
+        self._buffer += data
+        messages = []
+        while self._buffer:
+            if self._buffer[0] == ord("{"):
+                message = self._decode_legacy()
+                if message is None:
+                    break
+                messages.append(message)
+                continue
+            if len(self._buffer) < HEADER.size:
+                break
+            kind, code, length = HEADER.unpack_from(self._buffer)
+            if length > MAX_PAYLOAD:
+                raise ProtocolError(f"Frame zu groß ({length} Bytes)")
+            if len(self._buffer) < HEADER.size + length:
+                break
+            payload = bytes(self._buffer[HEADER.size:HEADER.size + length])
+            del self._buffer[:HEADER.size + length]
+            if kind == FRAME_JSON:
+                messages.append(json.loads(payload.decode("utf-8")))
+            elif kind == FRAME_BINARY:
+                messages.append(_from_binary(code, _unpack_doubles(payload)))
+            else:
+                raise ProtocolError(f"Unbekannter Frame-Typ {kind}")
+        return messages
+
+    def _decode_legacy(self):
+        try:
+            text = self._buffer.decode("utf-8")
+        except UnicodeDecodeError:
+            # unvollständiges Multibyte-Zeichen am Ende -> auf weitere Daten warten
+            return None
+        try:
+            message, end = self._json.raw_decode(text)
+        except json.JSONDecodeError:
+            if len(self._buffer) > MAX_PAYLOAD:
+                raise ProtocolError("Ungültiges JSON im Datenstrom")
+            return None
+        self.legacy = True
+        del self._buffer[:len(text[:end].encode("utf-8"))]
+        return message
+
+
+class FramedConnection:
+    """Blockierende Client-Seite: sendet Nachrichten und liest Antworten Frame für Frame."""
+
+    def __init__(self, sock, binary=True):
+        self.sock = sock
+        self.binary = binary
+        self._decoder = FrameDecoder()
+        self._pending = []
+
+    def send(self, message):
+        self.sock.sendall(encode_message(message, binary=self.binary))
+
+    def receive(self):
+        while not self._pending:
+            data = self.sock.recv(65536)
+            if not data:
+                raise ConnectionError("Verbindung vom Sim-RTDE-Server geschlossen")
+            self._pending.extend(self._decoder.feed(data))
+        return self._pending.pop(0)
+
+    def request(self, message):
+        self.send(message)
+        return self.receive()
@@ -1,28 +1,121 @@
 # sim_rtde_receive.py
 
 import socket
-import json
+import threading
+import queue
+from collections import deque
+
+from rtde_protocol import FramedConnection, ProtocolError
 
 class RTDEReceiveInterface:
-    def __init__(self, ip, port=30010):
+    def __init__(self, ip, port=30010, binary=True, frequency=None, buffer_size=1000):
         self.ip = ip
         self.port = port
         self.sock = socket.create_connection((ip, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.conn = FramedConnection(self.sock, binary=binary)
         print(f"📡 Verbindung zu Sim-RTDE-Server unter {ip}:{port} hergestellt")
 
+        # Streaming-Modus: der Server schickt den Zustand selbstständig, ein Lesethread
+        # legt ihn im Ringpuffer ab (ältere Einträge fallen bei vollem Puffer heraus)
+        self.state_buffer = deque(maxlen=buffer_size)
+        self._responses = queue.Queue()
+        self._reader = None      # Lesethread, liest ab dem ersten startStreaming alle Nachrichten
+        self._streaming = False  # Abonnement aktiv (unabhängig davon, ob der Lesethread läuft)
+        self._state_event = threading.Event()
+        if frequency:
+            self.startStreaming(frequency)
+
+    def startStreaming(self, frequency=125):
+        """Abonniert den Gelenkzustand mit der gewünschten Frequenz in Hz."""
+        if self._reader is None:
+            self._reader = threading.Thread(target=self._read_loop, daemon=True)
+            self._reader.start()
+        self._streaming = True  # vor dem Senden, damit der Lesethread die ersten Zustände behält
+        try:
+            self.conn.send({"command": "subscribe", "data": {"frequency": frequency}})
+        except OSError:
+            self._streaming = False
+            raise
+        response = self._receive_message()
+        if "frequency" not in response:
+            # z.B. {"error": ...} vom Server oder {"info": "Verbindung getrennt"} vom Lesethread
+            self._streaming = False
+            reason = response.get("error") or response.get("info") or response
+            raise RuntimeError(f"Streaming nicht gestartet: {reason}")
+        print(f"📶 Streaming mit {response['frequency']:.1f} Hz aktiv")
+        return response
+
+    def stopStreaming(self):
+        """Beendet das Abonnement; getActualQ fragt danach wieder per Anfrage/Antwort.
+
+        Der Lesethread läuft weiter und reicht die Antworten auf Befehle durch, da er der einzige
+        Leser des Sockets ist.
+        """
+        self.conn.send({"command": "unsubscribe"})
+        response = self._receive_message()
+        self._streaming = False
+        # bis zur Antwort noch eingetroffene Zustände verwerfen
+        self._state_event.clear()
+        self.state_buffer.clear()
+        return response
+
+    def isStreaming(self):
+        return self._streaming
+
     def getActualQ(self):
+        # Im Streaming-Modus ohne Netzwerk-Roundtrip aus dem Ringpuffer lesen
+        if self._streaming:
+            return self.getLatestState()[1]
         self._send_command("getActualQ")
         return self._receive_response()
 
+    def getActualTCPPose(self):
+        self._send_command("getActualTCPPose")
+        return self._receive_response()
+
+    def getLatestState(self, timeout=1.0):
+        """Liefert (Simulationszeit, Gelenkwinkel) des neuesten gestreamten Zustands."""
+        if not self.state_buffer and not self._state_event.wait(timeout):
+            raise TimeoutError("Noch kein Zustand vom Sim-RTDE-Server empfangen")
+        return self.state_buffer[-1]
+
+    def getStateBuffer(self):
+        """Kopie aller gepufferten Zustände, älteste zuerst."""
+        return list(self.state_buffer)
+
     def disconnect(self):
         self._send_command("disconnect")
+        self._receive_response()
         self.sock.close()
         print("🔌 Verbindung zum Sim-RTDE-Server getrennt")
 
     def _send_command(self, command):
-        message = json.dumps({"command": command})
-        self.sock.sendall(message.encode("utf-8"))
+        self.conn.send({"command": command})
+
+    def _receive_message(self):
+        # läuft der Lesethread, liest nur er vom Socket und legt Antworten in die Queue
+        if self._reader is not None:
+            if not self._reader.is_alive() and self._responses.empty():
+                # Verbindung schon getrennt, die Meldung des Lesethreads wurde bereits abgeholt
+                return {"info": "Verbindung getrennt"}
+            return self._responses.get()
+        return self.conn.receive()
 
     def _receive_response(self):
-        data = self.sock.recv(4096).decode("utf-8")
-        return json.loads(data).get("data", [])
\ No newline at end of file
+        return self._receive_message().get("data", [])
+
+    def _read_loop(self):
+        # Trennt gestreamte Zustände von normalen Antworten auf Befehle
+        try:
+            while True:
+                message = self.conn.receive()
+                if "state" in message:
+                    if not self._streaming:
+                        continue  # nach stopStreaming verspätet eingetroffen
+                    self.state_buffer.append((message["time"], message["data"]))
+                    self._state_event.set()
+                else:
+                    self._responses.put(message)
+        except (OSError, ProtocolError):
+            self._responses.put({"info": "Verbindung getrennt"})
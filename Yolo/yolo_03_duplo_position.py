@@ -8,17 +8,17 @@ import cv2
 import math 
 import os
 
+from camera_capture import CameraCapture
+
 # initialisiere WebCam
 CAMERA_INDEX = 0
-cap = cv2.VideoCapture(CAMERA_INDEX, cv2.CAP_DSHOW) 
+# Kamera in eigenem Thread einlesen: während YOLO rechnet, läuft die Kamera weiter,
+# ausgewertet wird immer das neueste Bild statt eines im Treiber gepufferten alten
+cam = CameraCapture(CAMERA_INDEX, cv2.CAP_DSHOW, 640, 480).start()
 # was  cap = cv2.VideoCapture(0)
 # cv.CAP_DSHOW => dauert nicht so lange bis Bild von USB-Kamera kommt
 print("Kamera initialisiert")
 
-
-cap.set(3, 640)
-cap.set(4, 480)
-
 # model
 # Python sucht das File im aktuellen Arbeitsordner, 
 # nicht unbedingt im Ordner des Skripts.
@@ -30,9 +30,19 @@ os.chdir(script_dir)
 model = YOLO("./yolov8_duplo_custom9/weights/best.pt")   
 # object classes
 classNames = ["duplo_4_green"]
-        
+MAX_MISSING_FRAMES = 10  # so oft hintereinander kein Bild (je 1 s) -> Kamera weg, Programm beenden
+
+missing_frames = 0
 while True:
-    success, img = cap.read()
+    success, img = cam.read(timeout=1.0)
+    if not success:
+        missing_frames += 1
+        print(f"Kein Kamerabild ({missing_frames}/{MAX_MISSING_FRAMES})")
+        # auch ohne Bild Tastatur/Fenster bedienen, damit 'q' weiterhin beendet
+        if missing_frames >= MAX_MISSING_FRAMES or cv2.waitKey(1) == ord('q'):
+            break
+        continue
+    missing_frames = 0
     results = model(img, stream=True)
 
     # coordinates
@@ -70,10 +80,12 @@ while True:
 
             cv2.putText(img, classNames[cls], org, font, fontScale, color, thickness)
 
+    cv2.putText(img, f"Kamera {cam.fps:.1f} fps, verworfen {cam.dropped}", (10, img.shape[0] - 10),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
     cv2.imshow('Webcam', img)
     print("- Ende Programm mit STRG+C -")
     if cv2.waitKey(1) == ord('q'):
         break
 
-cap.release()
+cam.release()
 cv2.destroyAllWindows()
\ No newline at end of file
@@ -7,6 +7,12 @@
 # For more information visit:
 # https://robodk.com/doc/en/PythonAPI/robodk.html#robolink-py
 
+# Gemeinsame Bahngenerierung aus SRO_Kinematik/path_patterns.py
+import os
+import sys
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SRO_Kinematik"))
+import path_patterns
+
 # Default parameters:
 P_START = [ 450, -50, 400]  # Start point with respect to the robot base frame
 P_END =   [ 400,  200, 500]  # End point with respect to the robot base frame
@@ -14,33 +20,14 @@ NUM_POINTS = 10  # Number of points to interpolate
 
 
 # Function definition to create a list of points (line)
+# Die Punkte werden vektorisiert über path_patterns erzeugt (siehe Importe oben)
 def MakePoints(xStart, xEnd, numPoints):
     """Generates a list of points"""
     if len(xStart) != 3 or len(xEnd) != 3:
         raise Exception("Start and end point must be 3-dimensional vectors")
     if numPoints < 2:
         raise Exception("At least two points are required")
-
-    # Starting Points
-    pt_list = []
-    x = xStart[0]
-    y = xStart[1]
-    z = xStart[2]
-
-    # How much we add/subtract between each interpolated point
-    x_steps = (xEnd[0] - xStart[0]) / (numPoints - 1)
-    y_steps = (xEnd[1] - xStart[1]) / (numPoints - 1)
-    z_steps = (xEnd[2] - xStart[2]) / (numPoints - 1)
-
-    # Incrementally add to each point until the end point is reached
-    for i in range(numPoints):
-        point_i = [x, y, z]  # create a point
-        #append the point to the list
-        pt_list.append(point_i)
-        x = x + x_steps
-        y = y + y_steps
-        z = z + z_steps
-    return pt_list
+    return path_patterns.line(xStart, xEnd, numPoints).tolist()
 
 
 #---------------------------------------------------